@@ -42,14 +42,14 @@ SCENARIOS = {
 
 
 # Setup for adding limit orders
-def get_setup_add(num_levels):
+def get_setup_add(num_levels, book_args=""):
     return f"""
 from lob.orderbook import OrderBook
 from lob.core import Order
 import random
 random.seed({RANDOM_SEED})
 
-ob = OrderBook()
+ob = OrderBook({book_args})
 orders = []
 for i in range({TOTAL_LIMIT_ORDERS}):
     # {num_levels} levels -> approx {TOTAL_LIMIT_ORDERS / num_levels:.0f} orders/level
@@ -66,6 +66,44 @@ ob.clear()
 """
 
 
+# Setup for adding the same limit orders as columnar arrays
+def get_setup_add_batch(num_levels, book_args=""):
+    return f"""
+from lob.orderbook import OrderBook
+import numpy as np
+rng = np.random.default_rng({RANDOM_SEED})
+
+ob = OrderBook({book_args})
+prices = rng.permutation(100 + np.arange({TOTAL_LIMIT_ORDERS}) % {num_levels}).astype(float)
+volumes = np.full({TOTAL_LIMIT_ORDERS}, 100)
+is_bid = np.ones({TOTAL_LIMIT_ORDERS}, dtype=bool)
+"""
+
+
+STMT_ADD_BATCH = """
+ob.process_order_batch(prices, volumes, is_bid)
+ob.clear()
+"""
+
+
+# Order-store books, which keep resting orders in integer slots
+STORE_BOOK_ARGS = "tick_size=0.01, order_store=True"
+
+
+# Setup for restoring the same book from a snapshot
+def get_setup_restore(num_levels):
+    return get_setup_add(num_levels) + """
+ob.process_orders(orders)
+snapshot = ob.snapshot()
+ob = OrderBook()
+"""
+
+
+STMT_RESTORE = """
+ob.restore(snapshot)
+"""
+
+
 # Setup for matching market orders
 def get_setup_match(num_levels):
     return f"""
@@ -93,6 +131,20 @@ ob.process_orders(market_orders)
 """
 
 
+# Setup for matching market orders into a columnar trade buffer
+def get_setup_match_buffered(num_levels):
+    return get_setup_match(num_levels) + """
+from lob.core import TradeBuffer
+trade_buffer = TradeBuffer()
+"""
+
+
+STMT_MATCH_BUFFERED = """
+trade_buffer.clear()
+ob.process_orders_buffered(market_orders, trade_buffer)
+"""
+
+
 # Setup for cancelling orders
 def get_setup_cancel(num_levels):
     total_to_cancel = CANCEL_BATCH_SIZE * CANCEL_RUNS
@@ -232,6 +284,57 @@ def run_benchmarks():
             }
         )
 
+        # --- Batch Add Orders Benchmark ---
+        print(f"  Running Batch Add... ({ADD_RUNS} runs of {TOTAL_LIMIT_ORDERS} orders)")
+        setup_add_batch = get_setup_add_batch(num_levels)
+        time_add_batch = timeit.timeit(
+            setup=setup_add_batch, stmt=STMT_ADD_BATCH, number=ADD_RUNS
+        )
+        results.append(
+            {
+                "Scenario": scenario_name,
+                "Benchmark": f"Batch Add {TOTAL_LIMIT_ORDERS/1e6:.0f}M Orders",
+                "Runs": ADD_RUNS,
+                "Total Time (s)": time_add_batch,
+                "Avg. per Run (s)": time_add_batch / ADD_RUNS,
+            }
+        )
+
+        # --- Store-Backed Add vs Batch Add Benchmark ---
+        print(f"  Running Store Add... ({ADD_RUNS} runs of {TOTAL_LIMIT_ORDERS} orders)")
+        for label, setup, stmt in (
+            ("Store Add", get_setup_add, STMT_ADD),
+            ("Store Batch Add", get_setup_add_batch, STMT_ADD_BATCH),
+        ):
+            time_store = timeit.timeit(
+                setup=setup(num_levels, STORE_BOOK_ARGS), stmt=stmt, number=ADD_RUNS
+            )
+            results.append(
+                {
+                    "Scenario": scenario_name,
+                    "Benchmark": f"{label} {TOTAL_LIMIT_ORDERS/1e6:.0f}M Orders",
+                    "Runs": ADD_RUNS,
+                    "Total Time (s)": time_store,
+                    "Avg. per Run (s)": time_store / ADD_RUNS,
+                }
+            )
+
+        # --- Restore Snapshot Benchmark ---
+        print(f"  Running Restore... ({ADD_RUNS} runs of {TOTAL_LIMIT_ORDERS} orders)")
+        setup_restore = get_setup_restore(num_levels)
+        time_restore = timeit.timeit(
+            setup=setup_restore, stmt=STMT_RESTORE, number=ADD_RUNS
+        )
+        results.append(
+            {
+                "Scenario": scenario_name,
+                "Benchmark": f"Restore {TOTAL_LIMIT_ORDERS/1e6:.0f}M Orders",
+                "Runs": ADD_RUNS,
+                "Total Time (s)": time_restore,
+                "Avg. per Run (s)": time_restore / ADD_RUNS,
+            }
+        )
+
         # --- Match Orders Benchmark ---
         print(f"  Running Match... ({MATCH_RUNS} runs of {MARKET_ORDER_COUNT} orders)")
         setup_match = get_setup_match(num_levels)
@@ -248,6 +351,24 @@ def run_benchmarks():
             }
         )
 
+        # --- Buffered Match Orders Benchmark ---
+        print(
+            f"  Running Buffered Match... ({MATCH_RUNS} runs of {MARKET_ORDER_COUNT} orders)"
+        )
+        setup_match_buffered = get_setup_match_buffered(num_levels)
+        time_match_buffered = timeit.timeit(
+            setup=setup_match_buffered, stmt=STMT_MATCH_BUFFERED, number=MATCH_RUNS
+        )
+        results.append(
+            {
+                "Scenario": scenario_name,
+                "Benchmark": f"Buffered Match {MARKET_ORDER_COUNT/1e3:.0f}k Mkt",
+                "Runs": MATCH_RUNS,
+                "Total Time (s)": time_match_buffered,
+                "Avg. per Run (s)": time_match_buffered / MATCH_RUNS,
+            }
+        )
+
         # --- Cancel Orders Benchmark ---
         print(f"  Running Cancel... ({CANCEL_RUNS} runs of {CANCEL_BATCH_SIZE} orders)")
         setup_cancel = get_setup_cancel(num_levels)
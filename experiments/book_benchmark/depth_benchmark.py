@@ -0,0 +1,120 @@
+import os
+import tempfile
+import timeit
+
+import numpy as np
+
+from lob.core import Order
+from lob.orderbook import MessageReader, OrderBook, generate_messages
+
+# Cost of cumulative liquidity queries (depth, volume up to a price, sweep
+# price and VWAP) answered by scanning price levels versus a Fenwick-tree
+# depth index, and the index's upkeep cost on message replay.
+
+LEVEL_COUNTS = [100, 1_000, 10_000]
+ORDERS_PER_LEVEL = 4
+QUERY_REPEATS = 2_000
+MESSAGE_COUNT = 200_000
+TICK_SIZE = 0.01
+RANDOM_SEED = 42
+
+
+def build_book(n_levels, depth_index):
+    """
+    Rest ORDERS_PER_LEVEL asks on each of n_levels consecutive ticks.
+    """
+    ob = OrderBook(tick_size=TICK_SIZE, depth_index=depth_index)
+    rng = np.random.default_rng(RANDOM_SEED)
+    volumes = rng.integers(1, 100, n_levels * ORDERS_PER_LEVEL).tolist()
+    ob.process_orders(
+        Order(round(100 + (i // ORDERS_PER_LEVEL) * TICK_SIZE, 2), volume, False)
+        for i, volume in enumerate(volumes)
+    )
+    return ob
+
+
+def scan_queries(side, limit, volume):
+    """
+    Answer every query with one walk over the levels, best first.
+    """
+    depth = 0
+    through = 0
+    swept = 0
+    notional = 0
+    last = None
+    for level in side.top_levels(side.level_counts()[0]):
+        depth += level.volume
+        if level.price <= limit:
+            through += level.volume
+        if swept < volume:
+            take = min(level.volume, volume - swept)
+            swept += take
+            notional += take * level.price
+            last = level.price
+    return depth, through, last, notional / volume
+
+
+def index_queries(side, limit, volume):
+    return (
+        side.get_depth(),
+        side.volume_through(limit),
+        side.sweep_price(volume),
+        side.sweep_vwap(volume),
+    )
+
+
+def run_query_benchmark():
+    res = []
+    for n_levels in LEVEL_COUNTS:
+        scanned = build_book(n_levels, False).asks
+        indexed = build_book(n_levels, True).asks
+        # A limit halfway into the book and a sweep through a quarter of it.
+        limit = scanned.get_best_price() + n_levels // 2
+        volume = scanned.get_depth() // 4
+        assert scanned.get_depth() == indexed.get_depth()
+        assert scan_queries(scanned, limit, volume)[:3] == index_queries(indexed, limit, volume)[:3]
+        scan = timeit.timeit(lambda: scan_queries(scanned, limit, volume), number=QUERY_REPEATS)
+        index = timeit.timeit(lambda: index_queries(indexed, limit, volume), number=QUERY_REPEATS)
+        res.append((n_levels, scan / QUERY_REPEATS * 1e6, index / QUERY_REPEATS * 1e6))
+    return res
+
+
+def run_replay_benchmark():
+    res = []
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "messages.bin")
+        generate_messages(path, MESSAGE_COUNT, seed=RANDOM_SEED, tick_size=TICK_SIZE)
+        reader = MessageReader(path)
+        for name, depth_index in (("no index", False), ("depth index", True)):
+            ob = OrderBook(tick_size=TICK_SIZE, depth_index=depth_index)
+            ob.unsubscribe_all()
+            res.append((name, reader.replay(ob, record_latency=False)))
+        del reader
+    return res
+
+
+def run_benchmark():
+    print("Benchmarking cumulative depth queries")
+    print("=" * 70)
+    queries = run_query_benchmark()
+    replays = run_replay_benchmark()
+
+    print("=" * 70)
+    print(
+        f"Depth Query Benchmarks (depth, volume to price, sweep price and VWAP; "
+        f"{ORDERS_PER_LEVEL} orders per level)"
+    )
+    print("=" * 70)
+    print(f"{'levels':>10}|{'scan (us)':>12}|{'index (us)':>12}|{'speedup':>10}")
+    print("-" * 70)
+    for n_levels, scan, index in queries:
+        print(f"{n_levels:>10}|{scan:>12.2f}|{index:>12.2f}|{scan / index:>9.1f}x")
+    print("-" * 70)
+    print(f"Index upkeep on replay of {MESSAGE_COUNT} messages")
+    print(f"{'book':<16}|{'msgs / s':>12}")
+    for name, stats in replays:
+        print(f"{name:<16}|{stats['messages_per_second']:>12.0f}")
+
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -0,0 +1,82 @@
+import os
+import random
+import time
+
+from lob.core import MarketOrder, Order
+from lob.orderbook import BookManager
+
+# Multi-symbol flow (limit orders, cancels and market orders spread evenly
+# over many symbols) routed through a BookManager with the books in-process
+# and sharded across increasing numbers of worker processes.
+
+SYMBOL_COUNT = 64
+MESSAGE_COUNT = 400_000
+FLUSH_SIZE = 20_000  # requests submitted between flushes
+TICK_SIZE = 0.01
+RANDOM_SEED = 42
+WORKER_COUNTS = sorted({0, 1, 2, 4, os.cpu_count() or 1})
+
+
+def make_flow():
+    rng = random.Random(RANDOM_SEED)
+    symbols = [f"SYM{i:03d}" for i in range(SYMBOL_COUNT)]
+    live = {symbol: [] for symbol in symbols}
+    flow = []
+    for _ in range(MESSAGE_COUNT):
+        symbol = rng.choice(symbols)
+        u = rng.random()
+        if live[symbol] and u < 0.35:
+            orders = live[symbol]
+            flow.append((symbol, None, orders.pop(rng.randrange(len(orders)))))
+        elif u < 0.40:
+            flow.append((symbol, MarketOrder(rng.randint(1, 300), rng.random() < 0.5), None))
+        else:
+            is_bid = rng.random() < 0.5
+            offset = rng.randint(1, 20) * TICK_SIZE
+            order = Order(100 - offset if is_bid else 100 + offset, rng.randint(1, 100), is_bid)
+            live[symbol].append(order.id)
+            flow.append((symbol, order, None))
+    return symbols, flow
+
+
+def replay(manager, flow):
+    start = time.perf_counter()
+    for i, (symbol, order, cancel_id) in enumerate(flow, 1):
+        if order is None:
+            manager.submit_cancel(symbol, cancel_id)
+        else:
+            manager.submit(symbol, order)
+        if i % FLUSH_SIZE == 0:
+            manager.flush()
+    manager.flush()
+    return time.perf_counter() - start
+
+
+def run_benchmark():
+    print("Benchmarking sharded BookManager")
+    print("=" * 70)
+    symbols, flow = make_flow()
+    res = []
+    for workers in WORKER_COUNTS:
+        print(f"replaying with {workers} workers ...")
+        with BookManager(symbols, workers=workers, tick_size=TICK_SIZE) as manager:
+            res.append((workers, replay(manager, flow)))
+
+    print("=" * 70)
+    print(
+        f"BookManager Benchmarks ({MESSAGE_COUNT} requests over {SYMBOL_COUNT} symbols, "
+        f"{os.cpu_count()} cores)"
+    )
+    print("=" * 70)
+    print(f"{'workers':<10}|{'time (s)':>12}|{'requests / s':>15}|{'speedup':>10}")
+    print("-" * 70)
+    baseline = res[0][1]
+    for workers, seconds in res:
+        print(
+            f"{workers:<10}|{seconds:>12.3f}|{MESSAGE_COUNT / seconds:>15.0f}"
+            f"|{baseline / seconds:>10.2f}"
+        )
+
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -0,0 +1,74 @@
+import asyncio
+import os
+import tempfile
+
+from lob.orderbook import GatewayClient, OrderBook, OrderGateway, run_load
+
+# End-to-end load test of the asyncio order-entry gateway: concurrent
+# clients pipeline orders, cancels and amends over Unix and TCP sockets and
+# measure the latency from sending each message to its acknowledgement.
+
+CLIENT_COUNT = 16
+MESSAGES_PER_CLIENT = 10_000
+WINDOW = 32  # messages in flight per client
+TICK_SIZE = 0.01
+
+
+async def benchmark_transport(transport):
+    gateway = OrderGateway(OrderBook(tick_size=TICK_SIZE))
+    with tempfile.TemporaryDirectory() as tmp:
+        if transport == "unix":
+            path = os.path.join(tmp, "gateway.sock")
+            await gateway.start_unix(path)
+
+            async def connect():
+                return await GatewayClient.connect_unix(path)
+
+        else:
+            host, port = await gateway.start_tcp()
+
+            async def connect():
+                return await GatewayClient.connect_tcp(host, port)
+
+        stats = await run_load(
+            connect,
+            n_clients=CLIENT_COUNT,
+            messages_per_client=MESSAGES_PER_CLIENT,
+            window=WINDOW,
+            tick_size=TICK_SIZE,
+        )
+        stats["batch_size"] = gateway.messages / max(gateway.batches, 1)
+        await gateway.close()
+    return stats
+
+
+def run_benchmark():
+    print("Benchmarking order-entry gateway")
+    print("=" * 70)
+    res = []
+    for transport in ("unix", "tcp"):
+        print(f"load testing over {transport} ...")
+        res.append((transport, asyncio.run(benchmark_transport(transport))))
+
+    print("=" * 70)
+    print(
+        f"Gateway Benchmarks ({CLIENT_COUNT} clients x {MESSAGES_PER_CLIENT} messages, "
+        f"{WINDOW} in flight each)"
+    )
+    print("=" * 70)
+    print(
+        f"{'transport':<10}|{'msgs / s':>10}|{'batch':>7}|{'p50 (us)':>10}"
+        f"|{'p90 (us)':>10}|{'p99 (us)':>10}|{'p99.9 (us)':>11}"
+    )
+    print("-" * 70)
+    for transport, stats in res:
+        latency = stats["latency_ns"]
+        print(
+            f"{transport:<10}|{stats['messages_per_second']:>10.0f}|{stats['batch_size']:>7.0f}"
+            f"|{latency['p50'] / 1e3:>10.0f}|{latency['p90'] / 1e3:>10.0f}"
+            f"|{latency['p99'] / 1e3:>10.0f}|{latency['p99.9'] / 1e3:>11.0f}"
+        )
+
+
+if __name__ == "__main__":
+    run_benchmark()
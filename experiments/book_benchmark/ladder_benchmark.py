@@ -0,0 +1,66 @@
+import timeit
+
+# Compare the heap-backed PriceBook against the dense PriceLadder backend on
+# an integer-tick book. ShallowBook-style workload: many levels, few orders each.
+
+TOTAL_LIMIT_ORDERS = 200_000
+NUM_LEVELS = 20_000
+TICK_SIZE = 0.01
+RUNS = 5
+
+BACKENDS = {
+    "Heap PriceBook": "OrderBook(tick_size={tick})",
+    "PriceLadder": "OrderBook(tick_size={tick}, ladder_width={width})",
+}
+
+
+def ladder_benchmark(book_ctor):
+    setup = f"""
+import random
+from lob.orderbook import OrderBook
+from lob.core import Order, MarketOrder
+random.seed(42)
+
+def make_book():
+    return {book_ctor}
+
+prices = [100 + (i % {NUM_LEVELS}) * {TICK_SIZE} for i in range({TOTAL_LIMIT_ORDERS})]
+random.shuffle(prices)
+"""
+
+    stmt = """
+ob = make_book()
+orders = [Order(price=p, volume=100, is_bid=True) for p in prices]
+ob.process_orders(orders)
+ob.process_orders([MarketOrder(volume=150, is_bid=False) for _ in range(10_000)])
+ob.process_cancellations([o.id for o in orders[::2]])
+"""
+    return setup, stmt
+
+
+def run_benchmark():
+    res = []
+    print("Benchmarking PriceBook backends")
+    print("=" * 70)
+    for name, ctor in BACKENDS.items():
+        print(f"benchmarking {name} ...")
+        setup, stmt = ladder_benchmark(
+            ctor.format(tick=TICK_SIZE, width=NUM_LEVELS)
+        )
+        time = timeit.timeit(setup=setup, stmt=stmt, number=RUNS)
+        res.append({"backend": name, "total time": time, "avg time / run": time / RUNS})
+
+    print("=" * 70)
+    print(
+        f"Backend Benchmarks ({TOTAL_LIMIT_ORDERS} adds, 10k market orders, "
+        f"{TOTAL_LIMIT_ORDERS // 2} cancels over {NUM_LEVELS} levels)"
+    )
+    print("=" * 70)
+    print(f"{'backend':<20}|{'total time':<25}|{'avg time / run':<20}")
+    print("-" * 70)
+    for r in res:
+        print(f"{r['backend']:<20}|{r['total time']:<25.4f}|{r['avg time / run']:<20.4f}")
+
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -0,0 +1,97 @@
+import gc
+import sys
+import tracemalloc
+
+from lob.orderbook import OrderBook
+from lob.core import Order
+
+# Resting-order memory footprint: dict-backed orders (the layout before Order
+# gained __slots__), the current slotted Order, and the struct-of-arrays
+# OrderStore, where resting orders are held in NumPy columns.
+
+TOTAL_LIMIT_ORDERS = 1_000_000
+NUM_LEVELS = 100_000
+
+
+class DictOrder:
+    """Order with the same attributes as Order but stored in a __dict__."""
+
+    _id_counter = 0
+
+    def __init__(self, price=None, volume=100, is_bid=True, is_market=False,
+                 trader_id=None, lifetime=None):
+        self.price = price
+        self.volume = volume
+        self.is_bid = is_bid
+        self.id = DictOrder._id_counter
+        self.is_market = is_market
+        self.trader_id = trader_id
+        self.lifetime = lifetime
+        self._prev = None
+        self._next = None
+
+        DictOrder._id_counter += 1
+
+
+def object_size(order):
+    """Size of an order object including its instance dict, if any."""
+    size = sys.getsizeof(order)
+    if hasattr(order, "__dict__"):
+        size += sys.getsizeof(order.__dict__)
+    return size
+
+
+def resting_book_bytes(order_cls, **book_kwargs):
+    """Traced bytes per order for a book of TOTAL_LIMIT_ORDERS resting orders."""
+    gc.collect()
+    tracemalloc.start()
+    ob = OrderBook(**book_kwargs)
+    ob.process_orders(
+        order_cls(price=100 + (i % NUM_LEVELS), volume=100, is_bid=True)
+        for i in range(TOTAL_LIMIT_ORDERS)
+    )
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    if ob.order_store is not None:
+        # Fields only: one int64/bool entry per column per slot.
+        store = ob.order_store
+        object_bytes = sum(
+            getattr(store, name).itemsize
+            for name in store._INT_COLUMNS + store._BOOL_COLUMNS
+        )
+    else:
+        object_bytes = object_size(next(iter(ob.bids.order_map.values())))
+    del ob
+    gc.collect()
+    return current / TOTAL_LIMIT_ORDERS, object_bytes
+
+
+def run_benchmark():
+    res = []
+    print("Benchmarking Resting Order Memory")
+    print("=" * 70)
+    layouts = [
+        ("dict-backed", DictOrder, {}),
+        ("slotted", Order, {}),
+        ("column store", Order, {"tick_size": 1, "order_store": True}),
+    ]
+    for name, order_cls, book_kwargs in layouts:
+        print(f"benchmarking {name} orders ...")
+        per_order, object_bytes = resting_book_bytes(order_cls, **book_kwargs)
+        res.append(
+            {"layout": name, "bytes / order": per_order, "object bytes": object_bytes}
+        )
+
+    print("=" * 70)
+    print(f"Resting Order Memory ({TOTAL_LIMIT_ORDERS} orders, {NUM_LEVELS} levels)")
+    print("=" * 70)
+    print(f"{'layout':<20}|{'bytes / resting order':<25}|{'order object bytes':<20}")
+    print("-" * 70)
+    for r in res:
+        print(
+            f"{r['layout']:<20}|{r['bytes / order']:<25.1f}|{r['object bytes']:<20}"
+        )
+
+
+if __name__ == "__main__":
+    run_benchmark()
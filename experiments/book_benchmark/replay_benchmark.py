@@ -0,0 +1,65 @@
+import os
+import tempfile
+
+from lob.orderbook import MessageReader, OrderBook, generate_messages
+
+# Replay a synthetic exchange-feed style message file (adds, cancels,
+# deletes, executions and replaces clustered at the touch, with bursts)
+# through each book backend, reporting throughput and latency percentiles.
+
+MESSAGE_COUNT = 1_000_000
+TARGET_ORDERS = 5_000
+TICK_SIZE = 0.01
+RANDOM_SEED = 42
+
+BACKENDS = {
+    "Heap PriceBook": lambda: OrderBook(tick_size=TICK_SIZE),
+    "PriceLadder": lambda: OrderBook(tick_size=TICK_SIZE, ladder_width=1 << 14),
+    "OrderStore": lambda: OrderBook(tick_size=TICK_SIZE, order_store=True),
+}
+
+
+def run_benchmark():
+    print("Benchmarking message replay")
+    print("=" * 70)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "messages.bin")
+        print(f"generating {MESSAGE_COUNT} messages ...")
+        generate_messages(
+            path,
+            MESSAGE_COUNT,
+            seed=RANDOM_SEED,
+            tick_size=TICK_SIZE,
+            target_orders=TARGET_ORDERS,
+        )
+        reader = MessageReader(path)
+
+        res = []
+        for name, make_book in BACKENDS.items():
+            print(f"replaying into {name} ...")
+            ob = make_book()
+            # Notifications are not consumed here.
+            ob.unsubscribe_all()
+            stats = reader.replay(ob)
+            res.append((name, stats))
+        del reader
+
+    print("=" * 70)
+    print(f"Replay Benchmarks ({MESSAGE_COUNT} messages, ~{TARGET_ORDERS} resting orders)")
+    print("=" * 70)
+    print(
+        f"{'backend':<16}|{'msgs / s':>12}|{'p50 (us)':>10}|{'p90 (us)':>10}"
+        f"|{'p99 (us)':>10}|{'p99.9 (us)':>11}"
+    )
+    print("-" * 70)
+    for name, stats in res:
+        latency = stats["latency_ns"]
+        print(
+            f"{name:<16}|{stats['messages_per_second']:>12.0f}"
+            f"|{latency['p50'] / 1e3:>10.2f}|{latency['p90'] / 1e3:>10.2f}"
+            f"|{latency['p99'] / 1e3:>10.2f}|{latency['p99.9'] / 1e3:>11.2f}"
+        )
+
+
+if __name__ == "__main__":
+    run_benchmark()
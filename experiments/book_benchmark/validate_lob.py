@@ -17,11 +17,8 @@ from lob.core import Order, MarketOrder
 
 
 def run_validation():
-    # Create a simple OrderBook
-    ob = OrderBook(use_scheduler=True)
-
-    # Reset Order ID counter
-    Order._id_counter = 1
+    # Create a simple OrderBook issuing its own order IDs from 0
+    ob = OrderBook(use_scheduler=True, dense_ids=True)
 
     # Add some test orders
     orders = [
@@ -51,8 +48,8 @@ def run_validation():
     # Validate unfilled orders for a trader
     trader_101_orders = ob.unfilled_orders(101)
     trader_201_orders = ob.unfilled_orders(201)
-    assert trader_101_orders[0] == (1, 100, 10)
-    assert trader_201_orders[0] == (3, 102, 7)
+    assert trader_101_orders[0] == (0, 100, 10)
+    assert trader_201_orders[0] == (2, 102, 7)
     print("✅ unfilled orders validated")
 
     # Validate spread and mid-price cancellation
@@ -71,7 +68,7 @@ def run_validation():
     # ==== Checkpoint 2 ====
 
     # Validate cancellations
-    ob.process_cancellations([4])
+    ob.process_cancellations([3])
     assert ob.get_ask_depth() == 7
     print("✅ Cancellations validated")
 
@@ -1,4 +1,14 @@
-from experiments.book_benchmark import benchmark, cache_locality_benchmark, validate_lob
+from experiments.book_benchmark import (
+    benchmark,
+    cache_locality_benchmark,
+    depth_benchmark,
+    exchange_benchmark,
+    gateway_benchmark,
+    ladder_benchmark,
+    memory_benchmark,
+    replay_benchmark,
+    validate_lob,
+)
 
 
 def run_all():
@@ -6,6 +16,18 @@ def run_all():
     benchmark.run_benchmarks()
     print("Running cache locality benchmark...")
     cache_locality_benchmark.run_benchmark()
+    print("Running price book backend benchmark...")
+    ladder_benchmark.run_benchmark()
+    print("Running resting order memory benchmark...")
+    memory_benchmark.run_benchmark()
+    print("Running message replay benchmark...")
+    replay_benchmark.run_benchmark()
+    print("Running sharded book manager benchmark...")
+    exchange_benchmark.run_benchmark()
+    print("Running order-entry gateway benchmark...")
+    gateway_benchmark.run_benchmark()
+    print("Running cumulative depth query benchmark...")
+    depth_benchmark.run_benchmark()
     print("Running order book validation script")
     validate_lob.run_validation()
 
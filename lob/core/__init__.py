@@ -4,6 +4,7 @@ Core objects for the LOB data structure: orders and trades.
 
 from .order import Order, MarketOrder
 from .trade import Trade, TradesNotification
+from .trade_buffer import TradeBuffer
 from .asset import Asset
 
-__all__ = ["Order", "MarketOrder", "Trade", "TradesNotification", "Asset"]
+__all__ = ["Order", "MarketOrder", "Trade", "TradesNotification", "TradeBuffer", "Asset"]
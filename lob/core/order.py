@@ -26,8 +26,27 @@ class Order:
         Identifier of the trader placing the order.
     lifetime : int or None
         Number of time steps the order remains active.
+
+    Notes
+    -----
+    Resting orders are linked into their price level's FIFO queue through
+    the private ``_prev`` and ``_next`` attributes, which are managed by
+    ``PriceLevel``. Attributes live in ``__slots__`` rather than a
+    per-instance ``__dict__`` to keep large books compact.
     """
 
+    __slots__ = (
+        "price",
+        "volume",
+        "is_bid",
+        "id",
+        "is_market",
+        "trader_id",
+        "lifetime",
+        "_prev",
+        "_next",
+    )
+
     _id_counter = 0
 
     def __init__(self, price=None, volume=100, is_bid=True, is_market=False,
@@ -58,6 +77,10 @@ class Order:
         self.trader_id = trader_id
         self.lifetime = lifetime
 
+        # Intrusive queue links, owned by the PriceLevel the order rests at.
+        self._prev = None
+        self._next = None
+
         Order._id_counter += 1
 
     def __repr__(self):
@@ -79,6 +102,8 @@ class MarketOrder(Order):
     Inherits all attributes from Order class.
     """
 
+    __slots__ = ()
+
     def __init__(self, volume=100, is_bid=True, trader_id=None):
         """
         Initialize a market order with specified parameters.
@@ -28,6 +28,8 @@ class Trade:
         Return string representation of the trade.
     """
 
+    __slots__ = ("bid_order", "ask_order", "price", "volume")
+
     def __init__(self, bid_order, ask_order, price, volume):
         """
         Initialize a trade with bid, ask, price, and volume.
@@ -86,8 +88,22 @@ class TradesNotification:
         Property returning volume-weighted average fill price.
     add_trade(trade)
         Add a trade to this notification and update statistics.
+    add_fill(price, volume)
+        Add a fill given by its price and volume.
     """
 
+    __slots__ = (
+        "trader_id",
+        "order_id",
+        "is_bid",
+        "price_volume",
+        "num_trades",
+        "total_filled_volume",
+        "total_notional",
+        "remaining_volume",
+        "is_filled",
+    )
+
     def __init__(self, order):
         """
         Initialize a trades notification from an order.
@@ -138,12 +154,28 @@ class TradesNotification:
         TradesNotification
             Returns self for method chaining.
         """
-        self.price_volume[trade.price] = (
-            self.price_volume.get(trade.price, 0) + trade.volume
-        )
+        return self.add_fill(trade.price, trade.volume)
+
+    def add_fill(self, price, volume):
+        """
+        Add a fill to this notification and update statistics.
+
+        Parameters
+        ----------
+        price : float
+            Execution price of the fill.
+        volume : int
+            Quantity filled.
+
+        Returns
+        -------
+        TradesNotification
+            Returns self for method chaining.
+        """
+        self.price_volume[price] = self.price_volume.get(price, 0) + volume
         self.num_trades += 1
-        self.total_filled_volume += trade.volume
-        self.total_notional += trade.price * trade.volume
+        self.total_filled_volume += volume
+        self.total_notional += price * volume
         return self
 
     def __repr__(self):
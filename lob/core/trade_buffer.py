@@ -0,0 +1,135 @@
+"""
+Columnar buffer for executed trades.
+
+This module defines the TradeBuffer class, a growable set of preallocated
+NumPy columns that the matching engine appends fills to instead of
+allocating a Trade object per match.
+"""
+
+import numpy as np
+
+
+class TradeBuffer:
+    """
+    Preallocated, growable columnar record of fills.
+
+    Each row is one fill. Columns are NumPy arrays sized to ``capacity`` and
+    doubled when full; the public column properties return views of the
+    filled rows only.
+
+    Attributes
+    ----------
+    bid_order_id : numpy.ndarray of int64
+        ID of the buy order in each fill.
+    ask_order_id : numpy.ndarray of int64
+        ID of the sell order in each fill.
+    price : numpy.ndarray of float64
+        Execution price of each fill, in the book's internal units (ticks for
+        an order book with a tick size).
+    volume : numpy.ndarray of int64
+        Quantity of each fill.
+    aggressor_is_bid : numpy.ndarray of bool
+        True if the incoming (aggressing) order was the buy order.
+
+    Methods
+    -------
+    append(bid_order_id, ask_order_id, price, volume, aggressor_is_bid)
+        Record one fill.
+    clear()
+        Discard all rows, keeping the allocated capacity.
+    """
+
+    _DTYPES = {
+        "bid_order_id": np.int64,
+        "ask_order_id": np.int64,
+        "price": np.float64,
+        "volume": np.int64,
+        "aggressor_is_bid": bool,
+    }
+
+    def __init__(self, capacity=1024):
+        """
+        Initialize an empty trade buffer.
+
+        Parameters
+        ----------
+        capacity : int, optional
+            Number of rows to preallocate (default is 1024).
+        """
+        self.capacity = max(1, capacity)
+        self.size = 0
+        self._bid_order_id = np.empty(self.capacity, dtype=np.int64)
+        self._ask_order_id = np.empty(self.capacity, dtype=np.int64)
+        self._price = np.empty(self.capacity, dtype=np.float64)
+        self._volume = np.empty(self.capacity, dtype=np.int64)
+        self._aggressor_is_bid = np.empty(self.capacity, dtype=bool)
+
+    def __len__(self):
+        return self.size
+
+    def _grow(self):
+        """
+        Double the capacity of every column, keeping the recorded rows.
+        """
+        capacity = 2 * self.capacity
+        for name, dtype in self._DTYPES.items():
+            column = np.empty(capacity, dtype=dtype)
+            column[: self.size] = getattr(self, "_" + name)[: self.size]
+            setattr(self, "_" + name, column)
+        self.capacity = capacity
+
+    def append(self, bid_order_id, ask_order_id, price, volume, aggressor_is_bid):
+        """
+        Record one fill.
+
+        Parameters
+        ----------
+        bid_order_id : int
+            ID of the buy order.
+        ask_order_id : int
+            ID of the sell order.
+        price : float
+            Execution price.
+        volume : int
+            Quantity filled.
+        aggressor_is_bid : bool
+            True if the buy order was the incoming order.
+        """
+        i = self.size
+        if i == self.capacity:
+            self._grow()
+        self._bid_order_id[i] = bid_order_id
+        self._ask_order_id[i] = ask_order_id
+        self._price[i] = price
+        self._volume[i] = volume
+        self._aggressor_is_bid[i] = aggressor_is_bid
+        self.size = i + 1
+
+    @property
+    def bid_order_id(self):
+        return self._bid_order_id[: self.size]
+
+    @property
+    def ask_order_id(self):
+        return self._ask_order_id[: self.size]
+
+    @property
+    def price(self):
+        return self._price[: self.size]
+
+    @property
+    def volume(self):
+        return self._volume[: self.size]
+
+    @property
+    def aggressor_is_bid(self):
+        return self._aggressor_is_bid[: self.size]
+
+    def clear(self):
+        """
+        Discard all recorded rows, keeping the allocated capacity.
+        """
+        self.size = 0
+
+    def __repr__(self):
+        return f"TradeBuffer(size={self.size}, capacity={self.capacity})"
@@ -2,9 +2,40 @@
 Objects forming the LOB.
 """
 
+from .book_manager import BookManager
+from .delta_feed import DeltaFeed
+from .depth_index import DepthIndex
 from .expiration_wheel import ExpirationWheel
+from .gateway import GatewayClient, OrderGateway, run_load
+from .id_allocator import IdAllocator
+from .journal import Journal, JournalReader
+from .message_file import MessageReader, MessageWriter, generate_messages
 from .order_book import OrderBook
+from .order_store import OrderStore, SlotLevel
 from .price_book import PriceBook
+from .price_ladder import PriceLadder
 from .price_level import PriceLevel
+from .store_price_book import StorePriceBook
 
-__all__ = ["ExpirationWheel", "OrderBook", "PriceBook", "PriceLevel"]
+__all__ = [
+    "BookManager",
+    "DeltaFeed",
+    "DepthIndex",
+    "ExpirationWheel",
+    "GatewayClient",
+    "IdAllocator",
+    "Journal",
+    "JournalReader",
+    "MessageReader",
+    "MessageWriter",
+    "OrderBook",
+    "OrderGateway",
+    "OrderStore",
+    "PriceBook",
+    "PriceLadder",
+    "PriceLevel",
+    "SlotLevel",
+    "StorePriceBook",
+    "generate_messages",
+    "run_load",
+]
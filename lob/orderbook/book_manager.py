@@ -0,0 +1,684 @@
+"""
+Multi-instrument book manager.
+
+This module defines the BookManager class, which owns one OrderBook per
+symbol, routes orders, cancellations and queries to them, and can shard the
+symbols across worker processes that exchange request and result batches
+with it through shared memory.
+"""
+
+import multiprocessing as mp
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+
+from ..core import MarketOrder, Order, TradeBuffer
+from .order_book import OrderBook
+
+# Request kinds
+ORDER = 0
+CANCEL = 1
+
+# One fixed-width (48 byte) row per request. ``symbol`` is the symbol's
+# index in the manager. A ``trader_id`` or ``lifetime`` of -1 means None.
+_REQUEST_DTYPE = np.dtype(
+    [
+        ("order_id", "<i8"),
+        ("price", "<f8"),
+        ("volume", "<i8"),
+        ("trader_id", "<i8"),
+        ("lifetime", "<i8"),
+        ("symbol", "<i4"),
+        ("kind", "u1"),
+        ("is_bid", "?"),
+        ("is_market", "?"),
+        ("_pad", "V1"),
+    ]
+)
+
+_TRADE_DTYPE = np.dtype(
+    [
+        ("bid_order_id", "<i8"),
+        ("ask_order_id", "<i8"),
+        ("price", "<f8"),
+        ("volume", "<i8"),
+        ("symbol", "<i4"),
+        ("_pad", "V4"),
+    ]
+)
+
+
+def _resting_volume(book, order_id):
+    for side in (book.bids, book.asks):
+        order = side.get_order(order_id)
+        if order is not None:
+            return order.volume
+    return 0
+
+
+def _process_batch(books, requests):
+    """
+    Apply a batch of requests to the books they are addressed to.
+
+    Books are independent, so requests are grouped by symbol (keeping their
+    order within each symbol) and each run of orders for one symbol is
+    matched with a single ``process_orders_buffered`` call into a trade
+    buffer shared by the batch.
+
+    Parameters
+    ----------
+    books : dict
+        Maps symbol index to OrderBook.
+    requests : numpy.ndarray
+        Rows of _REQUEST_DTYPE.
+
+    Returns
+    -------
+    volumes : numpy.ndarray of int64
+        Per request: the order's volume left after entering the book
+        (resting for a limit order, unfilled for a market order), or the
+        volume a cancellation removed.
+    trades : numpy.ndarray
+        Rows of _TRADE_DTYPE, grouped by symbol and in execution order
+        within each.
+    """
+    n = len(requests)
+    volumes = requests["volume"].copy()
+    if not n:
+        return volumes, np.zeros(0, dtype=_TRADE_DTYPE)
+
+    by_symbol = np.argsort(requests["symbol"], kind="stable")
+    grouped = requests[by_symbol]
+    symbol = grouped["symbol"]
+    kind = grouped["kind"]
+    orders = [
+        None if request_kind == CANCEL
+        else MarketOrder(volume, is_bid, trader_id if trader_id >= 0 else None)
+        if is_market
+        else Order(
+            price,
+            volume,
+            is_bid,
+            False,
+            trader_id if trader_id >= 0 else None,
+            lifetime if lifetime >= 0 else None,
+        )
+        for request_kind, price, volume, is_bid, is_market, trader_id, lifetime in zip(
+            *(
+                grouped[field].tolist()
+                for field in (
+                    "kind", "price", "volume", "is_bid", "is_market", "trader_id", "lifetime"
+                )
+            )
+        )
+    ]
+    order_ids = grouped["order_id"].tolist()
+    for order, order_id in zip(orders, order_ids):
+        if order is not None:
+            order.id = order_id
+
+    trade_buffer = TradeBuffer()
+    prices = []
+    trade_symbols = []
+    breaks = np.flatnonzero((symbol[1:] != symbol[:-1]) | (kind[1:] != kind[:-1])) + 1
+    for start, stop in zip(np.r_[0, breaks].tolist(), np.r_[breaks, n].tolist()):
+        index = int(symbol[start])
+        book = books[index]
+        if kind[start] == ORDER:
+            first = len(trade_buffer)
+            count = book.process_orders_buffered(orders[start:stop], trade_buffer)
+            ticks = trade_buffer.price[first:]
+            if book.tick_size is not None:
+                to_price = book.bids.to_price
+                ticks = [to_price(int(tick)) for tick in ticks]
+            prices.append(ticks)
+            trade_symbols.append(np.full(count, index, dtype=np.int32))
+        else:
+            for row, order_id in zip(by_symbol[start:stop].tolist(), order_ids[start:stop]):
+                volumes[row] = _resting_volume(book, order_id)
+                book.process_cancellations([order_id])
+
+    trades = np.zeros(len(trade_buffer), dtype=_TRADE_DTYPE)
+    if len(trade_buffer):
+        trades["bid_order_id"] = trade_buffer.bid_order_id
+        trades["ask_order_id"] = trade_buffer.ask_order_id
+        trades["price"] = np.concatenate(prices)
+        trades["volume"] = trade_buffer.volume
+        trades["symbol"] = np.concatenate(trade_symbols)
+
+        # Each order's volume left after entry: its volume less the fills it
+        # took as the aggressor (later fills against it as a resting order
+        # do not count).
+        aggressors = np.where(
+            trade_buffer.aggressor_is_bid, trade_buffer.bid_order_id, trade_buffer.ask_order_id
+        )
+        order_rows = np.flatnonzero(requests["kind"] == ORDER)
+        row_ids = requests["order_id"][order_rows]
+        by_id = np.argsort(row_ids)
+        rows = order_rows[by_id[np.searchsorted(row_ids, aggressors, sorter=by_id)]]
+        volumes -= np.bincount(rows, weights=trade_buffer.volume, minlength=n).astype(np.int64)
+    return volumes, trades
+
+
+def _columns(requests, volumes, trades):
+    """
+    Get one symbol's flush results as columns.
+    """
+    return {
+        "order_id": requests["order_id"].copy(),
+        "kind": requests["kind"].copy(),
+        "volume": volumes,
+        "bid_order_id": trades["bid_order_id"].copy(),
+        "ask_order_id": trades["ask_order_id"].copy(),
+        "price": trades["price"].copy(),
+        "trade_volume": trades["volume"].copy(),
+    }
+
+
+def _serve(conn, inbound_name, outbound_name, book_kwargs):
+    """
+    Worker process loop: own a shard of books and serve manager commands.
+
+    Request batches are read from the inbound shared memory block and the
+    per-request volumes, followed by the trades, written to the outbound
+    block; only commands and counts travel over the pipe.
+    """
+    inbound = SharedMemory(inbound_name)
+    outbound = SharedMemory(outbound_name)
+    books = {}
+    try:
+        while True:
+            command, *args = conn.recv()
+            if command == "stop":
+                break
+            try:
+                if command == "batch":
+                    (n,) = args
+                    requests = np.ndarray(n, dtype=_REQUEST_DTYPE, buffer=inbound.buf).copy()
+                    volumes, trades = _process_batch(books, requests)
+                    size = volumes.nbytes + trades.nbytes
+                    if size > outbound.size:
+                        conn.send(("grow", size))
+                        outbound.close()
+                        outbound = SharedMemory(conn.recv())
+                    buffer = outbound.buf
+                    buffer[: volumes.nbytes] = volumes.tobytes()
+                    buffer[volumes.nbytes:size] = trades.tobytes()
+                    del buffer
+                    conn.send(("ok", len(trades)))
+                elif command == "add_symbol":
+                    books[args[0]] = OrderBook(**book_kwargs)
+                    conn.send(("ok", None))
+                elif command == "call":
+                    index, name, call_args = args
+                    conn.send(("ok", getattr(books[index], name)(*call_args)))
+                elif command == "advance":
+                    for book in books.values():
+                        book.advance()
+                    conn.send(("ok", None))
+            except Exception as exc:
+                conn.send(("error", exc))
+    finally:
+        inbound.close()
+        outbound.close()
+        conn.close()
+
+
+class BookManager:
+    """
+    Owner of one OrderBook per symbol, optionally sharded across processes.
+
+    Orders and cancellations are staged with ``submit`` and
+    ``submit_cancel`` and applied by ``flush``, which returns each symbol's
+    results in submission order. With ``workers`` set, symbols are assigned
+    round-robin to that many worker processes; a flush writes each worker's
+    requests into its shared memory block, lets every worker process its
+    batch concurrently and reads the results back the same way. Without
+    workers the books live in this process and the same batches are applied
+    directly.
+
+    Order IDs are taken from the submitted orders, so they stay unique
+    across every book the manager owns.
+
+    Attributes
+    ----------
+    symbols : list of str
+        Symbols in the order they were added.
+    workers : int
+        Number of worker processes (0 for in-process books).
+    book_kwargs : dict
+        Keyword arguments each OrderBook is created with.
+
+    Methods
+    -------
+    add_symbol(symbol)
+        Create the book for a symbol.
+    submit(symbol, order)
+        Stage an order for a symbol.
+    submit_cancel(symbol, order_id)
+        Stage a cancellation for a symbol.
+    flush()
+        Apply every staged request and return results per symbol.
+    process_orders(symbol, orders)
+        Submit orders for one symbol and flush.
+    process_cancellations(symbol, order_ids)
+        Submit cancellations for one symbol and flush.
+    get_best_bid(symbol), get_best_ask(symbol)
+        Best prices of a symbol's book.
+    l2_snapshot(symbol, n_levels=10)
+        Aggregated depth of a symbol's book.
+    unfilled_orders(symbol, trader_id)
+        A trader's resting orders in a symbol's book.
+    advance()
+        Advance every book by one timestep.
+    close()
+        Stop the worker processes.
+    """
+
+    def __init__(self, symbols=(), workers=0, batch_capacity=65536, **book_kwargs):
+        """
+        Initialize a manager and the books for an initial set of symbols.
+
+        Parameters
+        ----------
+        symbols : iterable of str, optional
+            Symbols to create books for (default is none).
+        workers : int, optional
+            Number of worker processes to shard symbols across (default is
+            0, books in this process).
+        batch_capacity : int, optional
+            Number of requests sent to a worker at a time; larger flushes
+            are split (default is 65536).
+        **book_kwargs
+            Passed to every OrderBook. ``dense_ids`` is not supported: the
+            submitted orders' IDs key cancels and flush results, so they
+            must stay unique across the shared request stream rather than be
+            reissued by each book.
+
+        Raises
+        ------
+        ValueError
+            If workers is negative, batch_capacity is not positive or
+            dense_ids is requested.
+        """
+        if book_kwargs.get("dense_ids"):
+            raise ValueError(
+                "dense_ids is not supported: order IDs must stay unique across "
+                "the manager's shared request stream."
+            )
+        if workers < 0:
+            raise ValueError(f"workers must be non-negative, got {workers}")
+        if batch_capacity <= 0:
+            raise ValueError(f"batch_capacity must be positive, got {batch_capacity}")
+        self.symbols = []
+        self.workers = workers
+        self.book_kwargs = book_kwargs
+        self.batch_capacity = batch_capacity
+        self._index = {}  # symbol -> index
+        self._worker_of = []  # index -> worker
+        self._books = {}  # index -> OrderBook, in-process only
+        self._pending = [[] for _ in range(max(workers, 1))]
+
+        self._processes = []
+        self._conns = []
+        self._inbound = []
+        self._outbound = []
+        for _ in range(workers):
+            inbound = SharedMemory(create=True, size=batch_capacity * _REQUEST_DTYPE.itemsize)
+            outbound = SharedMemory(create=True, size=batch_capacity * 8)
+            conn, child_conn = mp.Pipe()
+            process = mp.Process(
+                target=_serve,
+                args=(child_conn, inbound.name, outbound.name, book_kwargs),
+                daemon=True,
+            )
+            process.start()
+            child_conn.close()
+            self._processes.append(process)
+            self._conns.append(conn)
+            self._inbound.append(inbound)
+            self._outbound.append(outbound)
+
+        for symbol in symbols:
+            self.add_symbol(symbol)
+
+    def add_symbol(self, symbol):
+        """
+        Create the book for a symbol.
+
+        Parameters
+        ----------
+        symbol : str
+            New symbol.
+
+        Raises
+        ------
+        ValueError
+            If the symbol already has a book.
+        """
+        if symbol in self._index:
+            raise ValueError(f"Symbol {symbol} already has a book.")
+        index = len(self.symbols)
+        self.symbols.append(symbol)
+        self._index[symbol] = index
+        if self.workers:
+            worker = index % self.workers
+            self._worker_of.append(worker)
+            self._request(worker, ("add_symbol", index))
+        else:
+            self._worker_of.append(0)
+            self._books[index] = OrderBook(**self.book_kwargs)
+
+    def _lookup(self, symbol):
+        index = self._index.get(symbol)
+        if index is None:
+            raise ValueError(f"Unknown symbol {symbol}.")
+        return index
+
+    def submit(self, symbol, order):
+        """
+        Stage an order for a symbol.
+
+        Parameters
+        ----------
+        symbol : str
+            Symbol the order is for.
+        order : Order
+            Limit or market order; its ID is kept.
+        """
+        index = self._lookup(symbol)
+        self._pending[self._worker_of[index]].append(
+            (
+                order.id,
+                np.nan if order.price is None else order.price,
+                order.volume,
+                -1 if order.trader_id is None else order.trader_id,
+                -1 if order.lifetime is None else order.lifetime,
+                index,
+                ORDER,
+                order.is_bid,
+                order.is_market,
+                b"",
+            )
+        )
+
+    def submit_cancel(self, symbol, order_id):
+        """
+        Stage a cancellation for a symbol.
+
+        Parameters
+        ----------
+        symbol : str
+            Symbol the order rests in.
+        order_id : int
+            ID of the order to cancel.
+        """
+        index = self._lookup(symbol)
+        self._pending[self._worker_of[index]].append(
+            (order_id, np.nan, 0, -1, -1, index, CANCEL, False, False, b"")
+        )
+
+    def flush(self):
+        """
+        Apply every staged request and return the results per symbol.
+
+        Returns
+        -------
+        dict
+            Maps each symbol with staged requests to a dict of arrays:
+            ``order_id``, ``kind`` (ORDER or CANCEL) and ``volume`` (the
+            order's volume left after entering the book, or the volume a
+            cancellation removed)
+            with one entry per request in submission order, and
+            ``bid_order_id``, ``ask_order_id``, ``price`` and
+            ``trade_volume`` with one entry per trade in execution order.
+        """
+        batches = [
+            np.array(pending, dtype=_REQUEST_DTYPE) for pending in self._pending
+        ]
+        for pending in self._pending:
+            pending.clear()
+
+        requests, volumes, trades = [], [], []
+        if self.workers:
+            capacity = self.batch_capacity
+            rounds = max((len(batch) + capacity - 1) // capacity for batch in batches)
+            for r in range(rounds):
+                sent = []
+                for worker, batch in enumerate(batches):
+                    chunk = batch[r * capacity:(r + 1) * capacity]
+                    if len(chunk):
+                        buffer = self._inbound[worker].buf
+                        buffer[: chunk.nbytes] = chunk.tobytes()
+                        del buffer
+                        self._conns[worker].send(("batch", len(chunk)))
+                        sent.append((worker, chunk))
+                # Every worker is busy before the first result is read.
+                replies = self._receive_all([worker for worker, _ in sent])
+                for (worker, chunk), n_trades in zip(sent, replies):
+                    buffer = self._outbound[worker].buf
+                    size = len(chunk) * 8
+                    requests.append(chunk)
+                    volumes.append(np.frombuffer(buffer[:size], dtype=np.int64).copy())
+                    trades.append(
+                        np.frombuffer(
+                            buffer[size:size + n_trades * _TRADE_DTYPE.itemsize],
+                            dtype=_TRADE_DTYPE,
+                        ).copy()
+                    )
+                    del buffer
+        else:
+            batch = batches[0]
+            batch_volumes, batch_trades = _process_batch(self._books, batch)
+            requests.append(batch)
+            volumes.append(batch_volumes)
+            trades.append(batch_trades)
+
+        return self._split(
+            np.concatenate(requests) if requests else np.zeros(0, dtype=_REQUEST_DTYPE),
+            np.concatenate(volumes) if volumes else np.zeros(0, dtype=np.int64),
+            np.concatenate(trades) if trades else np.zeros(0, dtype=_TRADE_DTYPE),
+        )
+
+    def _split(self, requests, volumes, trades):
+        """
+        Group flushed requests and trades by symbol, keeping their order.
+        """
+        results = {}
+        request_order = np.argsort(requests["symbol"], kind="stable")
+        trade_order = np.argsort(trades["symbol"], kind="stable")
+        requests = requests[request_order]
+        volumes = volumes[request_order]
+        trades = trades[trade_order]
+        indexes, request_starts = np.unique(requests["symbol"], return_index=True)
+        request_stops = np.r_[request_starts[1:], len(requests)]
+        trade_starts = np.searchsorted(trades["symbol"], indexes, side="left")
+        trade_stops = np.searchsorted(trades["symbol"], indexes, side="right")
+        for index, start, stop, trade_start, trade_stop in zip(
+            indexes.tolist(),
+            request_starts.tolist(),
+            request_stops.tolist(),
+            trade_starts.tolist(),
+            trade_stops.tolist(),
+        ):
+            results[self.symbols[index]] = _columns(
+                requests[start:stop], volumes[start:stop], trades[trade_start:trade_stop]
+            )
+        return results
+
+    def _reply(self, worker):
+        """
+        Read a worker's ``(status, value)`` reply, growing its outbound block
+        if it asks.
+        """
+        conn = self._conns[worker]
+        status, value = conn.recv()
+        if status == "grow":
+            self._outbound[worker].close()
+            self._outbound[worker].unlink()
+            self._outbound[worker] = SharedMemory(create=True, size=2 * value)
+            conn.send(self._outbound[worker].name)
+            status, value = conn.recv()
+        return status, value
+
+    def _receive(self, worker):
+        """
+        Read a worker's reply, raising the error it reports, if any.
+        """
+        status, value = self._reply(worker)
+        if status == "error":
+            raise value
+        return value
+
+    def _receive_all(self, workers):
+        """
+        Read one reply from each of several workers.
+
+        Every reply is read before the first reported error is raised, so
+        no worker is left with an unread reply on its pipe.
+        """
+        values = []
+        error = None
+        for worker in workers:
+            status, value = self._reply(worker)
+            if status == "error" and error is None:
+                error = value
+            values.append(value)
+        if error is not None:
+            raise error
+        return values
+
+    def _request(self, worker, message):
+        self._conns[worker].send(message)
+        return self._receive(worker)
+
+    def process_orders(self, symbol, orders):
+        """
+        Submit orders for one symbol and flush.
+
+        Anything already staged is flushed too; only this symbol's results
+        are returned.
+
+        Parameters
+        ----------
+        symbol : str
+            Symbol the orders are for.
+        orders : list of Order
+            Orders to process in sequence.
+
+        Returns
+        -------
+        dict
+            The symbol's results, as described in ``flush``.
+        """
+        self._lookup(symbol)
+        for order in orders:
+            self.submit(symbol, order)
+        return self._flush_symbol(symbol)
+
+    def process_cancellations(self, symbol, order_ids):
+        """
+        Submit cancellations for one symbol and flush.
+
+        Parameters
+        ----------
+        symbol : str
+            Symbol the orders rest in.
+        order_ids : list of int
+            IDs of the orders to cancel.
+
+        Returns
+        -------
+        dict
+            The symbol's results, as described in ``flush``.
+        """
+        self._lookup(symbol)
+        for order_id in order_ids:
+            self.submit_cancel(symbol, order_id)
+        return self._flush_symbol(symbol)
+
+    def _flush_symbol(self, symbol):
+        """
+        Flush and return one symbol's results (empty columns if it had no
+        staged requests).
+        """
+        results = self.flush()
+        if symbol in results:
+            return results[symbol]
+        return _columns(
+            np.zeros(0, dtype=_REQUEST_DTYPE),
+            np.zeros(0, dtype=np.int64),
+            np.zeros(0, dtype=_TRADE_DTYPE),
+        )
+
+    def _call(self, symbol, name, *args):
+        """
+        Call an OrderBook method on a symbol's book and return its result.
+
+        Queries see every flushed request, not staged ones.
+        """
+        index = self._lookup(symbol)
+        if self.workers:
+            return self._request(self._worker_of[index], ("call", index, name, args))
+        return getattr(self._books[index], name)(*args)
+
+    def get_best_bid(self, symbol):
+        """
+        Get the best bid price of a symbol's book.
+        """
+        return self._call(symbol, "get_best_bid")
+
+    def get_best_ask(self, symbol):
+        """
+        Get the best ask price of a symbol's book.
+        """
+        return self._call(symbol, "get_best_ask")
+
+    def l2_snapshot(self, symbol, n_levels=10):
+        """
+        Get the aggregated depth of a symbol's book (see
+        ``OrderBook.l2_snapshot``).
+        """
+        return self._call(symbol, "l2_snapshot", n_levels)
+
+    def unfilled_orders(self, symbol, trader_id):
+        """
+        Get a trader's resting orders in a symbol's book (see
+        ``OrderBook.unfilled_orders``).
+        """
+        return self._call(symbol, "unfilled_orders", trader_id)
+
+    def advance(self):
+        """
+        Advance every book by one timestep.
+        """
+        if self.workers:
+            for conn in self._conns:
+                conn.send(("advance",))
+            self._receive_all(range(self.workers))
+        else:
+            for book in self._books.values():
+                book.advance()
+
+    def close(self):
+        """
+        Stop the worker processes and release their shared memory.
+        """
+        for conn, process in zip(self._conns, self._processes):
+            conn.send(("stop",))
+            process.join()
+            conn.close()
+        for block in self._inbound + self._outbound:
+            block.close()
+            block.unlink()
+        self._conns, self._processes = [], []
+        self._inbound, self._outbound = [], []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __repr__(self):
+        return f"BookManager(symbols={len(self.symbols)}, workers={self.workers})"
@@ -0,0 +1,148 @@
+"""
+Incremental market-data feed for the order book.
+
+This module defines the DeltaFeed class, a fixed-size ring buffer of book
+change events (order added, cancelled or executed; level added, changed or
+removed) that price books publish to and consumers drain in batches.
+"""
+
+import numpy as np
+
+
+class DeltaFeed:
+    """
+    Ring buffer of order book change events.
+
+    Each event is one row of NumPy columns. Order events carry the order ID
+    and the volume added, cancelled or executed; level events carry an order
+    ID of -1 and the level's new total volume. Applying the events in
+    sequence to a mirror reproduces the book at level 2 (level events) and
+    level 3 (order events).
+
+    When the buffer is full the oldest undrained events are overwritten and
+    counted in ``dropped``, so a consumer that falls behind knows to
+    resynchronize from a snapshot.
+
+    Attributes
+    ----------
+    capacity : int
+        Number of events held, a power of two.
+    published : int
+        Sequence number of the next event (total events published).
+    dropped : int
+        Number of events overwritten before being drained.
+
+    Methods
+    -------
+    publish(kind, is_bid, order_id, price, volume)
+        Append one event.
+    drain(max_events=None)
+        Remove and return the oldest pending events as arrays.
+    """
+
+    # Event kinds
+    ORDER_ADDED = 0
+    ORDER_CANCELLED = 1
+    ORDER_EXECUTED = 2
+    LEVEL_ADDED = 3
+    LEVEL_CHANGED = 4
+    LEVEL_REMOVED = 5
+    BOOK_CLEARED = 6
+
+    def __init__(self, capacity=65536):
+        """
+        Initialize an empty feed.
+
+        Parameters
+        ----------
+        capacity : int, optional
+            Number of events to hold, rounded up to a power of two (default
+            is 65536).
+
+        Raises
+        ------
+        ValueError
+            If capacity is not positive.
+        """
+        if capacity <= 0:
+            raise ValueError(f"capacity must be positive, got {capacity}")
+        self.capacity = 1 << (capacity - 1).bit_length()
+        self._mask = self.capacity - 1
+        self.published = 0
+        self.dropped = 0
+        self._read = 0
+        self._kind = np.empty(self.capacity, dtype=np.int8)
+        self._is_bid = np.empty(self.capacity, dtype=bool)
+        self._order_id = np.empty(self.capacity, dtype=np.int64)
+        self._price = np.empty(self.capacity, dtype=np.float64)
+        self._volume = np.empty(self.capacity, dtype=np.int64)
+
+    def __len__(self):
+        return self.published - self._read
+
+    def publish(self, kind, is_bid, order_id, price, volume):
+        """
+        Append one event, overwriting the oldest if the buffer is full.
+
+        Parameters
+        ----------
+        kind : int
+            One of the event kind constants.
+        is_bid : bool
+            Side of the book the event applies to.
+        order_id : int
+            Order ID, or -1 for level events.
+        price : float or int
+            Price in the book's internal units (ticks in tick mode).
+        volume : int
+            Order volume delta, or the level's new total volume.
+        """
+        seq = self.published
+        if seq - self._read == self.capacity:
+            self._read += 1
+            self.dropped += 1
+        i = seq & self._mask
+        self._kind[i] = kind
+        self._is_bid[i] = is_bid
+        self._order_id[i] = order_id
+        self._price[i] = price
+        self._volume[i] = volume
+        self.published = seq + 1
+
+    def drain(self, max_events=None):
+        """
+        Remove and return the oldest pending events.
+
+        Parameters
+        ----------
+        max_events : int, optional
+            Maximum number of events to return (default is None, all
+            pending events).
+
+        Returns
+        -------
+        dict of numpy.ndarray
+            ``seq``, ``kind``, ``is_bid``, ``order_id``, ``price`` and
+            ``volume`` columns, oldest event first.
+        """
+        start = self._read
+        stop = self.published
+        if max_events is not None:
+            stop = min(stop, start + max_events)
+        seq = np.arange(start, stop, dtype=np.int64)
+        index = seq & self._mask
+        self._read = stop
+        return {
+            "seq": seq,
+            "kind": self._kind[index],
+            "is_bid": self._is_bid[index],
+            "order_id": self._order_id[index],
+            "price": self._price[index],
+            "volume": self._volume[index],
+        }
+
+    def __repr__(self):
+        return (
+            f"DeltaFeed(pending={len(self)}, published={self.published}, "
+            f"dropped={self.dropped})"
+        )
@@ -0,0 +1,344 @@
+"""
+Cumulative depth index for one side of an integer-tick order book.
+
+This module defines the DepthIndex class, a Fenwick (binary indexed) tree of
+resting volume by tick that answers cumulative liquidity and sweep queries
+in O(log W) for a window of W ticks next to the touch.
+"""
+
+from bisect import bisect_left, bisect_right, insort
+from itertools import accumulate
+
+
+class DepthIndex:
+    """
+    Fenwick tree of resting volume and notional by tick for one book side.
+
+    Ticks are keyed best first (``-tick`` on the bid side, ``tick`` on the
+    ask side), so prefix sums run from the touch outwards. Position ``i`` of
+    the window holds key ``base + i``. A second tree holds ``volume * tick``
+    for volume-weighted prices. The owning side calls ``set`` whenever a
+    level's volume changes.
+
+    The window has a fixed width. Ticks worse than the window are kept in an
+    overflow map with a sorted key list; queries that reach past the window
+    bisect cumulative sums over it, rebuilt after the overflow changes. A
+    tick better than the window, or a window left empty while the overflow
+    holds volume, re-anchors the window a quarter of its width behind the
+    best tick and rebuilds both trees in O(W + overflow), so memory never
+    depends on how far apart resting orders are.
+
+    Attributes
+    ----------
+    is_bid_side : bool
+        True if this indexes the bid side, False for the ask side.
+    width : int
+        Number of ticks covered by the window, a power of two.
+    base : int or None
+        Key held by position 0, or None before the first update.
+    total : int
+        Total volume across the side, overflow included.
+
+    Methods
+    -------
+    set(tick, volume)
+        Record the total volume resting at a tick.
+    volume_through(tick)
+        Get the volume at ticks as good as or better than a tick.
+    sweep(volume)
+        Get the tick and notional reached by sweeping a volume.
+    load(ticks, volumes)
+        Replace the index's contents in O(W).
+    clear()
+        Remove all volume, keeping the width.
+    """
+
+    def __init__(self, is_bid_side, width=4096):
+        """
+        Initialize an empty depth index.
+
+        Parameters
+        ----------
+        is_bid_side : bool
+            True if this indexes the bid side, False for the ask side.
+        width : int, optional
+            Number of ticks covered by the window, rounded up to a power of
+            two (default is 4096).
+
+        Raises
+        ------
+        ValueError
+            If width is not positive.
+        """
+        if width <= 0:
+            raise ValueError(f"width must be positive, got {width}")
+        self.is_bid_side = is_bid_side
+        self.width = 1 << (width - 1).bit_length()
+        self.base = None
+        self.total = 0
+        self._volume = [0] * self.width
+        # 1-based Fenwick trees of volume and of volume * tick.
+        self._tree = [0] * (self.width + 1)
+        self._notional = [0] * (self.width + 1)
+        # Volume by key for keys past the end of the window, the keys in
+        # order, and their cumulative volume and notional (None until a query
+        # needs them).
+        self._outside = {}
+        self._outside_keys = []
+        self._outside_sums = None
+        self._outside_total = 0
+
+    def _tick(self, position):
+        key = self.base + position
+        return -key if self.is_bid_side else key
+
+    def set(self, tick, volume):
+        """
+        Record the total volume resting at a tick.
+
+        O(log W) inside the window. Past it, O(log n) in the n overflow
+        ticks, plus a list insertion or removal when a tick appears or
+        empties.
+
+        Parameters
+        ----------
+        tick : int
+            Price level tick.
+        volume : int
+            Volume now resting at that tick.
+        """
+        key = -tick if self.is_bid_side else tick
+        if self.base is None:
+            self.base = key - self.width // 4
+        position = key - self.base
+        if position < 0:
+            if not volume:
+                return
+            self._rebase(key - self.width // 4)
+            position = key - self.base
+        elif position >= self.width:
+            outside = self._outside
+            keys = self._outside_keys
+            previous = outside.get(key, 0)
+            delta = volume - previous
+            if not delta:
+                return
+            if volume:
+                if not previous:
+                    insort(keys, key)
+                outside[key] = volume
+            else:
+                del outside[key]
+                del keys[bisect_left(keys, key)]
+            self._outside_sums = None
+            self._outside_total += delta
+            self.total += delta
+            if self.total == self._outside_total and keys:
+                self._rebase(keys[0] - self.width // 4)
+            return
+        delta = volume - self._volume[position]
+        if not delta:
+            return
+        self._volume[position] = volume
+        self.total += delta
+        weighted = delta * tick
+        tree = self._tree
+        notional = self._notional
+        width = self.width
+        i = position + 1
+        while i <= width:
+            tree[i] += delta
+            notional[i] += weighted
+            i += i & -i
+        if self.total == self._outside_total and self._outside_keys:
+            # The window emptied: move it onto the overflow's best tick.
+            self._rebase(self._outside_keys[0] - self.width // 4)
+
+    def _rebase(self, base):
+        """
+        Move the window to start at key ``base``, spilling keys past its end
+        into the overflow map, then rebuild the trees.
+        """
+        live = dict(self._outside)
+        for position, volume in enumerate(self._volume):
+            if volume:
+                live[self.base + position] = volume
+        self._place(base, live.keys(), live.values())
+
+    def _place(self, base, keys, volumes):
+        """
+        Fill the window starting at ``base`` and the overflow map from keys
+        and volumes, then rebuild both trees in O(W).
+        """
+        width = self.width
+        self.base = base
+        self._volume = window = [0] * width
+        self._outside = outside = {}
+        for key, volume in zip(keys, volumes):
+            position = key - base
+            if position < width:
+                window[position] += volume
+            else:
+                outside[key] = outside.get(key, 0) + volume
+        self._outside_keys = sorted(outside)
+        self._outside_sums = None
+        self._outside_total = sum(outside.values())
+        self._build()
+
+    def _build(self):
+        """
+        Rebuild both trees from the per-position volumes in O(W).
+        """
+        width = self.width
+        volumes = self._volume
+        tree = [0] + volumes
+        notional = [0] + [
+            volume * self._tick(position) if volume else 0
+            for position, volume in enumerate(volumes)
+        ]
+        for i in range(1, width + 1):
+            parent = i + (i & -i)
+            if parent <= width:
+                tree[parent] += tree[i]
+                notional[parent] += notional[i]
+        self._tree = tree
+        self._notional = notional
+        self.total = sum(volumes) + self._outside_total
+
+    def load(self, ticks, volumes):
+        """
+        Replace the index's contents in O(W), anchoring on the best tick.
+
+        Parameters
+        ----------
+        ticks : sequence of int
+            Ticks holding volume.
+        volumes : sequence of int
+            Volume at each tick.
+        """
+        if not ticks:
+            self.clear()
+            return
+        keys = [-tick if self.is_bid_side else tick for tick in ticks]
+        self._place(min(keys) - self.width // 4, keys, volumes)
+
+    def _prefix(self, position, tree):
+        """
+        Sum ``tree`` over positions ``0`` to ``position`` inclusive.
+        """
+        total = 0
+        i = position + 1
+        while i > 0:
+            total += tree[i]
+            i -= i & -i
+        return total
+
+    def _cumulative_outside(self):
+        """
+        Get the cumulative volume and notional over the sorted overflow keys,
+        each with a leading 0, rebuilding them in O(n) if the overflow has
+        changed since the last call.
+        """
+        if self._outside_sums is None:
+            outside = self._outside
+            keys = self._outside_keys
+            sign = -1 if self.is_bid_side else 1
+            self._outside_sums = (
+                list(accumulate((outside[key] for key in keys), initial=0)),
+                list(accumulate((outside[key] * sign * key for key in keys), initial=0)),
+            )
+        return self._outside_sums
+
+    def volume_through(self, tick):
+        """
+        Get the volume at ticks as good as or better than ``tick``.
+
+        O(log W) inside the window. Past it, O(log n) in the n overflow
+        ticks, plus an O(n) rebuild of the overflow's cumulative sums on the
+        first such query after the overflow changes.
+
+        Parameters
+        ----------
+        tick : int
+            Limit tick, from the point of view of this side's orders.
+
+        Returns
+        -------
+        int
+            Volume resting at or inside ``tick``.
+        """
+        if self.base is None:
+            return 0
+        key = -tick if self.is_bid_side else tick
+        position = key - self.base
+        if position < 0:
+            return 0
+        if position < self.width:
+            return self._prefix(position, self._tree)
+        volumes, _ = self._cumulative_outside()
+        return (self.total - self._outside_total) + volumes[
+            bisect_right(self._outside_keys, key)
+        ]
+
+    def sweep(self, volume):
+        """
+        Get the tick and notional reached by sweeping ``volume`` from the touch.
+
+        O(log W) within the window. Sweeps past it cost O(log n) in the n
+        overflow ticks, plus the same O(n) rebuild as ``volume_through``.
+
+        Parameters
+        ----------
+        volume : int
+            Positive volume to take.
+
+        Returns
+        -------
+        tuple of int or None
+            ``(tick, notional)``: the last tick touched and the sum of
+            ``volume * tick`` over the fills, or None if the side holds less
+            than ``volume``.
+        """
+        if volume > self.total:
+            return None
+        window_total = self.total - self._outside_total
+        if volume > window_total:
+            # Take the whole window, then find the first overflow tick whose
+            # cumulative volume covers the rest.
+            remaining = volume - window_total
+            volumes, notionals = self._cumulative_outside()
+            i = bisect_left(volumes, remaining) - 1
+            key = self._outside_keys[i]
+            tick = -key if self.is_bid_side else key
+            before = self._prefix(self.width - 1, self._notional) + notionals[i]
+            return tick, before + (remaining - volumes[i]) * tick
+        tree = self._tree
+        notional = self._notional
+        position = 0
+        remaining = volume
+        before = 0
+        step = self.width
+        # Descend to the last position whose prefix is still short of volume.
+        while step:
+            i = position + step
+            if tree[i] < remaining:
+                position = i
+                remaining -= tree[i]
+                before += notional[i]
+            step >>= 1
+        tick = self._tick(position)
+        return tick, before + remaining * tick
+
+    def clear(self):
+        """
+        Remove all volume, keeping the width.
+        """
+        self.base = None
+        self.total = 0
+        self._volume = [0] * self.width
+        self._tree = [0] * (self.width + 1)
+        self._notional = [0] * (self.width + 1)
+        self._outside = {}
+        self._outside_keys = []
+        self._outside_sums = None
+        self._outside_total = 0
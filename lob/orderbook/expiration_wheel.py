@@ -1,41 +1,66 @@
 """
 Expiration wheel for efficient order lifetime management.
 
-This module implements a circular buffer-based expiration system for
-orders with time-to-live (TTL) constraints.
+This module implements a hierarchical timing wheel for orders with
+time-to-live (TTL) constraints. Each level is a ring of buckets; a bucket at
+level k spans ``wheel_size ** k`` time steps, so any lifetime is scheduled in
+O(1) and entries cascade down a level whenever time crosses their bucket.
 """
 
+import numpy as np
+
 
 class ExpirationWheel:
     """
-    Circular buffer for tracking and expiring orders by lifetime.
+    Hierarchical timing wheel for tracking and expiring orders by lifetime.
+
+    Time is an ever increasing step count. An order expiring at step ``t`` is
+    stored at the level of the highest base-``wheel_size`` digit in which
+    ``t`` differs from the current step, in the bucket given by that digit of
+    ``t``. When the current step reaches a multiple of ``wheel_size ** k``
+    the matching level-k bucket is emptied and its orders rescheduled onto
+    lower levels, until they reach level 0 and expire. Levels are added on
+    demand, so lifetimes are unbounded and memory grows with the logarithm
+    of the longest lifetime.
 
-    Uses a fixed-size circular buffer where each bucket holds orders
-    expiring at that time step. Time advances cyclically through buckets.
+    Buckets are keyed by order ID and every live order's bucket is indexed,
+    so an order that fills or is cancelled is detached in O(1) and advancing
+    only ever touches orders that are still live.
 
     Attributes
     ----------
-    max_lifetime : int
-        Maximum lifetime (in time steps) for any order.
+    max_lifetime : int or None
+        Horizon (in time steps) covered by the levels allocated up front.
+        Longer lifetimes are accepted and add levels as needed.
     min_lifetime : int
         Default lifetime assigned to orders without explicit lifetime.
-    expiration_bucket : list of list
-        Circular buffer where each bucket contains order IDs expiring at
-        that time step.
+    wheel_size : int
+        Number of buckets per level, a power of two.
+    levels : list of list of dict
+        ``levels[k][i]`` maps the IDs of the orders in bucket ``i`` at level
+        k to their expiration steps.
     now : int
-        Current time step (index into expiration_bucket).
+        Current time step.
 
     Methods
     -------
     schedule(order)
         Schedule an order for expiration based on its lifetime.
+    detach(order_id)
+        Remove an order's expiry entry.
+    attach(order_id, expiration)
+        Schedule an order to expire at a given step.
     advance()
         Advance time by one step and return expired order IDs.
     reset()
         Resets the expiration wheel.
+    state()
+        Export the wheel's contents as arrays.
+    load_state(state)
+        Replace the wheel's contents with exported arrays.
     """
 
-    def __init__(self, min_lifetime, max_lifetime):
+    def __init__(self, min_lifetime, max_lifetime=None, wheel_size=64):
         """
         Initialize the expiration wheel with lifetime bounds.
 
@@ -43,18 +68,59 @@ class ExpirationWheel:
         ----------
         min_lifetime : int
             Default lifetime assigned to orders without explicit lifetime.
-        max_lifetime : int
-            Maximum lifetime (in time steps) for any order.
+        max_lifetime : int, optional
+            Longest lifetime expected. Enough levels to cover it are
+            allocated up front; longer lifetimes are still scheduled
+            correctly (default is None, one level).
+        wheel_size : int, optional
+            Number of buckets per level, a power of two (default is 64).
+
+        Raises
+        ------
+        ValueError
+            If wheel_size is not a power of two of at least 2.
         """
+        if wheel_size < 2 or wheel_size & (wheel_size - 1):
+            raise ValueError("wheel_size must be a power of two of at least 2.")
         self.max_lifetime = max_lifetime
         self.min_lifetime = min_lifetime
-        self.expiration_bucket = [[] for _ in range(max_lifetime)]
+        self.wheel_size = wheel_size
+        self._bits = wheel_size.bit_length() - 1
+        self._mask = wheel_size - 1
+        self.levels = [[{} for _ in range(wheel_size)]]
+        # Bucket holding each live order ID.
+        self._buckets = {}
+        if max_lifetime is not None:
+            self._grow(((max_lifetime - 1).bit_length() - 1) // self._bits)
         self.now = 0
 
+    def _grow(self, level):
+        """
+        Allocate levels up to and including ``level``.
+        """
+        while len(self.levels) <= level:
+            self.levels.append([{} for _ in range(self.wheel_size)])
+
+    def _place(self, order_id, expiration):
+        """
+        File an order ID under its expiration step relative to ``now``.
+        """
+        level = ((expiration ^ self.now).bit_length() - 1) // self._bits
+        if level <= 0:
+            bucket = self.levels[0][expiration & self._mask]
+        else:
+            if level >= len(self.levels):
+                self._grow(level)
+            bucket = self.levels[level][(expiration >> (level * self._bits)) & self._mask]
+        bucket[order_id] = expiration
+        self._buckets[order_id] = bucket
+
     def schedule(self, order):
         """
         Schedule an order for expiration based on its lifetime.
 
+        A lifetime below one expires on the next ``advance``.
+
         Parameters
         ----------
         order : Order
@@ -62,8 +128,43 @@ class ExpirationWheel:
         """
         lifetime = (order.lifetime if order.lifetime is not None
                     else self.min_lifetime)
-        expiration = (self.now + lifetime) % self.max_lifetime
-        self.expiration_bucket[expiration].append(order.id)
+        self._place(order.id, self.now + max(lifetime, 1))
+
+    def detach(self, order_id):
+        """
+        Remove an order's expiry entry in O(1).
+
+        Parameters
+        ----------
+        order_id : int
+            ID of the order.
+
+        Returns
+        -------
+        int or None
+            The step the order was due to expire at, or None if it was not
+            scheduled.
+        """
+        bucket = self._buckets.pop(order_id, None)
+        if bucket is None:
+            return None
+        return bucket.pop(order_id)
+
+    def attach(self, order_id, expiration):
+        """
+        Schedule an order to expire at a given step.
+
+        Used to reinstate an entry returned by ``detach``; a step that has
+        already passed expires on the next ``advance``.
+
+        Parameters
+        ----------
+        order_id : int
+            ID of the order.
+        expiration : int
+            Step at which the order expires.
+        """
+        self._place(order_id, max(expiration, self.now + 1))
 
     def advance(self):
         """
@@ -74,15 +175,88 @@ class ExpirationWheel:
         list of int
             List of order IDs that expired at the current time step.
         """
-        self.now = (self.now + 1) % self.max_lifetime
-        expired = self.expiration_bucket[self.now]
-        self.expiration_bucket[self.now] = []
-        return expired
-    
+        self.now = now = self.now + 1
+        bits = self._bits
+        levels = self.levels
+
+        # Levels whose bucket boundary was just crossed, highest first, so
+        # entries cascade all the way down before level 0 fires.
+        top = 1
+        while top < len(levels) and not now & ((1 << (top * bits)) - 1):
+            top += 1
+        for level in range(top - 1, 0, -1):
+            buckets = levels[level]
+            index = (now >> (level * bits)) & self._mask
+            bucket = buckets[index]
+            if bucket:
+                buckets[index] = {}
+                for order_id, expiration in bucket.items():
+                    self._place(order_id, expiration)
+
+        buckets = levels[0]
+        index = now & self._mask
+        expired = buckets[index]
+        if not expired:
+            return []
+        buckets[index] = {}
+        live = self._buckets
+        for order_id in expired:
+            del live[order_id]
+        return list(expired)
+
     def reset(self):
         """
         Resets the expiration wheel in a cache friendly way
         """
         self.now = 0
-        for bucket in self.expiration_bucket:
-            bucket.clear()
\ No newline at end of file
+        for buckets in self.levels:
+            for bucket in buckets:
+                bucket.clear()
+        self._buckets.clear()
+
+    def state(self):
+        """
+        Export the wheel's contents as arrays.
+
+        Returns
+        -------
+        dict of numpy.ndarray
+            ``lifetimes`` (min, max; -1 for no max), ``now``, and ``ids`` with
+            the matching absolute ``expirations`` of every scheduled order.
+        """
+        live = self._buckets
+        return {
+            "lifetimes": np.array(
+                [self.min_lifetime,
+                 -1 if self.max_lifetime is None else self.max_lifetime],
+                dtype=np.int64,
+            ),
+            "now": np.array([self.now], dtype=np.int64),
+            "ids": np.fromiter(live, dtype=np.int64, count=len(live)),
+            "expirations": np.fromiter(
+                (bucket[order_id] for order_id, bucket in live.items()),
+                dtype=np.int64,
+                count=len(live),
+            ),
+        }
+
+    def load_state(self, state):
+        """
+        Replace the wheel's contents with arrays from ``state``.
+
+        Parameters
+        ----------
+        state : mapping of numpy.ndarray
+            Arrays as returned by ``state``.
+        """
+        min_lifetime, max_lifetime = state["lifetimes"].tolist()
+        now = int(state["now"][0])
+        ids = state["ids"].tolist()
+        expirations = state["expirations"].tolist()
+
+        self.reset()
+        self.min_lifetime = min_lifetime
+        self.max_lifetime = None if max_lifetime < 0 else max_lifetime
+        self.now = now
+        for order_id, expiration in zip(ids, expirations):
+            self._place(order_id, expiration)
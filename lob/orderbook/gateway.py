@@ -0,0 +1,780 @@
+"""
+Asyncio order-entry gateway for the order book.
+
+This module defines a compact length-prefixed binary protocol for order,
+cancel and amend messages and the acknowledgements and fills sent back, the
+OrderGateway server that feeds many client connections (TCP or Unix
+sockets) into one OrderBook in micro-batches, the GatewayClient connection,
+and run_load, a concurrent client load generator that measures end-to-end
+latency.
+"""
+
+import asyncio
+import logging
+import math
+import random
+import struct
+import time
+
+import numpy as np
+
+from ..core import MarketOrder, Order
+
+logger = logging.getLogger(__name__)
+
+# Message types
+ORDER = 1
+CANCEL = 2
+AMEND = 3
+ACK = 11
+FILL = 12
+
+# Acknowledgement statuses
+ACCEPTED = 0
+REJECTED = 1
+
+# Every frame is a little-endian uint32 payload length followed by the
+# payload, whose first byte is the message type.
+_LENGTH = struct.Struct("<I")
+# type, is_bid, is_market, client_seq, price, volume, lifetime (-1 for none)
+_ORDER = struct.Struct("<B??xIdqq")
+# type, client_seq, order_id
+_CANCEL = struct.Struct("<B3xIq")
+# type, client_seq, order_id, price (NaN keeps it), volume (-1 keeps it)
+_AMEND = struct.Struct("<B3xIqdq")
+# type, status, client_seq, order_id
+_ACK = struct.Struct("<BB2xIq")
+# type, num_trades, order_id, filled volume, average price, remaining volume
+_FILL = struct.Struct("<B3xIqqdq")
+
+_DECODERS = {
+    ORDER: _ORDER,
+    CANCEL: _CANCEL,
+    AMEND: _AMEND,
+    ACK: _ACK,
+    FILL: _FILL,
+}
+
+
+def _frame(message, *fields):
+    return _LENGTH.pack(message.size) + message.pack(*fields)
+
+
+def _split_frames(buffer):
+    """
+    Remove every complete frame from the front of a bytearray.
+
+    Returns
+    -------
+    list of bytes
+        Payloads of the complete frames, in order.
+    """
+    payloads = []
+    offset = 0
+    end = len(buffer)
+    while end - offset >= 4:
+        (size,) = _LENGTH.unpack_from(buffer, offset)
+        stop = offset + 4 + size
+        if stop > end:
+            break
+        payloads.append(bytes(buffer[offset + 4:stop]))
+        offset = stop
+    del buffer[:offset]
+    return payloads
+
+
+def decode(payload):
+    """
+    Decode one frame payload.
+
+    Parameters
+    ----------
+    payload : bytes
+        Payload of a frame, without its length prefix.
+
+    Returns
+    -------
+    tuple
+        The message's fields, starting with its type (see the struct
+        layouts in this module).
+
+    Raises
+    ------
+    ValueError
+        If the message type is unknown or the payload has the wrong size.
+    """
+    message = _DECODERS.get(payload[0]) if payload else None
+    if message is None or len(payload) != message.size:
+        raise ValueError(f"Malformed gateway message of {len(payload)} bytes.")
+    return message.unpack(payload)
+
+
+class OrderGateway:
+    """
+    Asyncio server that feeds client connections into one OrderBook.
+
+    Each connection is a session with its own trader ID, which its orders
+    carry in the book. Inbound messages from every session are queued in
+    arrival order and applied in micro-batches: consecutive orders go
+    through one ``process_orders`` call, cancels and amends are applied in
+    place between them. Each session then receives, in one write, an
+    acknowledgement per message (with the order ID the book assigned) and a
+    fill report per order of theirs that traded in the batch.
+
+    Attributes
+    ----------
+    order_book : OrderBook
+        Book the gateway drives.
+    max_batch : int
+        Largest number of messages applied in one micro-batch.
+    batch_delay : float
+        Seconds to wait for more messages once one arrives.
+    batches : int
+        Number of micro-batches applied.
+    messages : int
+        Number of messages applied.
+    failed_batches : int
+        Number of micro-batches whose application raised. The error is
+        logged, every message of the batch not yet acknowledged is
+        rejected, and the gateway carries on with the next batch.
+
+    Methods
+    -------
+    start_tcp(host="127.0.0.1", port=0)
+        Listen on a TCP socket.
+    start_unix(path)
+        Listen on a Unix socket.
+    close()
+        Stop listening and stop the batching task.
+    """
+
+    def __init__(
+        self,
+        order_book,
+        max_batch=4096,
+        batch_delay=0.0,
+        first_trader_id=1,
+        cancel_on_disconnect=True,
+    ):
+        """
+        Initialize a gateway in front of an order book.
+
+        Parameters
+        ----------
+        order_book : OrderBook
+            Book to drive.
+        max_batch : int, optional
+            Largest number of messages applied in one micro-batch (default
+            is 4096).
+        batch_delay : float, optional
+            Seconds to wait for more messages once one arrives; 0 batches
+            only what arrived while the previous batch ran (default is 0.0).
+        first_trader_id : int, optional
+            Trader ID of the first session; later sessions count up from it
+            (default is 1).
+        cancel_on_disconnect : bool, optional
+            Cancel a session's resting orders when it disconnects (default is
+            True).
+        """
+        self.order_book = order_book
+        self.max_batch = max_batch
+        self.batch_delay = batch_delay
+        self.cancel_on_disconnect = cancel_on_disconnect
+        self.batches = 0
+        self.messages = 0
+        self.failed_batches = 0
+        self._next_trader_id = first_trader_id
+        self._sessions = {}  # trader_id -> StreamWriter
+        self._inbox = []  # (trader_id, payload or None for a disconnect)
+        self._wakeup = asyncio.Event()
+        self._servers = []
+        self._batcher = None
+
+    async def start_tcp(self, host="127.0.0.1", port=0):
+        """
+        Listen for client connections on a TCP socket.
+
+        Parameters
+        ----------
+        host : str, optional
+            Interface to bind (default is "127.0.0.1").
+        port : int, optional
+            Port to bind; 0 picks a free port (default is 0).
+
+        Returns
+        -------
+        tuple
+            The bound ``(host, port)``.
+        """
+        server = await asyncio.start_server(self._handle, host, port)
+        self._start(server)
+        return server.sockets[0].getsockname()[:2]
+
+    async def start_unix(self, path):
+        """
+        Listen for client connections on a Unix socket.
+
+        Parameters
+        ----------
+        path : str
+            Path of the socket.
+        """
+        self._start(await asyncio.start_unix_server(self._handle, path))
+
+    def _start(self, server):
+        self._servers.append(server)
+        if self._batcher is None:
+            self._batcher = asyncio.create_task(self._run_batches())
+
+    async def close(self):
+        """
+        Stop listening, close every session and stop the batching task.
+        """
+        for server in self._servers:
+            server.close()
+        for writer in list(self._sessions.values()):
+            writer.close()
+        for server in self._servers:
+            await server.wait_closed()
+        self._servers = []
+        if self._batcher is not None:
+            self._batcher.cancel()
+            try:
+                await self._batcher
+            except asyncio.CancelledError:
+                pass
+            self._batcher = None
+
+    async def _handle(self, reader, writer):
+        """
+        Read one session's frames into the shared inbox.
+        """
+        trader_id = self._next_trader_id
+        self._next_trader_id += 1
+        self._sessions[trader_id] = writer
+        self.order_book.subscribe(trader_id)
+        inbox = self._inbox
+        buffer = bytearray()
+        try:
+            while True:
+                data = await reader.read(65536)
+                if not data:
+                    break
+                buffer += data
+                payloads = _split_frames(buffer)
+                if payloads:
+                    inbox.extend((trader_id, payload) for payload in payloads)
+                    self._wakeup.set()
+        except ConnectionError:
+            pass
+        finally:
+            # Queued behind the session's last messages.
+            inbox.append((trader_id, None))
+            self._wakeup.set()
+            writer.close()
+
+    async def _run_batches(self):
+        """
+        Apply queued messages in micro-batches and send the replies.
+        """
+        while True:
+            await self._wakeup.wait()
+            if self.batch_delay:
+                await asyncio.sleep(self.batch_delay)
+            batch = self._inbox[: self.max_batch]
+            del self._inbox[: self.max_batch]
+            if not self._inbox:
+                self._wakeup.clear()
+
+            replies = {}
+            acked = set()
+            try:
+                self._apply(batch, replies, acked)
+            except Exception:
+                # The batch is already off the inbox; keep serving the rest.
+                logger.exception("Failed to apply a batch of %d messages", len(batch))
+                self.failed_batches += 1
+                self._reject_unacked(batch, replies, acked)
+            self.batches += 1
+            self.messages += len(batch)
+
+            writers = []
+            for trader_id, frames in replies.items():
+                writer = self._sessions.get(trader_id)
+                if writer is not None and not writer.is_closing():
+                    writer.write(b"".join(frames))
+                    writers.append(writer)
+            if writers:
+                await asyncio.gather(
+                    *(writer.drain() for writer in writers), return_exceptions=True
+                )
+            else:
+                # Let the sessions read more before the next batch.
+                await asyncio.sleep(0)
+
+    def _owner(self, order_id):
+        """
+        Get the trader ID of a resting order, or None if it is not resting.
+        """
+        for side in (self.order_book.bids, self.order_book.asks):
+            order = side.get_order(order_id)
+            if order is not None:
+                return order.trader_id
+        return None
+
+    def _reject_unacked(self, batch, replies, acked):
+        """
+        Reject every message of a failed batch that was not acknowledged.
+
+        Parameters
+        ----------
+        batch : list of tuple
+            The ``(trader_id, payload)`` entries of the batch.
+        replies : dict
+            Reply frames framed before the failure, by trader ID; the
+            rejections are appended.
+        acked : set of tuple
+            ``(trader_id, client_seq)`` of the messages already acknowledged.
+        """
+        for trader_id, payload in batch:
+            if payload is None:
+                continue
+            try:
+                message = decode(payload)
+            except ValueError:
+                continue
+            if message[0] == ORDER:
+                seq, order_id = message[3], -1
+            elif message[0] in (CANCEL, AMEND):
+                seq, order_id = message[1], message[2]
+            else:
+                continue
+            if (trader_id, seq) not in acked:
+                replies.setdefault(trader_id, []).append(
+                    _frame(_ACK, ACK, REJECTED, seq, order_id)
+                )
+
+    def _apply(self, batch, replies, acked):
+        """
+        Apply one micro-batch to the book.
+
+        Parameters
+        ----------
+        batch : list of tuple
+            ``(trader_id, payload)`` entries, with None payloads for
+            disconnects.
+        replies : dict
+            Filled with the list of encoded reply frames for each trader ID.
+        acked : set of tuple
+            Filled with the ``(trader_id, client_seq)`` of every message
+            acknowledged, so a failed batch can reject the rest.
+        """
+        book = self.order_book
+        orders = []
+        acks = []
+
+        def reply(trader_id, frame):
+            frames = replies.get(trader_id)
+            if frames is None:
+                replies[trader_id] = [frame]
+            else:
+                frames.append(frame)
+
+        def ack(trader_id, status, seq, order_id):
+            reply(trader_id, _frame(_ACK, ACK, status, seq, order_id))
+            acked.add((trader_id, seq))
+
+        def report(notifications):
+            for trader_id, notifs in notifications.items():
+                for notif in notifs:
+                    reply(
+                        trader_id,
+                        _frame(
+                            _FILL,
+                            FILL,
+                            notif.num_trades,
+                            notif.order_id,
+                            notif.total_filled_volume,
+                            notif.average_price,
+                            notif.remaining_volume,
+                        ),
+                    )
+
+        def match():
+            if orders:
+                notifications = book.process_orders(orders)
+                # Framed after matching: a book with dense IDs assigns them
+                # on acceptance.
+                for trader_id, seq, order in acks:
+                    ack(trader_id, ACCEPTED, seq, order.id)
+                report(notifications)
+                orders.clear()
+                acks.clear()
+
+        for trader_id, payload in batch:
+            if payload is None:
+                match()
+                self._sessions.pop(trader_id, None)
+                if self.cancel_on_disconnect:
+                    book.cancel_trader_orders(trader_id)
+                book.unsubscribe(trader_id)
+                continue
+            try:
+                message = decode(payload)
+            except ValueError:
+                continue
+            kind = message[0]
+            if kind == ORDER:
+                _, is_bid, is_market, seq, price, volume, lifetime = message
+                if volume <= 0 or not (is_market or math.isfinite(price)):
+                    match()
+                    ack(trader_id, REJECTED, seq, -1)
+                    continue
+                if is_market:
+                    order = MarketOrder(volume, is_bid, trader_id)
+                else:
+                    order = Order(
+                        price,
+                        volume,
+                        is_bid,
+                        False,
+                        trader_id,
+                        None if lifetime < 0 else lifetime,
+                    )
+                orders.append(order)
+                acks.append((trader_id, seq, order))
+                continue
+
+            match()
+            if kind == CANCEL:
+                _, seq, order_id = message
+                if self._owner(order_id) == trader_id:
+                    book.process_cancellations([order_id])
+                    status = ACCEPTED
+                else:
+                    status = REJECTED
+                ack(trader_id, status, seq, order_id)
+            elif kind == AMEND:
+                _, seq, order_id, price, volume = message
+                notifications = {}
+                status = REJECTED
+                if self._owner(order_id) == trader_id:
+                    try:
+                        notifications = book.amend(
+                            order_id,
+                            new_price=None if math.isnan(price) else price,
+                            new_volume=None if volume < 0 else volume,
+                        )
+                        status = ACCEPTED
+                    except ValueError:
+                        pass
+                ack(trader_id, status, seq, order_id)
+                report(notifications)
+        match()
+
+
+class GatewayClient:
+    """
+    Client connection to an OrderGateway.
+
+    Sends are buffered by the stream and return the message's client
+    sequence number immediately; replies are read with ``receive``.
+
+    Attributes
+    ----------
+    next_seq : int
+        Client sequence number of the next message.
+
+    Methods
+    -------
+    connect_tcp(host, port)
+        Open a TCP connection.
+    connect_unix(path)
+        Open a Unix socket connection.
+    send_order(price, volume, is_bid, is_market=False, lifetime=None)
+        Send a new order.
+    send_cancel(order_id)
+        Send a cancellation.
+    send_amend(order_id, price=None, volume=None)
+        Send an amendment.
+    receive()
+        Wait for and decode the next replies.
+    close()
+        Close the connection.
+    """
+
+    def __init__(self, reader, writer):
+        """
+        Wrap an open stream pair.
+
+        Parameters
+        ----------
+        reader : asyncio.StreamReader
+            Stream to read replies from.
+        writer : asyncio.StreamWriter
+            Stream to send messages on.
+        """
+        self._reader = reader
+        self._writer = writer
+        self._buffer = bytearray()
+        self.next_seq = 0
+
+    @classmethod
+    async def connect_tcp(cls, host, port):
+        """
+        Open a TCP connection to a gateway.
+        """
+        return cls(*await asyncio.open_connection(host, port))
+
+    @classmethod
+    async def connect_unix(cls, path):
+        """
+        Open a Unix socket connection to a gateway.
+        """
+        return cls(*await asyncio.open_unix_connection(path))
+
+    def _send(self, frame):
+        seq = self.next_seq
+        self.next_seq = (seq + 1) & 0xFFFFFFFF
+        self._writer.write(frame)
+        return seq
+
+    def send_order(self, price, volume, is_bid, is_market=False, lifetime=None):
+        """
+        Send a new order.
+
+        Parameters
+        ----------
+        price : float
+            Limit price (ignored for market orders).
+        volume : int
+            Order volume.
+        is_bid : bool
+            True for a buy order.
+        is_market : bool, optional
+            True for a market order (default is False).
+        lifetime : int, optional
+            Lifetime of the order (default is None, the book's default).
+
+        Returns
+        -------
+        int
+            Client sequence number of the message.
+        """
+        return self._send(
+            _frame(
+                _ORDER,
+                ORDER,
+                is_bid,
+                is_market,
+                self.next_seq,
+                math.nan if price is None else price,
+                volume,
+                -1 if lifetime is None else lifetime,
+            )
+        )
+
+    def send_cancel(self, order_id):
+        """
+        Send a cancellation of one of this session's orders.
+
+        Returns
+        -------
+        int
+            Client sequence number of the message.
+        """
+        return self._send(_frame(_CANCEL, CANCEL, self.next_seq, order_id))
+
+    def send_amend(self, order_id, price=None, volume=None):
+        """
+        Send an amendment of one of this session's orders.
+
+        Parameters
+        ----------
+        order_id : int
+            ID of the order.
+        price : float, optional
+            New price (default is None, keep the price).
+        volume : int, optional
+            New volume (default is None, keep the volume).
+
+        Returns
+        -------
+        int
+            Client sequence number of the message.
+        """
+        return self._send(
+            _frame(
+                _AMEND,
+                AMEND,
+                self.next_seq,
+                order_id,
+                math.nan if price is None else price,
+                -1 if volume is None else volume,
+            )
+        )
+
+    async def drain(self):
+        """
+        Wait until the sent messages have been handed to the socket.
+        """
+        await self._writer.drain()
+
+    async def receive(self):
+        """
+        Wait for the next replies from the gateway.
+
+        Returns
+        -------
+        list of tuple
+            Decoded replies (see ``decode``); empty if the gateway closed
+            the connection.
+        """
+        while True:
+            data = await self._reader.read(65536)
+            if not data:
+                return []
+            self._buffer += data
+            payloads = _split_frames(self._buffer)
+            if payloads:
+                return [decode(payload) for payload in payloads]
+
+    async def close(self):
+        """
+        Close the connection.
+        """
+        self._writer.close()
+        try:
+            await self._writer.wait_closed()
+        except ConnectionError:
+            pass
+
+
+async def run_load(
+    connect,
+    n_clients=8,
+    messages_per_client=10_000,
+    window=32,
+    seed=42,
+    mid_price=100.0,
+    tick_size=0.01,
+):
+    """
+    Drive a gateway with concurrent clients and measure end-to-end latency.
+
+    Each client keeps up to ``window`` messages in flight: limit orders a
+    few ticks around ``mid_price`` (some crossing), market orders, and
+    cancels and amends of its own resting orders. Latency is measured from
+    sending a message to receiving its acknowledgement.
+
+    Parameters
+    ----------
+    connect : callable
+        Coroutine function returning a new GatewayClient.
+    n_clients : int, optional
+        Number of concurrent connections (default is 8).
+    messages_per_client : int, optional
+        Messages each client sends (default is 10000).
+    window : int, optional
+        Messages each client keeps in flight (default is 32).
+    seed : int, optional
+        Random seed (default is 42).
+    mid_price : float, optional
+        Price orders are placed around (default is 100.0).
+    tick_size : float, optional
+        Price increment (default is 0.01).
+
+    Returns
+    -------
+    dict
+        ``messages`` acknowledged, ``rejected``, ``fills`` received,
+        ``seconds`` taken, ``messages_per_second`` and ``latency_ns`` with
+        the ``p50``, ``p90``, ``p99``, ``p99.9`` and ``max`` latency in
+        nanoseconds.
+    """
+    mid = round(mid_price / tick_size)
+
+    async def client(rng):
+        session = await connect()
+        clock = time.perf_counter_ns
+        in_flight = {}  # client_seq -> (send time, volume of a new limit order)
+        resting = {}  # order_id -> volume
+        latencies = []
+        counts = {"rejected": 0, "fills": 0}
+        remaining = messages_per_client
+        while remaining or in_flight:
+            while remaining and len(in_flight) < window:
+                u = rng.random()
+                volume = None
+                if resting and u < 0.3:
+                    order_id = rng.choice(list(resting))
+                    del resting[order_id]
+                    seq = session.send_cancel(order_id)
+                elif resting and u < 0.4:
+                    order_id = rng.choice(list(resting))
+                    if resting[order_id] > 1:
+                        resting[order_id] -= 1
+                        seq = session.send_amend(order_id, volume=resting[order_id])
+                    else:
+                        ticks = mid + rng.randint(-5, 5)
+                        seq = session.send_amend(order_id, price=ticks * tick_size)
+                elif u < 0.45:
+                    seq = session.send_order(None, rng.randint(1, 20), rng.random() < 0.5, True)
+                else:
+                    is_bid = rng.random() < 0.5
+                    ticks = rng.randint(-2, 8)
+                    price = (mid - ticks if is_bid else mid + ticks) * tick_size
+                    volume = rng.randint(1, 50)
+                    seq = session.send_order(price, volume, is_bid)
+                in_flight[seq] = (clock(), volume)
+                remaining -= 1
+            await session.drain()
+
+            replies = await session.receive()
+            if not replies:
+                break
+            now = clock()
+            # An order's acknowledgement precedes its fill reports.
+            for reply in replies:
+                if reply[0] == ACK:
+                    _, status, seq, order_id = reply
+                    sent, volume = in_flight.pop(seq)
+                    latencies.append(now - sent)
+                    if status == REJECTED:
+                        counts["rejected"] += 1
+                    elif volume is not None:
+                        resting[order_id] = volume
+                else:
+                    _, _, order_id, _, _, left = reply
+                    counts["fills"] += 1
+                    if left:
+                        resting[order_id] = left
+                    else:
+                        resting.pop(order_id, None)
+        await session.close()
+        return latencies, counts
+
+    rngs = [random.Random(seed + i) for i in range(n_clients)]
+    start = time.perf_counter()
+    results = await asyncio.gather(*(client(rng) for rng in rngs))
+    seconds = time.perf_counter() - start
+
+    latencies = np.array([x for latency, _ in results for x in latency], dtype=np.int64)
+    messages = len(latencies)
+    stats = {
+        "messages": messages,
+        "rejected": sum(counts["rejected"] for _, counts in results),
+        "fills": sum(counts["fills"] for _, counts in results),
+        "seconds": seconds,
+        "messages_per_second": messages / seconds if seconds > 0 else float("inf"),
+    }
+    if messages:
+        p50, p90, p99, p999 = np.percentile(latencies, [50, 90, 99, 99.9]).tolist()
+        stats["latency_ns"] = {
+            "p50": p50,
+            "p90": p90,
+            "p99": p99,
+            "p99.9": p999,
+            "max": int(latencies.max()),
+        }
+    return stats
@@ -0,0 +1,166 @@
+"""
+Dense, recyclable order IDs for a single order book.
+
+This module defines the IdAllocator class, which hands out small integer
+order IDs and reuses those of orders that have left the book.
+"""
+
+import numpy as np
+
+
+class IdAllocator:
+    """
+    Per-book allocator of dense, recyclable integer order IDs.
+
+    IDs are taken from a free list before the high-water mark is raised, so
+    the live IDs stay within ``[0, next_id)`` and ``next_id`` never exceeds
+    the peak number of orders alive at once. IDs released by fills and
+    cancels are held back until ``recycle`` is called at the start of the
+    next batch, so an ID is never reissued within the batch that freed it
+    and each batch's trades and notifications refer to distinct orders.
+    From the next batch on, a client still holding a departed order's ID
+    refers to whichever order has reused it.
+
+    Attributes
+    ----------
+    next_id : int
+        Lowest ID never yet issued.
+
+    Methods
+    -------
+    allocate()
+        Issue an ID.
+    release(order_id)
+        Return an ID for reuse from the next batch on.
+    claim(order_id)
+        Take back an ID released in the current batch.
+    recycle()
+        Make released IDs available again.
+    rebuild(order_ids)
+        Reset so that exactly the given IDs are in use.
+    reset()
+        Release every ID.
+    state()
+        Export the allocator's state as arrays.
+    load_state(state)
+        Replace the allocator's state with exported arrays.
+    """
+
+    def __init__(self):
+        self.next_id = 0
+        self._free = []
+        # IDs released since the last recycle.
+        self._released = []
+
+    def __len__(self):
+        return self.next_id - len(self._free) - len(self._released)
+
+    def allocate(self):
+        """
+        Issue an ID, reusing a recycled one if any.
+
+        Returns
+        -------
+        int
+            The ID.
+        """
+        if self._free:
+            return self._free.pop()
+        order_id = self.next_id
+        self.next_id = order_id + 1
+        return order_id
+
+    def release(self, order_id):
+        """
+        Return an ID for reuse from the next batch on.
+
+        Parameters
+        ----------
+        order_id : int
+            ID of an order that has left the book.
+        """
+        self._released.append(order_id)
+
+    def claim(self, order_id):
+        """
+        Take back an ID released since the last ``recycle``.
+
+        Used when an order is cancelled and re-entered under the same ID.
+        Recently released IDs are searched first.
+
+        Parameters
+        ----------
+        order_id : int
+            The ID.
+
+        Raises
+        ------
+        ValueError
+            If the ID was not released since the last ``recycle``.
+        """
+        released = self._released
+        for i in range(len(released) - 1, -1, -1):
+            if released[i] == order_id:
+                del released[i]
+                return
+        raise ValueError(f"Order ID {order_id} is not awaiting reuse.")
+
+    def recycle(self):
+        """
+        Make IDs released since the last call available to ``allocate``.
+        """
+        if self._released:
+            self._free.extend(self._released)
+            self._released.clear()
+
+    def rebuild(self, order_ids):
+        """
+        Reset so that exactly ``order_ids`` are in use.
+
+        Parameters
+        ----------
+        order_ids : array_like of int
+            IDs of every live order.
+        """
+        order_ids = np.asarray(order_ids, dtype=np.int64)
+        self.next_id = int(order_ids.max()) + 1 if len(order_ids) else 0
+        used = np.zeros(self.next_id, dtype=bool)
+        used[order_ids] = True
+        self._free = np.flatnonzero(~used)[::-1].tolist()
+        self._released = []
+
+    def reset(self):
+        """
+        Release every ID, restarting from 0.
+        """
+        self.next_id = 0
+        self._free.clear()
+        self._released.clear()
+
+    def state(self):
+        """
+        Export the allocator's state as arrays.
+
+        Returns
+        -------
+        dict of numpy.ndarray
+            ``next_id`` and the ``free`` IDs, in reuse order from last to
+            first (IDs awaiting recycling included).
+        """
+        return {
+            "next_id": np.array([self.next_id], dtype=np.int64),
+            "free": np.array(self._free + self._released, dtype=np.int64),
+        }
+
+    def load_state(self, state):
+        """
+        Replace the allocator's state with arrays from ``state``.
+
+        Parameters
+        ----------
+        state : mapping of numpy.ndarray
+            Arrays as returned by ``state``.
+        """
+        self.next_id = int(state["next_id"][0])
+        self._free = state["free"].tolist()
+        self._released = []
@@ -0,0 +1,344 @@
+"""
+Append-only binary event journal for the order book.
+
+This module defines the fixed-width journal record layout, the Journal
+writer that an OrderBook appends its inbound events to, and the
+JournalReader that memory-maps a journal and replays it into a book.
+"""
+
+import os
+import time
+
+import numpy as np
+
+from ..core import MarketOrder, Order
+
+JOURNAL_MAGIC = b"LOBJRNL1"
+# Magic followed by the record size, padded to 16 bytes.
+_HEADER_SIZE = 16
+
+# Record kinds
+ADD = 0
+CANCEL = 1
+EXPIRE = 2
+AMEND = 3
+CLEAR = 4
+EMPTY = 5  # an order batch with no orders
+
+# One fixed-width (72 byte) record per inbound event. ``batch`` numbers the
+# OrderBook call the event came from. ``price`` is the price as submitted,
+# before tick quantization (NaN when an amend keeps the price), and
+# ``volume`` the submitted volume (-1 when an amend keeps the volume).
+# A ``trader_id`` or ``lifetime`` of None is stored as -1. The outcome fields
+# hold the volume executed on entry and the volume left resting; for
+# cancels and expiries ``resting`` is the volume removed from the book.
+RECORD_DTYPE = np.dtype(
+    [
+        ("batch", "<i8"),
+        ("order_id", "<i8"),
+        ("price", "<f8"),
+        ("volume", "<i8"),
+        ("trader_id", "<i8"),
+        ("lifetime", "<i8"),
+        ("filled", "<i8"),
+        ("resting", "<i8"),
+        ("kind", "u1"),
+        ("is_bid", "?"),
+        ("is_market", "?"),
+        ("_pad", "V5"),
+    ]
+)
+
+
+def _header():
+    return JOURNAL_MAGIC + RECORD_DTYPE.itemsize.to_bytes(8, "little")
+
+
+class Journal:
+    """
+    Append-only writer of fixed-width journal records.
+
+    Records are staged as tuples and written to the file in blocks of
+    packed rows, so journaling costs one tuple append per event. Opening an
+    existing journal appends to it.
+
+    Attributes
+    ----------
+    path : str
+        Path of the journal file.
+    batch : int
+        Number of the current OrderBook call.
+
+    Methods
+    -------
+    next_batch()
+        Start numbering events for a new OrderBook call.
+    record(kind, order_id, ...)
+        Stage one record.
+    flush()
+        Write staged records to the file.
+    close()
+        Flush and close the file.
+    """
+
+    def __init__(self, path, block_size=4096):
+        """
+        Open a journal file for appending.
+
+        Parameters
+        ----------
+        path : str
+            Path of the journal file; created if it does not exist.
+        block_size : int, optional
+            Number of records staged before a write (default is 4096).
+
+        Raises
+        ------
+        ValueError
+            If the file exists but is not a journal.
+        """
+        self.path = path
+        exists = os.path.exists(path) and os.path.getsize(path) > 0
+        if exists:
+            with open(path, "rb") as f:
+                if f.read(_HEADER_SIZE) != _header():
+                    raise ValueError(f"{path} is not an order book journal.")
+        self._file = open(path, "ab")
+        if not exists:
+            self._file.write(_header())
+        self.block_size = block_size
+        self._pending = []
+        # Continue batch numbering after any records already in the file.
+        self.batch = -1
+        if len(self):
+            last = np.memmap(path, dtype=RECORD_DTYPE, mode="r", offset=_HEADER_SIZE)
+            self.batch = int(last["batch"][-1])
+            del last
+
+    def next_batch(self):
+        """
+        Start a new batch: the following events come from one OrderBook call.
+        """
+        self.batch += 1
+
+    def record(
+        self,
+        kind,
+        order_id,
+        price=np.nan,
+        volume=-1,
+        is_bid=False,
+        is_market=False,
+        trader_id=None,
+        lifetime=None,
+        filled=0,
+        resting=0,
+    ):
+        """
+        Stage one record.
+
+        Parameters
+        ----------
+        kind : int
+            Record kind (ADD, CANCEL, EXPIRE, AMEND, CLEAR or EMPTY).
+        order_id : int
+            ID of the order the event applies to (-1 for CLEAR and EMPTY).
+        price, volume, is_bid, is_market, trader_id, lifetime
+            Order fields as submitted (see RECORD_DTYPE).
+        filled, resting : int
+            Outcome of the event (see RECORD_DTYPE).
+        """
+        self._pending.append(
+            (
+                self.batch,
+                order_id,
+                price,
+                volume,
+                -1 if trader_id is None else trader_id,
+                -1 if lifetime is None else lifetime,
+                filled,
+                resting,
+                kind,
+                is_bid,
+                is_market,
+                b"",
+            )
+        )
+        if len(self._pending) >= self.block_size:
+            self.flush()
+
+    def flush(self):
+        """
+        Write staged records to the file.
+        """
+        if self._pending:
+            self._file.write(np.array(self._pending, dtype=RECORD_DTYPE).tobytes())
+            self._pending.clear()
+        self._file.flush()
+
+    def close(self):
+        """
+        Flush staged records and close the file.
+        """
+        if not self._file.closed:
+            self.flush()
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return (
+            (self._file.tell() - _HEADER_SIZE) // RECORD_DTYPE.itemsize
+            + len(self._pending)
+        )
+
+
+class JournalReader:
+    """
+    Memory-mapped reader that replays a journal into an order book.
+
+    Attributes
+    ----------
+    records : numpy.memmap
+        Structured array of RECORD_DTYPE over the journal file.
+
+    Methods
+    -------
+    replay(order_book)
+        Feed every journaled event back through the book.
+    """
+
+    def __init__(self, path):
+        """
+        Map a journal file.
+
+        Parameters
+        ----------
+        path : str
+            Path of the journal file.
+
+        Raises
+        ------
+        ValueError
+            If the file is not a journal.
+        """
+        with open(path, "rb") as f:
+            if f.read(_HEADER_SIZE) != _header():
+                raise ValueError(f"{path} is not an order book journal.")
+        if os.path.getsize(path) > _HEADER_SIZE:
+            self.records = np.memmap(
+                path, dtype=RECORD_DTYPE, mode="r", offset=_HEADER_SIZE
+            )
+        else:
+            self.records = np.zeros(0, dtype=RECORD_DTYPE)
+
+    def __len__(self):
+        return len(self.records)
+
+    def _runs(self):
+        """
+        Split the records into runs of one kind from one batch.
+
+        Returns
+        -------
+        list of tuple
+            ``(kind, start, stop)`` per run, in journal order.
+        """
+        records = self.records
+        if not len(records):
+            return []
+        batch = records["batch"]
+        kind = records["kind"]
+        breaks = np.flatnonzero((batch[1:] != batch[:-1]) | (kind[1:] != kind[:-1])) + 1
+        starts = np.concatenate(([0], breaks)).tolist()
+        stops = np.concatenate((breaks, [len(records)])).tolist()
+        kinds = kind[starts].tolist()
+        return list(zip(kinds, starts, stops))
+
+    def replay(self, order_book):
+        """
+        Feed every journaled event back through an order book.
+
+        Adds from one batch go through a single ``process_orders`` call with
+        their original order IDs (an empty batch through an empty call),
+        cancellations and expiries through ``process_cancellations``, and
+        amends through ``amend``, so a book built like the recorded one ends
+        in the same state and trade history. The replaying
+        book should not use a scheduler, since expiries are replayed from
+        the journal.
+
+        Parameters
+        ----------
+        order_book : OrderBook
+            Book to replay into.
+
+        Returns
+        -------
+        dict
+            ``events`` replayed, ``seconds`` taken and ``events_per_second``.
+
+        Raises
+        ------
+        ValueError
+            If the book assigns dense order IDs, which would replace the
+            journaled IDs that later events refer to.
+        """
+        if order_book.id_allocator is not None:
+            raise ValueError("Journal replay requires a book without dense_ids.")
+        records = self.records
+        start_time = time.perf_counter()
+        for kind, start, stop in self._runs():
+            run = records[start:stop]
+            order_ids = run["order_id"].tolist()
+            if kind == ADD:
+                orders = []
+                for order_id, price, volume, bid, market, trader_id, lifetime in zip(
+                    order_ids,
+                    run["price"].tolist(),
+                    run["volume"].tolist(),
+                    run["is_bid"].tolist(),
+                    run["is_market"].tolist(),
+                    run["trader_id"].tolist(),
+                    run["lifetime"].tolist(),
+                ):
+                    trader_id = trader_id if trader_id >= 0 else None
+                    if market:
+                        order = MarketOrder(volume, bid, trader_id)
+                    else:
+                        order = Order(
+                            price,
+                            volume,
+                            bid,
+                            False,
+                            trader_id,
+                            lifetime if lifetime >= 0 else None,
+                        )
+                    order.id = order_id
+                    orders.append(order)
+                order_book.process_orders(orders)
+            elif kind == CANCEL or kind == EXPIRE:
+                order_book.process_cancellations(order_ids)
+            elif kind == AMEND:
+                for order_id, price, volume in zip(
+                    order_ids, run["price"].tolist(), run["volume"].tolist()
+                ):
+                    order_book.amend(
+                        order_id,
+                        new_price=None if price != price else price,
+                        new_volume=None if volume < 0 else volume,
+                    )
+            elif kind == EMPTY:
+                order_book.process_orders([])
+            elif kind == CLEAR:
+                order_book.clear()
+        seconds = time.perf_counter() - start_time
+        events = len(records)
+        return {
+            "events": events,
+            "seconds": seconds,
+            "events_per_second": events / seconds if seconds > 0 else float("inf"),
+        }
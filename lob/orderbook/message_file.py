@@ -0,0 +1,486 @@
+"""
+Exchange-feed style order message files and their replay.
+
+This module defines a compact fixed-width binary message format modelled on
+ITCH order messages (add, cancel, delete, execute, replace), the
+MessageWriter and MessageReader that write and stream such files, the
+reader's replay of a file through an OrderBook with throughput and latency
+statistics, and generate_messages, which writes synthetic files shaped like
+a live feed.
+"""
+
+import heapq as hq
+import math
+import os
+import random
+import time
+from collections import deque
+
+import numpy as np
+
+from ..core import MarketOrder, Order
+
+MESSAGE_MAGIC = b"LOBMSGS1"
+# Magic followed by the record size, padded to 16 bytes.
+_HEADER_SIZE = 16
+
+# Message kinds
+ADD = 0  # new resting order
+CANCEL = 1  # partial cancel of ``shares``
+DELETE = 2  # full cancel
+EXECUTE = 3  # ``shares`` of a resting order traded
+REPLACE = 4  # cancel ``order_ref`` and add ``new_ref`` on the same side
+
+# One fixed-width (48 byte) record per message. ``order_ref`` is the order's
+# ID in the book. ``price`` and ``is_bid`` are the resting order's for every
+# kind (the new price for a replace); ``new_ref`` is only used by replaces
+# and is -1 otherwise. ``timestamp`` is in nanoseconds.
+MESSAGE_DTYPE = np.dtype(
+    [
+        ("timestamp", "<i8"),
+        ("order_ref", "<i8"),
+        ("new_ref", "<i8"),
+        ("price", "<f8"),
+        ("shares", "<i8"),
+        ("kind", "u1"),
+        ("is_bid", "?"),
+        ("_pad", "V6"),
+    ]
+)
+
+_FIELDS = ("kind", "is_bid", "order_ref", "new_ref", "price", "shares", "timestamp")
+
+
+def _header():
+    return MESSAGE_MAGIC + MESSAGE_DTYPE.itemsize.to_bytes(8, "little")
+
+
+class MessageWriter:
+    """
+    Writer of fixed-width order message files.
+
+    Messages are staged as tuples and written in blocks of packed rows.
+
+    Attributes
+    ----------
+    path : str
+        Path of the message file.
+
+    Methods
+    -------
+    write(kind, order_ref, is_bid, price, shares, timestamp=0, new_ref=-1)
+        Stage one message.
+    flush()
+        Write staged messages to the file.
+    close()
+        Flush and close the file.
+    """
+
+    def __init__(self, path, block_size=65536):
+        """
+        Create (or truncate) a message file.
+
+        Parameters
+        ----------
+        path : str
+            Path of the message file.
+        block_size : int, optional
+            Number of messages staged before a write (default is 65536).
+        """
+        self.path = path
+        self.block_size = block_size
+        self._pending = []
+        self._count = 0
+        self._file = open(path, "wb")
+        self._file.write(_header())
+
+    def write(self, kind, order_ref, is_bid, price, shares, timestamp=0, new_ref=-1):
+        """
+        Stage one message.
+
+        Parameters
+        ----------
+        kind : int
+            Message kind (ADD, CANCEL, DELETE, EXECUTE or REPLACE).
+        order_ref : int
+            ID of the order the message applies to.
+        is_bid : bool
+            Side of the order.
+        price : float
+            Price of the resting order (the new price for a replace).
+        shares : int
+            Volume added, cancelled, executed or of the replacement.
+        timestamp : int, optional
+            Time of the message in nanoseconds (default is 0).
+        new_ref : int, optional
+            ID of the replacement order (default is -1, not a replace).
+        """
+        self._pending.append(
+            (timestamp, order_ref, new_ref, price, shares, kind, is_bid, b"")
+        )
+        if len(self._pending) >= self.block_size:
+            self.flush()
+
+    def flush(self):
+        """
+        Write staged messages to the file.
+        """
+        if self._pending:
+            self._file.write(np.array(self._pending, dtype=MESSAGE_DTYPE).tobytes())
+            self._count += len(self._pending)
+            self._pending.clear()
+        self._file.flush()
+
+    def close(self):
+        """
+        Flush staged messages and close the file.
+        """
+        if not self._file.closed:
+            self.flush()
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return self._count + len(self._pending)
+
+
+class MessageReader:
+    """
+    Memory-mapped, streaming reader of order message files.
+
+    Iterating yields one ``(kind, is_bid, order_ref, new_ref, price, shares,
+    timestamp)`` tuple per message, converted from the mapped file a chunk
+    at a time, so files larger than memory can be streamed.
+
+    Attributes
+    ----------
+    messages : numpy.memmap
+        Structured array of MESSAGE_DTYPE over the file.
+    chunk_size : int
+        Number of messages converted at a time.
+
+    Methods
+    -------
+    chunks()
+        Iterate over the file as structured array slices.
+    replay(order_book, record_latency=True)
+        Drive an order book with every message and time it.
+    """
+
+    def __init__(self, path, chunk_size=65536):
+        """
+        Map a message file.
+
+        Parameters
+        ----------
+        path : str
+            Path of the message file.
+        chunk_size : int, optional
+            Number of messages converted at a time (default is 65536).
+
+        Raises
+        ------
+        ValueError
+            If the file is not a message file.
+        """
+        with open(path, "rb") as f:
+            if f.read(_HEADER_SIZE) != _header():
+                raise ValueError(f"{path} is not an order message file.")
+        if os.path.getsize(path) > _HEADER_SIZE:
+            self.messages = np.memmap(
+                path, dtype=MESSAGE_DTYPE, mode="r", offset=_HEADER_SIZE
+            )
+        else:
+            self.messages = np.zeros(0, dtype=MESSAGE_DTYPE)
+        self.chunk_size = chunk_size
+
+    def __len__(self):
+        return len(self.messages)
+
+    def chunks(self):
+        """
+        Iterate over the file as structured array slices.
+
+        Yields
+        ------
+        numpy.ndarray
+            Up to ``chunk_size`` consecutive messages.
+        """
+        messages = self.messages
+        for start in range(0, len(messages), self.chunk_size):
+            yield messages[start:start + self.chunk_size]
+
+    def __iter__(self):
+        for chunk in self.chunks():
+            yield from zip(*(chunk[field].tolist() for field in _FIELDS))
+
+    def replay(self, order_book, record_latency=True):
+        """
+        Drive an order book with every message in the file.
+
+        Adds and replacements rest under their message reference as order
+        ID. An execution of the order first in line at the touch is replayed
+        as an opposite-side market order for the executed shares, so it goes
+        through the matching path and trades against that order only; an
+        execution of any other resting order reduces it in place, like a
+        cancel. Cancels reduce the order in place, or remove it when they
+        cover its remaining volume. Messages for orders no longer in the book
+        are counted as missed.
+
+        Parameters
+        ----------
+        order_book : OrderBook
+            Book to drive. It should start empty and have a tick size
+            compatible with the file's prices.
+        record_latency : bool, optional
+            Time each message individually (default is True).
+
+        Returns
+        -------
+        dict
+            ``messages`` replayed, ``missed``, ``seconds`` taken,
+            ``messages_per_second`` and, if latency was recorded,
+            ``latency_ns`` with the ``p50``, ``p90``, ``p99``, ``p99.9`` and
+            ``max`` per-message latency in nanoseconds.
+
+        Raises
+        ------
+        ValueError
+            If the book assigns dense order IDs, which would replace the
+            message references that later messages refer to.
+        """
+        if order_book.id_allocator is not None:
+            raise ValueError("Message replay requires a book without dense_ids.")
+        bids = order_book.bids
+        asks = order_book.asks
+        process_orders = order_book.process_orders
+        process_cancellations = order_book.process_cancellations
+        amend = order_book.amend
+        clock = time.perf_counter_ns
+        latencies = np.empty(len(self.messages) if record_latency else 0, dtype=np.int64)
+        i = 0
+        missed = 0
+
+        start_time = time.perf_counter()
+        for kind, is_bid, order_ref, new_ref, price, shares, _ in self:
+            if record_latency:
+                started = clock()
+            if kind == ADD:
+                order = Order(price, shares, is_bid)
+                order.id = order_ref
+                process_orders([order])
+            elif kind == DELETE:
+                if (bids if is_bid else asks).get_order(order_ref) is None:
+                    missed += 1
+                else:
+                    process_cancellations([order_ref])
+            elif kind == EXECUTE or kind == CANCEL:
+                side = bids if is_bid else asks
+                resting = side.get_order(order_ref)
+                if resting is None:
+                    missed += 1
+                elif kind == EXECUTE and side.front_order_id() == order_ref:
+                    # Capped at the order's volume, so it never reaches the
+                    # orders queued behind it.
+                    process_orders([MarketOrder(min(shares, resting.volume), not is_bid)])
+                elif shares < resting.volume:
+                    amend(order_ref, new_volume=resting.volume - shares)
+                else:
+                    process_cancellations([order_ref])
+            elif kind == REPLACE:
+                if (bids if is_bid else asks).get_order(order_ref) is None:
+                    missed += 1
+                process_cancellations([order_ref])
+                order = Order(price, shares, is_bid)
+                order.id = new_ref
+                process_orders([order])
+            if record_latency:
+                latencies[i] = clock() - started
+                i += 1
+        seconds = time.perf_counter() - start_time
+
+        messages = len(self.messages)
+        stats = {
+            "messages": messages,
+            "missed": missed,
+            "seconds": seconds,
+            "messages_per_second": messages / seconds if seconds > 0 else float("inf"),
+        }
+        if record_latency and messages:
+            p50, p90, p99, p999 = np.percentile(latencies, [50, 90, 99, 99.9]).tolist()
+            stats["latency_ns"] = {
+                "p50": p50,
+                "p90": p90,
+                "p99": p99,
+                "p99.9": p999,
+                "max": int(latencies.max()),
+            }
+        return stats
+
+
+def generate_messages(
+    path,
+    n_messages,
+    seed=42,
+    tick_size=0.01,
+    start_price=100.0,
+    target_orders=5000,
+):
+    """
+    Write a synthetic message file shaped like a live equities feed.
+
+    The generator keeps its own price-time model of the book, so every
+    message is valid when replayed in order: executions hit the front of
+    the queue at the touch, and adds and replacements never cross.
+
+    - Most activity is cancels and replacements (about ten per execution),
+      with adds keeping the book near ``target_orders`` resting
+      orders.
+    - Prices cluster at and just behind the touch (a geometric number of
+      ticks away), occasionally improving it inside the spread.
+    - Arrivals alternate between quiet periods and short bursts of closely
+      spaced messages, in which executions are more frequent.
+
+    Parameters
+    ----------
+    path : str
+        Path of the file to write.
+    n_messages : int
+        Number of messages to write.
+    seed : int, optional
+        Random seed (default is 42).
+    tick_size : float, optional
+        Price increment; every price is a whole number of ticks (default is
+        0.01).
+    start_price : float, optional
+        Initial mid price (default is 100.0).
+    target_orders : int, optional
+        Typical number of resting orders (default is 5000).
+
+    Returns
+    -------
+    int
+        Number of messages written.
+    """
+    rng = random.Random(seed)
+    mid = round(start_price / tick_size)
+
+    orders = {}  # ref -> [is_bid, tick, shares]
+    live = []  # refs, for uniform sampling
+    position = {}  # ref -> index in live
+    levels = ({}, {})  # per side (ask, bid): tick -> deque of refs
+    heaps = ([], [])  # per side: best-first ticks, lazily pruned
+    next_ref = 0
+
+    def best(is_bid):
+        heap = heaps[is_bid]
+        side = levels[is_bid]
+        while heap:
+            tick = -heap[0] if is_bid else heap[0]
+            if tick in side:
+                return tick
+            hq.heappop(heap)
+        return None
+
+    def rest(ref, is_bid, tick, shares):
+        orders[ref] = [is_bid, tick, shares]
+        position[ref] = len(live)
+        live.append(ref)
+        queue = levels[is_bid].get(tick)
+        if queue is None:
+            queue = levels[is_bid][tick] = deque()
+            hq.heappush(heaps[is_bid], -tick if is_bid else tick)
+        queue.append(ref)
+
+    def remove(ref):
+        is_bid, tick, _ = orders.pop(ref)
+        index = position.pop(ref)
+        last = live.pop()
+        if last != ref:
+            live[index] = last
+            position[last] = index
+        queue = levels[is_bid][tick]
+        queue.remove(ref)
+        if not queue:
+            del levels[is_bid][tick]
+
+    def place(is_bid):
+        # A tick near the touch that does not cross the other side.
+        bid, ask = best(True), best(False)
+        if bid is None and ask is None:
+            bid, ask = mid - 1, mid + 1
+        elif bid is None:
+            bid = ask - 2
+        elif ask is None:
+            ask = bid + 2
+        if ask - bid > 1 and rng.random() < 0.15:
+            return bid + 1 if is_bid else ask - 1
+        depth = min(int(math.log(1.0 - rng.random()) / math.log(0.6)), 50)
+        return bid - depth if is_bid else ask + depth
+
+    def lot():
+        return 100 * rng.choice((1, 1, 1, 2, 2, 3, 5, 10))
+
+    timestamp = 0
+    burst = 0
+    written = 0
+    with MessageWriter(path) as writer:
+        while written < n_messages:
+            if burst:
+                burst -= 1
+                timestamp += 1 + int(rng.expovariate(1 / 500))
+            else:
+                if rng.random() < 0.01:
+                    burst = rng.randint(20, 400)
+                timestamp += 1 + int(rng.expovariate(1 / 50_000))
+
+            fill = len(live) / target_orders
+            p_execute = 0.12 if burst else 0.04
+            if not live or rng.random() < 0.375 - 0.25 * (fill - 1):
+                is_bid = rng.random() < 0.5
+                tick = place(is_bid)
+                shares = lot()
+                rest(next_ref, is_bid, tick, shares)
+                writer.write(ADD, next_ref, is_bid, tick * tick_size, shares, timestamp)
+                next_ref += 1
+            elif rng.random() < p_execute:
+                is_bid = rng.random() < 0.5
+                tick = best(is_bid)
+                if tick is None:
+                    is_bid = not is_bid
+                    tick = best(is_bid)
+                ref = levels[is_bid][tick][0]
+                resting = orders[ref]
+                shares = resting[2] if rng.random() < 0.6 else rng.randint(1, resting[2])
+                if shares == resting[2]:
+                    remove(ref)
+                else:
+                    resting[2] -= shares
+                writer.write(EXECUTE, ref, is_bid, tick * tick_size, shares, timestamp)
+            else:
+                ref = live[rng.randrange(len(live))]
+                is_bid, tick, remaining = orders[ref]
+                v = rng.random()
+                if v < 0.6:
+                    remove(ref)
+                    writer.write(DELETE, ref, is_bid, tick * tick_size, remaining, timestamp)
+                elif v < 0.75 and remaining > 100:
+                    shares = 100 * rng.randint(1, (remaining - 1) // 100)
+                    orders[ref][2] -= shares
+                    writer.write(CANCEL, ref, is_bid, tick * tick_size, shares, timestamp)
+                else:
+                    remove(ref)
+                    tick = place(is_bid)
+                    shares = lot()
+                    rest(next_ref, is_bid, tick, shares)
+                    writer.write(
+                        REPLACE, ref, is_bid, tick * tick_size, shares, timestamp, next_ref
+                    )
+                    next_ref += 1
+            written += 1
+    return written
@@ -5,11 +5,25 @@ This module defines the OrderBook class that manages bid and ask sides,
 processes incoming orders, handles cancellations, and tracks order lifetimes.
 """
 
+import io
+import math
 from itertools import chain
 
-from ..core import TradesNotification
+import numpy as np
+
+from ..core import Order, TradeBuffer, TradesNotification
+from .delta_feed import DeltaFeed
+from .depth_index import DepthIndex
 from .expiration_wheel import ExpirationWheel
+from .id_allocator import IdAllocator
+from .journal import ADD, AMEND, CANCEL, CLEAR, EMPTY, EXPIRE, Journal
 from .price_book import PriceBook
+from .order_store import OrderStore
+from .price_ladder import PriceLadder
+from .store_price_book import StorePriceBook
+
+# Layout version written by OrderBook.snapshot.
+SNAPSHOT_VERSION = 1
 
 
 class OrderBook:
@@ -19,13 +33,23 @@ class OrderBook:
     Attributes
     ----------
     bids : PriceBook
-        Price book for the bid (buy) side.
+        Price book for the bid (buy) side (a PriceLadder in ladder mode).
     asks : PriceBook
-        Price book for the ask (sell) side.
+        Price book for the ask (sell) side (a PriceLadder in ladder mode).
     expiration_wheel : ExpirationWheel, optional
         Manages order expiration based on lifetime.
     trade_history : list of list
         History of [volume_traded, total_exchanged] for each batch.
+    tick_size : float or None
+        Price increment of one tick. If set, limit prices are quantized to
+        integer ticks on entry and converted back to floats only at the API
+        boundary.
+    order_store : OrderStore or None
+        Column store holding resting orders for both sides, if enabled.
+    journal : Journal or None
+        Journal that inbound events are appended to, if journaling.
+    id_allocator : IdAllocator or None
+        Issues this book's order IDs on acceptance, if dense IDs are enabled.
 
     Methods
     -------
@@ -41,21 +65,70 @@ class OrderBook:
         Get best ask price.
     process_orders(orders)
         Process incoming orders and return trade notifications.
+    process_orders_buffered(orders, trade_buffer)
+        Process incoming orders, appending fills to a columnar TradeBuffer.
+    process_order_batch(prices, volumes, is_bid, ...)
+        Process orders given as arrays and return columnar trades.
     unfilled_orders(trader_id)
         Get all unfilled orders for a specific trader.
     process_cancellations(order_ids)
         Cancel orders by ID.
+    subscribe(trader_id)
+        Receive trade notifications for a trader.
+    unsubscribe(trader_id)
+        Stop receiving trade notifications for a trader.
+    subscribe_all()
+        Receive trade notifications for every trader.
+    unsubscribe_all()
+        Stop receiving trade notifications for any trader.
+    subscribe_feed(capacity)
+        Start publishing book changes to a DeltaFeed.
+    open_journal(path)
+        Start appending inbound events to a binary journal.
+    close_journal()
+        Stop journaling and close the journal file.
+    unsubscribe_feed()
+        Stop publishing book changes.
+    cancel_trader_orders(trader_id)
+        Cancel all unfilled orders for a specific trader.
+    amend(order_id, new_price=None, new_volume=None)
+        Change the price and/or volume of a resting order.
+    requote(trader_id, quotes)
+        Move a trader's resting orders to a desired set of quotes.
     get_bid_depth()
         Get total volume on bid side.
     get_ask_depth()
         Get total volume on ask side.
+    fillable_volume(is_bid, price)
+        Get the volume an incoming limit order could fill immediately.
+    sweep_price(is_bid, volume)
+        Get the worst price an incoming order of a given volume would reach.
+    sweep_vwap(is_bid, volume)
+        Get the average price an incoming order of a given volume would pay.
+    l2_snapshot(n_levels)
+        Get price, volume and order count of the best levels on each side.
+    level_counts()
+        Get live and dead price level counts on each side.
+    snapshot(file=None)
+        Serialize the full book state to a columnar binary form.
+    restore(file)
+        Load book state written by snapshot.
     clear()
         Resets order book.
     display()
         Print readable view of both sides of the book.
     """
 
-    def __init__(self, use_scheduler=False, expiration_wheel=None):
+    def __init__(
+        self,
+        use_scheduler=False,
+        expiration_wheel=None,
+        tick_size=None,
+        ladder_width=None,
+        order_store=False,
+        dense_ids=False,
+        depth_index=False,
+    ):
         """
         Initialize an order book with expiration parameters.
 
@@ -66,19 +139,98 @@ class OrderBook:
         expiration_wheel : ExpirationWheel, optional
             The expiration wheel object used to implement scheduling.
             If None and use_scheduler is True initialises ExpirationWheel(3, 100) (default None).
+        tick_size : float, optional
+            Price increment of one tick. If given, each limit order's price is
+            quantized to an integer tick count when it enters the book (bids
+            rounded down, asks rounded up) and all internal structures are keyed
+            by int. Prices are reported as floats (default is None, raw prices).
+        ladder_width : int, optional
+            If given, both sides use a dense PriceLadder covering this many
+            ticks instead of the heap-based PriceBook. Requires tick_size
+            (default is None).
+        order_store : bool, optional
+            If True, resting orders are copied into a shared struct-of-arrays
+            OrderStore and both sides use StorePriceBook, so the book holds
+            integer slots rather than Order objects. Requires tick_size and
+            cannot be combined with ladder_width (default is False).
+        dense_ids : bool, optional
+            If True, the book assigns each accepted order a dense integer ID
+            from its own IdAllocator, overwriting ``order.id``, and reuses
+            the IDs of orders that have left the book. Orders must then be
+            referred to by the ID they carry after processing. A recycled
+            ID can alias a stale handle to an order that has since left the
+            book, so cancels and amends must not outlive their order. Not
+            supported by message or journal replay, which refer to orders by
+            their recorded IDs (default is False, IDs come from the global
+            ``Order`` counter).
+        depth_index : bool, optional
+            If True, each side keeps a DepthIndex of volume by tick, making
+            ``fillable_volume``, ``sweep_price``, ``sweep_vwap`` O(log W) and
+            depth O(1). The window spans ladder_width ticks (4096 without a
+            ladder) from the touch; queries reaching past it bisect the
+            ticks beyond. Requires tick_size (default is False).
+
+        Raises
+        ------
+        ValueError
+            If ladder_width, order_store or depth_index is given without a
+            tick_size, or ladder_width and order_store are both given.
         """
-        self.bids = PriceBook(is_bid_side=True)
-        self.asks = PriceBook(is_bid_side=False)
+        if depth_index and tick_size is None:
+            raise ValueError("depth_index requires a tick_size.")
+        self.tick_size = tick_size
+        self.order_store = None
+        if order_store:
+            if tick_size is None:
+                raise ValueError("order_store requires a tick_size.")
+            if ladder_width is not None:
+                raise ValueError("order_store cannot be combined with ladder_width.")
+            self.order_store = OrderStore()
+            self.bids = StorePriceBook(True, tick_size, self.order_store)
+            self.asks = StorePriceBook(False, tick_size, self.order_store)
+        elif ladder_width is not None:
+            if tick_size is None:
+                raise ValueError("ladder_width requires a tick_size.")
+            self.bids = PriceLadder(True, tick_size, width=ladder_width)
+            self.asks = PriceLadder(False, tick_size, width=ladder_width)
+        else:
+            self.bids = PriceBook(is_bid_side=True, tick_size=tick_size)
+            self.asks = PriceBook(is_bid_side=False, tick_size=tick_size)
 
         # An optional scheduler for order lifetimes and scheduled cancellations.
         self.use_scheduler = use_scheduler
         self.expiration_wheel = (
             expiration_wheel or ExpirationWheel(3, 100) if use_scheduler else None
         )
+        # Orders leaving either side drop their expiry entry, so advance
+        # only sees orders that are still resting.
+        self.bids.expiration_wheel = self.expiration_wheel
+        self.asks.expiration_wheel = self.expiration_wheel
+
+        # Optional per-book order IDs; both sides release IDs as orders leave.
+        self.id_allocator = IdAllocator() if dense_ids else None
+        self.bids.id_allocator = self.id_allocator
+        self.asks.id_allocator = self.id_allocator
+
+        # Optional cumulative depth by tick, maintained by each side.
+        if depth_index:
+            for side in (self.bids, self.asks):
+                side.depth_index = DepthIndex(side.is_bid_side, width=ladder_width or 4096)
 
         # History of volume traded and total money exchanged.
         self.trade_history = []
 
+        # Traders whose fills produce notifications. By default every trader
+        # is notified.
+        self._notify_all = True
+        self._subscribers = set()
+
+        # Binary journal of inbound events, if journaling.
+        self.journal = None
+
+        # Reused fill buffer for process_order_batch.
+        self._batch_buffer = TradeBuffer()
+
     @property
     def spread(self):
         """
@@ -89,10 +241,14 @@ class OrderBook:
         float or None
             Spread between best ask and best bid, or None if either is missing.
         """
-        if self.get_best_bid() is None or self.get_best_ask() is None:
+        best_bid = self.bids.get_best_price()
+        best_ask = self.asks.get_best_price()
+        if best_bid is None or best_ask is None:
             return None
+        elif self.tick_size is not None:
+            return self.bids.to_price(best_ask - best_bid)
         else:
-            return round(self.get_best_ask() - self.get_best_bid(), 2)
+            return round(best_ask - best_bid, 2)
 
     @property
     def mid_price(self):
@@ -104,10 +260,18 @@ class OrderBook:
         float or None
             Average of best bid and ask, or None if either is missing.
         """
-        if self.get_best_bid() is None or self.get_best_ask() is None:
+        best_bid = self.bids.get_best_price()
+        best_ask = self.asks.get_best_price()
+        if best_bid is None or best_ask is None:
             return None
+        elif self.tick_size is not None:
+            # Integer arithmetic in ticks; the mid may sit on a half tick.
+            return round(
+                (best_ask + best_bid) * self.tick_size / 2,
+                self.bids._price_decimals + 1,
+            )
         else:
-            return round((self.get_best_ask() + self.get_best_bid()) / 2, 2)
+            return round((best_ask + best_bid) / 2, 2)
 
     def advance(self):
         """
@@ -118,7 +282,7 @@ class OrderBook:
                 "Scheduler is disabled. Initialise the orderbook with use_scheduler=True"
             )
         expirations = self.expiration_wheel.advance()
-        self.process_cancellations(expirations)
+        self._cancel_ids(expirations, EXPIRE)
 
     def get_best_bid(self):
         """
@@ -129,7 +293,7 @@ class OrderBook:
         float or None
             Highest bid price, or None if no bids.
         """
-        return self.bids.get_best_price()
+        return self.bids.to_price(self.bids.get_best_price())
 
     def get_best_ask(self):
         """
@@ -140,7 +304,7 @@ class OrderBook:
         float or None
             Lowest ask price, or None if no asks.
         """
-        return self.asks.get_best_price()
+        return self.asks.to_price(self.asks.get_best_price())
 
     def process_orders(self, orders):
         """
@@ -154,71 +318,393 @@ class OrderBook:
         Returns
         -------
         dict
-            Dictionary mapping trader_id to list of TradesNotification objects.
+            Dictionary mapping trader_id to list of TradesNotification objects,
+            for subscribed traders only (see ``subscribe``).
+        """
+        notifier = self._new_notifier()
+        self._match_orders(orders, notifier=notifier)
+        self.trade_history.append([notifier.volume_traded, notifier.total_exchanged])
+        return notifier.finish()
+
+    def subscribe_feed(self, capacity=65536):
+        """
+        Start publishing order and level changes on both sides to a feed.
+
+        Parameters
+        ----------
+        capacity : int, optional
+            Ring buffer size of the new feed (default is 65536).
+
+        Returns
+        -------
+        DeltaFeed
+            The feed, to be drained by the consumer.
+        """
+        feed = DeltaFeed(capacity)
+        self.bids.feed = feed
+        self.asks.feed = feed
+        return feed
+
+    def unsubscribe_feed(self):
+        """
+        Stop publishing book changes.
+        """
+        self.bids.feed = None
+        self.asks.feed = None
+
+    def open_journal(self, path):
+        """
+        Start appending every inbound event and its outcome to a journal.
+
+        Adds, cancellations, expiries, amends and clears are written as
+        fixed-width records; see JournalReader for replay.
+
+        Parameters
+        ----------
+        path : str
+            Journal file, created or appended to.
+
+        Returns
+        -------
+        Journal
+            The open journal.
+        """
+        self.close_journal()
+        self.journal = Journal(path)
+        return self.journal
+
+    def close_journal(self):
+        """
+        Stop journaling, flushing and closing the journal file.
+        """
+        if self.journal is not None:
+            self.journal.close()
+            self.journal = None
+
+    def _new_notifier(self):
+        """
+        Create the notifier for one batch, honouring subscriptions.
+        """
+        return _BatchNotifier(
+            self.bids.to_price, None if self._notify_all else self._subscribers
+        )
+
+    def process_orders_buffered(self, orders, trade_buffer):
+        """
+        Process incoming orders, appending fills to a columnar trade buffer.
+
+        Matching is identical to ``process_orders``, but no Trade objects or
+        notifications are created: each fill is written as one row of
+        ``trade_buffer`` for downstream aggregation to read directly. The
+        buffer is not cleared first, so several batches can accumulate.
+
+        Parameters
+        ----------
+        orders : iterable of Order
+            Orders to process.
+        trade_buffer : TradeBuffer
+            Buffer receiving the fills. Prices are in the book's internal
+            units (ticks if the book has a tick_size).
+
+        Returns
+        -------
+        int
+            Number of fills appended to ``trade_buffer``.
+        """
+        start = len(trade_buffer)
+        self._match_orders(orders, trade_buffer)
+        self._record_buffered_trades(trade_buffer, start)
+        return len(trade_buffer) - start
+
+    def _record_buffered_trades(self, trade_buffer, start):
+        """
+        Append a trade history entry for the buffer rows from ``start`` on.
+
+        Parameters
+        ----------
+        trade_buffer : TradeBuffer
+            Buffer holding the batch's fills.
+        start : int
+            Index of the batch's first row.
+
+        Returns
+        -------
+        numpy.ndarray of float
+            The batch's fill prices converted to floats.
+        """
+        prices = trade_buffer.price[start:]
+        volumes = trade_buffer.volume[start:]
+        if self.tick_size is not None:
+            to_price = self.bids.to_price
+            prices = np.array([to_price(int(tick)) for tick in prices], dtype=float)
+        if len(volumes):
+            # cumsum adds in execution order, matching process_orders exactly.
+            self.trade_history.append(
+                [int(volumes.sum()), float(np.cumsum(prices * volumes)[-1])]
+            )
+        else:
+            self.trade_history.append([0, 0])
+        return prices
+
+    def _match_orders(self, orders, trade_buffer=None, notifier=None, entries=None):
+        """
+        Match incoming orders in sequence and rest any limit remainder.
+
+        Parameters
+        ----------
+        orders : iterable of Order
+            Orders to process.
+        trade_buffer : TradeBuffer, optional
+            If given, fills are appended to this buffer instead of being
+            returned (default is None).
+        notifier : _BatchNotifier, optional
+            If given, fills are recorded by this notifier as they happen
+            instead of being returned (default is None).
+        entries : list, optional
+            If given, ``orders`` may yield one reused scratch object: a
+            remainder rests as a fresh copy in object-backed books and is
+            never retained, and each order's ``(id, volume)`` after entry is
+            appended here (default is None). Requires a trade_buffer.
+
+        Returns
+        -------
+        list of Trade
+            Trades executed, in execution order (empty when writing to a
+            trade_buffer or notifier).
         """
         trades = []
+        tick_size = self.tick_size
+        journal = self.journal
+        if journal is not None:
+            journal.next_batch()
+        allocator = self.id_allocator
+        if allocator is not None:
+            allocator.recycle()
+        order = None
         for order in orders:
+            if allocator is not None:
+                order.id = allocator.allocate()
+            price = order.price
+            if tick_size is not None and not order.is_market:
+                # Quantize on entry; the order carries its tick from here on.
+                side = self.bids if order.is_bid else self.asks
+                order.price = side.to_tick(order.price)
+
+            volume = order.volume
             if order.is_bid:
-                trades.extend(self.asks.fill(order))
+                fills = self.asks.fill(order, trade_buffer, notifier)
             else:
-                trades.extend(self.bids.fill(order))
+                fills = self.bids.fill(order, trade_buffer, notifier)
+            trades.extend(fills)
 
             # Only add remaining volume to book if it is a limit order
             if order.volume and not order.is_market:
                 if self.use_scheduler:
                     self.expiration_wheel.schedule(order)
+                # An order that already traded is referenced by this batch's
+                # trades, so a store-backed book keeps it as the order's view.
+                traded = order.volume != volume
+                if entries is not None:
+                    # Scratch orders are only referenced by buffered fills.
+                    traded = False
+                    if self.order_store is None:
+                        order = _copy_order(order)
                 if order.is_bid:
-                    self.bids.add(order)
+                    self.bids.add(order, retain=traded)
                 else:
-                    self.asks.add(order)
+                    self.asks.add(order, retain=traded)
+            elif allocator is not None:
+                allocator.release(order.id)
 
-        return self._process_trades(trades)
+            if journal is not None:
+                journal.record(
+                    ADD,
+                    order.id,
+                    price,
+                    volume,
+                    order.is_bid,
+                    order.is_market,
+                    order.trader_id,
+                    order.lifetime,
+                    volume - order.volume,
+                    0 if order.is_market else order.volume,
+                )
+            if entries is not None:
+                entries.append((order.id, order.volume))
+        if order is None and journal is not None:
+            # An empty batch still adds a trade history entry on replay.
+            journal.record(EMPTY, -1)
 
-    def _process_trades(self, trades):
+        return trades
+
+    def process_order_batch(
+        self,
+        prices,
+        volumes,
+        is_bid,
+        is_market=None,
+        trader_ids=None,
+        lifetimes=None,
+    ):
         """
-        Aggregate trades into notifications and update history.
+        Process orders given as parallel arrays and return columnar trades.
+
+        Equivalent to calling ``process_orders`` on the same orders in row
+        order: the book, expiry schedule and trade history end up identical.
+        Order IDs are assigned internally.
 
         Parameters
         ----------
-        trades : list of Trade
-            List of executed trades to process.
+        prices : array_like of float
+            Limit prices (ignored for market orders).
+        volumes : array_like of int
+            Order volumes.
+        is_bid : array_like of bool
+            True for buy orders, False for sell orders.
+        is_market : array_like of bool, optional
+            True for market orders (default is all limit orders).
+        trader_ids : array_like of int, optional
+            Trader of each order; negative entries mean no trader (default
+            is no trader for every order).
+        lifetimes : array_like of int, optional
+            Lifetime of each order; negative entries use the scheduler's
+            default lifetime (default is the default lifetime for every
+            order).
 
         Returns
         -------
-        dict
-            Dictionary mapping trader_id to list of TradesNotification objects.
+        dict of numpy.ndarray
+            ``order_id`` and ``remaining_volume`` with one entry per input
+            row, and trade columns ``bid_order_id``, ``ask_order_id``,
+            ``price`` and ``volume`` with one entry per trade in execution
+            order.
+
+        Raises
+        ------
+        ValueError
+            If the input arrays differ in length.
+        """
+        volumes = np.asarray(volumes, dtype=np.int64)
+        n = len(volumes)
+        columns = [
+            np.asarray(prices, dtype=float),
+            np.asarray(is_bid, dtype=bool),
+            np.zeros(n, dtype=bool) if is_market is None
+            else np.asarray(is_market, dtype=bool),
+            np.full(n, -1, dtype=np.int64) if trader_ids is None
+            else np.asarray(trader_ids, dtype=np.int64),
+            np.full(n, -1, dtype=np.int64) if lifetimes is None
+            else np.asarray(lifetimes, dtype=np.int64),
+        ]
+        if any(len(column) != n for column in columns):
+            raise ValueError("All order batch arrays must have the same length.")
+
+        # Rows are entered through one scratch order; only a remainder resting
+        # in an object-backed book is copied into its own Order. IDs are
+        # reserved up front, as writing the class counter per row would
+        # invalidate Order's attribute caches.
+        scratch = Order.__new__(Order)
+        scratch._prev = scratch._next = None
+        first_id = Order._id_counter
+        Order._id_counter += n
+
+        def rows():
+            for order_id, volume, price, bid, market, trader_id, lifetime in zip(
+                range(first_id, first_id + n),
+                volumes.tolist(),
+                *(column.tolist() for column in columns),
+            ):
+                scratch.price = (math.inf if bid else -math.inf) if market else price
+                scratch.volume = volume
+                scratch.is_bid = bid
+                scratch.is_market = market
+                scratch.trader_id = trader_id if trader_id >= 0 else None
+                scratch.lifetime = lifetime if lifetime >= 0 and not market else None
+                scratch.id = order_id
+                yield scratch
+
+        entries = []
+        trade_buffer = self._batch_buffer
+        trade_buffer.clear()
+        self._match_orders(rows(), trade_buffer, entries=entries)
+        prices = self._record_buffered_trades(trade_buffer, 0)
+        order_ids = np.fromiter((order_id for order_id, _ in entries), np.int64, n)
+        remaining_volume = np.fromiter((volume for _, volume in entries), np.int64, n)
+
+        # Rows that rested and were later hit by another row of the batch.
+        makers = np.concatenate([trade_buffer.bid_order_id, trade_buffer.ask_order_id])
+        hit = np.flatnonzero(
+            (remaining_volume > 0) & ~columns[2] & np.isin(order_ids, makers)
+        )
+        store_volume = None if self.order_store is None else self.order_store.volume
+        for i, order_id, bid in zip(
+            hit.tolist(), order_ids[hit].tolist(), columns[1][hit].tolist()
+        ):
+            entry = (self.bids if bid else self.asks).order_map.get(order_id)
+            if entry is None:
+                remaining_volume[i] = 0
+            elif store_volume is None:
+                remaining_volume[i] = entry.volume
+            else:
+                remaining_volume[i] = store_volume[entry]
+
+        return {
+            "order_id": order_ids,
+            "remaining_volume": remaining_volume,
+            "bid_order_id": trade_buffer.bid_order_id.copy(),
+            "ask_order_id": trade_buffer.ask_order_id.copy(),
+            "price": np.array(prices, dtype=float),
+            "volume": trade_buffer.volume.copy(),
+        }
+
+    def subscribe(self, trader_id):
+        """
+        Build trade notifications for a trader's fills.
+
+        Parameters
+        ----------
+        trader_id : int
+            Identifier of the trader.
+        """
+        self._subscribers.add(trader_id)
+
+    def unsubscribe(self, trader_id):
         """
-        volume_traded = 0
-        total_exchanged = 0
-        order_notifs = {}  # {order_id: TradesNotification}
-        trader_notifs = {}  # {trader_id: [TradesNotification, ...]}
+        Stop building trade notifications for a trader's fills.
 
-        for trade in trades:
-            volume_traded += trade.volume
-            total_exchanged += trade.price * trade.volume
+        Has no effect while subscribed to every trader; use
+        ``unsubscribe_all`` first to restrict notifications.
 
-            for order, trader_id in [
-                (trade.bid_order, trade.bid_order.trader_id),
-                (trade.ask_order, trade.ask_order.trader_id),
-            ]:
-                if trader_id is not None:
-                    # Update or create notification
-                    if order.id not in order_notifs:
-                        notif = TradesNotification(order)
-                        order_notifs[order.id] = notif
-                        trader_notifs.setdefault(trader_id, []).append(notif)
+        Parameters
+        ----------
+        trader_id : int
+            Identifier of the trader.
+        """
+        self._subscribers.discard(trader_id)
 
-                    order_notifs[order.id].add_trade(trade)
-                    # Updates trader_notifs too because stored notif is referenced
+    def subscribe_all(self):
+        """
+        Build trade notifications for every trader (the default).
+        """
+        self._notify_all = True
 
-        self.trade_history.append([volume_traded, total_exchanged])
+    def unsubscribe_all(self):
+        """
+        Stop building trade notifications for any trader.
 
-        return trader_notifs  # Return trader-keyed version
+        Fills still update ``trade_history``. Traders can then be
+        subscribed individually with ``subscribe``.
+        """
+        self._notify_all = False
+        self._subscribers.clear()
 
     def unfilled_orders(self, trader_id):
         """
         Get all unfilled orders for a specific trader.
 
+        Served from the per-trader index, so the cost is proportional to the
+        number of orders the trader has resting rather than the book size.
+
         Parameters
         ----------
         trader_id : int
@@ -229,15 +715,35 @@ class OrderBook:
         list of tuple
             List of (order_id, price, volume) tuples for unfilled orders.
         """
-        unfilled_asks = self.asks.order_map.values()
-        unfilled_bids = self.bids.order_map.values()
+        unfilled_asks = self.asks.unfilled_orders(trader_id)
+        unfilled_bids = self.bids.unfilled_orders(trader_id)
+        to_price = self.bids.to_price
         unfilled_orders = [
-            (order.id, order.price, order.volume)
-            for order in chain(unfilled_asks, unfilled_bids)
-            if order.trader_id == trader_id
+            (order_id, to_price(price), volume)
+            for order_id, price, volume in chain(unfilled_asks, unfilled_bids)
         ]
         return unfilled_orders
 
+    def cancel_trader_orders(self, trader_id):
+        """
+        Cancel all unfilled orders for a specific trader.
+
+        Parameters
+        ----------
+        trader_id : int
+            Identifier of the trader.
+
+        Returns
+        -------
+        list of int
+            IDs of the cancelled orders.
+        """
+        if self.journal is not None:
+            order_ids = [order_id for order_id, _, _ in self.unfilled_orders(trader_id)]
+            self._cancel_ids(order_ids, CANCEL)
+            return order_ids
+        return self.asks.cancel_trader(trader_id) + self.bids.cancel_trader(trader_id)
+
     def process_cancellations(self, order_ids):
         """
         Cancel orders by ID from either side of the book.
@@ -247,16 +753,227 @@ class OrderBook:
         order_ids : list of int
             List of order IDs to cancel.
         """
+        self._cancel_ids(order_ids, CANCEL)
+
+    def _cancel_ids(self, order_ids, kind):
+        """
+        Cancel orders by ID, journaling them as cancellations or expiries.
+
+        Parameters
+        ----------
+        order_ids : iterable of int
+            IDs of the orders to cancel.
+        kind : int
+            Journal record kind, CANCEL or EXPIRE.
+        """
+        journal = self.journal
+        if journal is None:
+            for order_id in order_ids:
+                if not self.bids.cancel_id(order_id):
+                    # order not on books might have been filled.
+                    self.asks.cancel_id(order_id)
+            return
+
+        journal.next_batch()
         for order_id in order_ids:
-            if order_id in self.bids.order_map:
-                order = self.bids.order_map[order_id]
-                self.bids.cancel(order)
-            elif order_id in self.asks.order_map:
-                order = self.asks.order_map[order_id]
-                self.asks.cancel(order)
-            else:
-                # order not on books might have been filled.
-                pass
+            self._journaled_cancel(order_id, kind)
+
+    def _journaled_cancel(self, order_id, kind=CANCEL):
+        """
+        Cancel one order by ID and journal the volume removed.
+        """
+        for side in (self.bids, self.asks):
+            order = side.get_order(order_id)
+            if order is not None:
+                volume = order.volume
+                side.cancel_id(order_id)
+                self.journal.record(kind, order_id, is_bid=side.is_bid_side, resting=volume)
+                return
+        self.journal.record(kind, order_id)
+
+    def amend(self, order_id, new_price=None, new_volume=None):
+        """
+        Change the price and/or volume of a resting order.
+
+        A size reduction at the same price is applied in place in O(1) and
+        keeps the order's queue position. Any other change is an atomic
+        cancel and re-entry under the same order ID: the order loses its
+        priority, may trade if the new price crosses, and keeps its original
+        expiry.
+
+        Parameters
+        ----------
+        order_id : int
+            ID of a resting order.
+        new_price : float, optional
+            New limit price (default is None, keep the price).
+        new_volume : int, optional
+            New volume (default is None, keep the volume).
+
+        Returns
+        -------
+        dict
+            Trade notifications from re-entering the order, as returned by
+            ``process_orders``; empty for an in-place reduction.
+
+        Raises
+        ------
+        ValueError
+            If the order is not resting in the book or new_volume is not
+            positive.
+        """
+        side = self.bids
+        order = side.get_order(order_id)
+        if order is None:
+            side = self.asks
+            order = side.get_order(order_id)
+            if order is None:
+                raise ValueError(f"Order {order_id} not found in OrderBook.")
+
+        price = order.price
+        if new_price is not None:
+            price = side.to_tick(new_price) if self.tick_size is not None else new_price
+        volume = order.volume if new_volume is None else new_volume
+        if volume <= 0:
+            raise ValueError(f"Amended volume must be positive, got {volume}")
+
+        if self.journal is not None:
+            self.journal.next_batch()
+
+        if price == order.price and volume <= order.volume:
+            if volume < order.volume:
+                side.reduce_volume(order_id, volume)
+            notifications = {}
+        else:
+            # Cancelling drops the expiry entry; the re-entered order keeps it.
+            expiration = (
+                self.expiration_wheel.detach(order_id) if self.use_scheduler else None
+            )
+            side.cancel_id(order_id)
+            order.price = price
+            order.volume = volume
+            if self.id_allocator is not None:
+                # Re-entry keeps the ID the cancel just released.
+                self.id_allocator.claim(order_id)
+            notifications = self._reenter(order)
+            if expiration is not None and order.volume:
+                self.expiration_wheel.attach(order_id, expiration)
+            if self.id_allocator is not None and not order.volume:
+                self.id_allocator.release(order_id)
+
+        if self.journal is not None:
+            self.journal.record(
+                AMEND,
+                order_id,
+                np.nan if new_price is None else new_price,
+                -1 if new_volume is None else new_volume,
+                order.is_bid,
+                filled=volume - order.volume,
+                resting=order.volume,
+            )
+        return notifications
+
+    def _reenter(self, order):
+        """
+        Match a quantized, already scheduled order and rest any remainder.
+
+        Parameters
+        ----------
+        order : Order
+            Limit order carrying its internal (tick) price.
+
+        Returns
+        -------
+        dict
+            Dictionary mapping trader_id to list of TradesNotification objects.
+        """
+        notifier = self._new_notifier()
+        volume = order.volume
+        if order.is_bid:
+            self.asks.fill(order, None, notifier)
+        else:
+            self.bids.fill(order, None, notifier)
+        if order.volume:
+            side = self.bids if order.is_bid else self.asks
+            side.add(order, retain=order.volume != volume)
+        self.trade_history.append([notifier.volume_traded, notifier.total_exchanged])
+        return notifier.finish()
+
+    def requote(self, trader_id, quotes):
+        """
+        Move a trader's resting orders to a desired set of quotes.
+
+        Desired and live volume are compared per side and price, and only
+        the difference is sent to the book: live orders at prices no longer
+        quoted are cancelled, excess volume is trimmed from the newest live
+        orders at a price (in place, so the oldest keep their priority), and
+        missing volume is submitted as one new order per price. Quotes that
+        match the live orders cost nothing.
+
+        Parameters
+        ----------
+        trader_id : int
+            Identifier of the trader.
+        quotes : list of Order
+            Desired limit orders. They are only read: missing volume at a
+            price is submitted as a new order with the trader_id and the
+            lifetime of the first quote at that price.
+
+        Returns
+        -------
+        dict
+            Trade notifications for the submitted orders, as returned by
+            ``process_orders``.
+        """
+        new_orders = []
+        for side, is_bid in ((self.bids, True), (self.asks, False)):
+            # {price: [first quote, total desired volume]} in internal units.
+            desired = {}
+            for quote in quotes:
+                if quote.is_bid != is_bid:
+                    continue
+                price = (
+                    side.to_tick(quote.price) if self.tick_size is not None
+                    else quote.price
+                )
+                entry = desired.get(price)
+                if entry is None:
+                    desired[price] = [quote, quote.volume]
+                else:
+                    entry[1] += quote.volume
+
+            # Live orders come in arrival order, so the oldest are kept.
+            for order_id, price, volume in side.unfilled_orders(trader_id):
+                entry = desired.get(price)
+                wanted = 0 if entry is None else entry[1]
+                if wanted == 0:
+                    if self.journal is None:
+                        side.cancel_id(order_id)
+                    else:
+                        self.journal.next_batch()
+                        self._journaled_cancel(order_id)
+                elif wanted < volume:
+                    if self.journal is None:
+                        side.reduce_volume(order_id, wanted)
+                    else:
+                        self.amend(order_id, new_volume=wanted)
+                    entry[1] = 0
+                else:
+                    entry[1] = wanted - volume
+
+            for quote, missing in desired.values():
+                if missing > 0:
+                    new_orders.append(
+                        Order(
+                            quote.price,
+                            missing,
+                            is_bid,
+                            trader_id=trader_id,
+                            lifetime=quote.lifetime,
+                        )
+                    )
+
+        return self.process_orders(new_orders)
 
     def get_bid_depth(self):
         """
@@ -280,13 +997,265 @@ class OrderBook:
         """
         return self.asks.get_depth()
 
+    def fillable_volume(self, is_bid, price):
+        """
+        Get the volume an incoming limit order could fill immediately.
+
+        The price is quantized as the order's would be on entry. O(log W)
+        for a depth window of W ticks.
+
+        Parameters
+        ----------
+        is_bid : bool
+            True for an incoming buy, False for an incoming sell.
+        price : float
+            Limit price of the incoming order.
+
+        Returns
+        -------
+        int
+            Opposite-side volume at ``price`` or better.
+
+        Raises
+        ------
+        ValueError
+            If the book has no depth index.
+        """
+        if is_bid:
+            return self.asks.volume_through(self.bids.to_tick(price))
+        return self.bids.volume_through(self.asks.to_tick(price))
+
+    def sweep_price(self, is_bid, volume):
+        """
+        Get the worst price an incoming order of ``volume`` would trade at.
+
+        Parameters
+        ----------
+        is_bid : bool
+            True for an incoming buy, False for an incoming sell.
+        volume : int
+            Positive volume to fill.
+
+        Returns
+        -------
+        float or None
+            Last price level reached, or None if the opposite side holds
+            less than ``volume``.
+
+        Raises
+        ------
+        ValueError
+            If the book has no depth index or volume is not positive.
+        """
+        side = self.asks if is_bid else self.bids
+        return side.to_price(side.sweep_price(volume))
+
+    def sweep_vwap(self, is_bid, volume):
+        """
+        Get the volume-weighted average price to fill ``volume`` immediately.
+
+        Parameters
+        ----------
+        is_bid : bool
+            True for an incoming buy, False for an incoming sell.
+        volume : int
+            Positive volume to fill.
+
+        Returns
+        -------
+        float or None
+            Average fill price, or None if the opposite side holds less than
+            ``volume``.
+
+        Raises
+        ------
+        ValueError
+            If the book has no depth index or volume is not positive.
+        """
+        side = self.asks if is_bid else self.bids
+        vwap = side.sweep_vwap(volume)
+        return None if vwap is None else vwap * self.tick_size
+
+    def l2_snapshot(self, n_levels=10):
+        """
+        Get aggregated depth for the best levels on each side of the book.
+
+        Served from each side's level structure (heap or bitmap) without
+        sorting the whole book.
+
+        Parameters
+        ----------
+        n_levels : int, optional
+            Maximum number of levels per side (default is 10).
+
+        Returns
+        -------
+        dict
+            ``{"bids": {...}, "asks": {...}}``, each holding ``price``
+            (float), ``volume`` and ``order_count`` (int64) arrays with one
+            entry per level, best level first.
+        """
+        to_price = self.bids.to_price
+        snapshot = {}
+        for name, side in (("bids", self.bids), ("asks", self.asks)):
+            levels = side.top_levels(n_levels)
+            snapshot[name] = {
+                "price": np.array(
+                    [to_price(level.price) for level in levels], dtype=float
+                ),
+                "volume": np.array([level.volume for level in levels], dtype=np.int64),
+                "order_count": np.array(
+                    [level.num_orders for level in levels], dtype=np.int64
+                ),
+            }
+        return snapshot
+
+    def level_counts(self):
+        """
+        Get live and dead price level counts on each side of the book.
+
+        Returns
+        -------
+        dict
+            ``{"bids": (live, dead), "asks": (live, dead)}``.
+        """
+        return {"bids": self.bids.level_counts(), "asks": self.asks.level_counts()}
+
+    def snapshot(self, file=None):
+        """
+        Serialize the full book state to a columnar binary form.
+
+        Each side's resting orders are written as NumPy columns in price-time
+        priority order, together with the trader index order, the trade
+        history, the expiration wheel and the order ID counter, as an
+        uncompressed ``.npz`` archive.
+
+        Parameters
+        ----------
+        file : str or file-like, optional
+            Destination. If None (the default) the snapshot is returned as
+            bytes.
+
+        Returns
+        -------
+        bytes or None
+            The snapshot, if no file was given.
+        """
+        arrays = {
+            "version": np.array([SNAPSHOT_VERSION], dtype=np.int64),
+            "id_counter": np.array([Order._id_counter], dtype=np.int64),
+            "tick_size": np.array(
+                [np.nan if self.tick_size is None else self.tick_size]
+            ),
+            "history_volume": np.array(
+                [volume for volume, _ in self.trade_history], dtype=np.int64
+            ),
+            "history_exchanged": np.array(
+                [exchanged for _, exchanged in self.trade_history], dtype=float
+            ),
+        }
+        for name, side in (("bids", self.bids), ("asks", self.asks)):
+            for key, column in side.export_orders().items():
+                arrays[f"{name}_{key}"] = column
+        if self.use_scheduler:
+            for key, column in self.expiration_wheel.state().items():
+                arrays[f"wheel_{key}"] = column
+        if self.id_allocator is not None:
+            for key, column in self.id_allocator.state().items():
+                arrays[f"ids_{key}"] = column
+
+        if file is None:
+            buffer = io.BytesIO()
+            np.savez(buffer, **arrays)
+            return buffer.getvalue()
+        np.savez(file, **arrays)
+
+    def restore(self, file):
+        """
+        Replace the book state with a snapshot, without matching.
+
+        The book must be configured like the one that took the snapshot
+        (same tick size; a scheduler if the snapshot has one). The order ID
+        counter is moved up to its value at snapshot time if it is behind,
+        and never back, since it is shared by every book in the process. A
+        subscribed feed receives each side's clear followed by the restored
+        orders and levels.
+
+        Parameters
+        ----------
+        file : bytes, str or file-like
+            Snapshot as returned by ``snapshot`` or the file it was written to.
+
+        Raises
+        ------
+        ValueError
+            If the snapshot does not fit this book's configuration.
+        """
+        if isinstance(file, (bytes, bytearray)):
+            file = io.BytesIO(file)
+        with np.load(file) as data:
+            if int(data["version"][0]) != SNAPSHOT_VERSION:
+                raise ValueError(
+                    f"Unsupported snapshot version {int(data['version'][0])}"
+                )
+            tick_size = float(data["tick_size"][0])
+            if (self.tick_size is None) != np.isnan(tick_size) or (
+                self.tick_size is not None and tick_size != self.tick_size
+            ):
+                raise ValueError(
+                    f"Snapshot tick size {tick_size} does not match {self.tick_size}"
+                )
+            has_wheel = "wheel_now" in data.files
+            if has_wheel and not self.use_scheduler:
+                raise ValueError("Snapshot has an expiration wheel; enable use_scheduler.")
+
+            for name, side in (("bids", self.bids), ("asks", self.asks)):
+                prefix = name + "_"
+                side.load_orders(
+                    {
+                        key[len(prefix):]: data[key]
+                        for key in data.files
+                        if key.startswith(prefix)
+                    }
+                )
+            if self.use_scheduler:
+                if has_wheel:
+                    self.expiration_wheel.load_state(
+                        {key[6:]: data[key] for key in data.files if key.startswith("wheel_")}
+                    )
+                else:
+                    self.expiration_wheel.reset()
+            if self.id_allocator is not None:
+                if "ids_next_id" in data.files:
+                    self.id_allocator.load_state(
+                        {key[4:]: data[key] for key in data.files if key.startswith("ids_")}
+                    )
+                else:
+                    # IDs from a book without an allocator: reserve the
+                    # resting ones.
+                    self.id_allocator.rebuild(
+                        np.concatenate([data["bids_order_id"], data["asks_order_id"]])
+                    )
+            self.trade_history = [
+                [volume, exchanged]
+                for volume, exchanged in zip(
+                    data["history_volume"].tolist(), data["history_exchanged"].tolist()
+                )
+            ]
+            Order._id_counter = max(Order._id_counter, int(data["id_counter"][0]))
+
     def clear(self):
         """
         Resets order book.
         """
+        if self.journal is not None:
+            self.journal.next_batch()
+            self.journal.record(CLEAR, -1)
         self.trade_history.clear()
         if self.use_scheduler:
             self.expiration_wheel.reset()
+        if self.id_allocator is not None:
+            self.id_allocator.reset()
         self.bids.clear()
         self.asks.clear()
 
@@ -301,3 +1270,116 @@ class OrderBook:
         """
         self.bids.display()
         self.asks.display()
+
+
+def _copy_order(order):
+    """
+    Copy a scratch order's fields into a new unlinked Order, keeping its ID.
+    """
+    copy = Order.__new__(Order)
+    copy.price = order.price
+    copy.volume = order.volume
+    copy.is_bid = order.is_bid
+    copy.id = order.id
+    copy.is_market = order.is_market
+    copy.trader_id = order.trader_id
+    copy.lifetime = order.lifetime
+    copy._prev = copy._next = None
+    return copy
+
+
+class _BatchNotifier:
+    """
+    Accumulates one batch's fills as they happen.
+
+    Keeps the batch's trade history totals and builds a TradesNotification
+    per subscribed order on its first fill. Each fill is converted to a
+    float price once and added to the totals in execution order, so the
+    results match folding a list of trades after matching.
+
+    Attributes
+    ----------
+    volume_traded : int
+        Total volume filled in the batch.
+    total_exchanged : float
+        Total notional exchanged in the batch.
+    """
+
+    __slots__ = (
+        "to_price",
+        "subscribers",
+        "notify",
+        "volume_traded",
+        "total_exchanged",
+        "order_notifs",
+        "trader_notifs",
+    )
+
+    def __init__(self, to_price, subscribers):
+        """
+        Initialize an empty batch.
+
+        Parameters
+        ----------
+        to_price : callable
+            Converts a book price (tick) to a float price.
+        subscribers : set or None
+            Traders to build notifications for, or None for every trader.
+        """
+        self.to_price = to_price
+        self.subscribers = subscribers
+        self.notify = subscribers is None or bool(subscribers)
+        self.volume_traded = 0
+        self.total_exchanged = 0
+        self.order_notifs = {}  # {order_id: (TradesNotification, Order)}
+        self.trader_notifs = {}  # {trader_id: [TradesNotification, ...]}
+
+    def add(self, bid_order, ask_order, price, volume):
+        """
+        Record one fill.
+
+        Parameters
+        ----------
+        bid_order : Order
+            The buy order.
+        ask_order : Order
+            The sell order.
+        price : float or int
+            Execution price in book units.
+        volume : int
+            Quantity filled.
+        """
+        price = self.to_price(price)
+        self.volume_traded += volume
+        self.total_exchanged += price * volume
+        if not self.notify:
+            return
+
+        subscribers = self.subscribers
+        for order in (bid_order, ask_order):
+            trader_id = order.trader_id
+            if trader_id is not None and (
+                subscribers is None or trader_id in subscribers
+            ):
+                entry = self.order_notifs.get(order.id)
+                if entry is None:
+                    notif = TradesNotification(order)
+                    self.order_notifs[order.id] = (notif, order)
+                    self.trader_notifs.setdefault(trader_id, []).append(notif)
+                else:
+                    notif = entry[0]
+                notif.add_fill(price, volume)
+
+    def finish(self):
+        """
+        Stamp each notification with its order's end-of-batch volume.
+
+        Returns
+        -------
+        dict
+            Dictionary mapping trader_id to list of TradesNotification objects.
+        """
+        for notif, order in self.order_notifs.values():
+            notif.remaining_volume = order.volume
+            notif.is_filled = order.volume == 0
+        return self.trader_notifs
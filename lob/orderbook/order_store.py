@@ -0,0 +1,343 @@
+"""
+Struct-of-arrays storage for resting orders.
+
+This module defines the OrderStore class, which keeps the fields of live
+orders in NumPy columns addressed by integer slot, and the SlotLevel class,
+a price level whose FIFO queue is threaded through the store's link columns.
+"""
+
+import numpy as np
+
+# Sentinel for missing integer fields (trader_id / lifetime of None) and for
+# missing queue links.
+NO_VALUE = np.iinfo(np.int64).min
+NO_SLOT = -1
+
+
+class OrderStore:
+    """
+    Column store for resting orders with free-list slot recycling.
+
+    Each live order occupies one slot. Its fields are held in parallel NumPy
+    columns, and slots released by fills and cancels are pushed onto a free
+    list and handed out again before the store grows. Capacity doubles when
+    the free list runs dry.
+
+    Attributes
+    ----------
+    capacity : int
+        Number of slots currently allocated.
+    order_id, price, volume, trader_id, lifetime : numpy.ndarray of int64
+        Order fields. ``price`` is in ticks; a ``trader_id`` or ``lifetime``
+        of None is stored as ``NO_VALUE``.
+    is_bid, live : numpy.ndarray of bool
+        Order side, and whether the slot currently holds an order.
+    prev, next : numpy.ndarray of int64
+        FIFO queue links to neighbouring slots at the same price level, or
+        ``NO_SLOT``.
+
+    Methods
+    -------
+    alloc(order)
+        Copy an order's fields into a free slot.
+    alloc_many(n)
+        Take several free slots at once.
+    free(slot)
+        Release a slot for reuse.
+    depth(is_bid)
+        Total resting volume on one side.
+    snapshot(is_bid)
+        Columns of all live orders on one side.
+    clear(is_bid=None)
+        Release every slot, or every slot on one side.
+    """
+
+    _INT_COLUMNS = (
+        "order_id", "price", "volume", "trader_id", "lifetime", "prev", "next",
+    )
+    _BOOL_COLUMNS = ("is_bid", "live")
+
+    def __init__(self, capacity=1024):
+        """
+        Initialize an empty order store.
+
+        Parameters
+        ----------
+        capacity : int, optional
+            Initial number of slots (default is 1024).
+        """
+        self.capacity = 0
+        for name in self._INT_COLUMNS:
+            setattr(self, name, np.empty(0, dtype=np.int64))
+        for name in self._BOOL_COLUMNS:
+            setattr(self, name, np.zeros(0, dtype=bool))
+        self._free = []
+        self._grow(max(1, capacity))
+
+    def __len__(self):
+        return self.capacity - len(self._free)
+
+    def _grow(self, capacity):
+        """
+        Enlarge every column to ``capacity`` slots and free the new ones.
+        """
+        old = self.capacity
+        for name in self._INT_COLUMNS:
+            column = np.empty(capacity, dtype=np.int64)
+            column[:old] = getattr(self, name)
+            setattr(self, name, column)
+        for name in self._BOOL_COLUMNS:
+            column = np.zeros(capacity, dtype=bool)
+            column[:old] = getattr(self, name)
+            setattr(self, name, column)
+        # Pop order hands out the lowest new slot first.
+        self._free.extend(range(capacity - 1, old - 1, -1))
+        self.capacity = capacity
+
+    def alloc(self, order):
+        """
+        Copy an order's fields into a free slot.
+
+        Parameters
+        ----------
+        order : Order
+            Order with an integer tick price.
+
+        Returns
+        -------
+        int
+            The slot now holding the order.
+        """
+        if not self._free:
+            self._grow(2 * self.capacity)
+        slot = self._free.pop()
+        self.order_id[slot] = order.id
+        self.price[slot] = order.price
+        self.volume[slot] = order.volume
+        self.is_bid[slot] = order.is_bid
+        self.trader_id[slot] = (
+            NO_VALUE if order.trader_id is None else order.trader_id
+        )
+        self.lifetime[slot] = NO_VALUE if order.lifetime is None else order.lifetime
+        self.prev[slot] = NO_SLOT
+        self.next[slot] = NO_SLOT
+        self.live[slot] = True
+        return slot
+
+    def alloc_many(self, n):
+        """
+        Take ``n`` free slots at once, growing the store if needed.
+
+        The caller writes every field of the returned slots.
+
+        Parameters
+        ----------
+        n : int
+            Number of slots.
+
+        Returns
+        -------
+        numpy.ndarray of int64
+            The slots, in the order ``alloc`` would have handed them out.
+        """
+        if len(self._free) < n:
+            capacity = 2 * self.capacity
+            while len(self._free) + capacity - self.capacity < n:
+                capacity *= 2
+            self._grow(capacity)
+        slots = self._free[len(self._free) - n:]
+        del self._free[len(self._free) - n:]
+        return np.array(slots[::-1], dtype=np.int64)
+
+    def free(self, slot):
+        """
+        Release a slot so a later order can reuse it.
+
+        Parameters
+        ----------
+        slot : int
+            Slot of an order that has left the book.
+        """
+        self.live[slot] = False
+        self._free.append(slot)
+
+    def get_trader_id(self, slot):
+        """
+        Get the trader_id stored at a slot, mapping the sentinel to None.
+        """
+        trader_id = int(self.trader_id[slot])
+        return None if trader_id == NO_VALUE else trader_id
+
+    def get_lifetime(self, slot):
+        """
+        Get the lifetime stored at a slot, mapping the sentinel to None.
+        """
+        lifetime = int(self.lifetime[slot])
+        return None if lifetime == NO_VALUE else lifetime
+
+    def depth(self, is_bid):
+        """
+        Total resting volume on one side, computed over the columns.
+
+        Parameters
+        ----------
+        is_bid : bool
+            Side to sum.
+
+        Returns
+        -------
+        int
+            Sum of remaining volume of live orders on that side.
+        """
+        mask = self.live & (self.is_bid == is_bid)
+        return int(self.volume[mask].sum())
+
+    def snapshot(self, is_bid):
+        """
+        Columns of all live orders on one side.
+
+        Parameters
+        ----------
+        is_bid : bool
+            Side to extract.
+
+        Returns
+        -------
+        dict of numpy.ndarray
+            ``order_id``, ``price`` (ticks), ``volume`` and ``trader_id``
+            arrays, ordered by slot rather than by queue position.
+        """
+        mask = self.live & (self.is_bid == is_bid)
+        return {
+            "order_id": self.order_id[mask],
+            "price": self.price[mask],
+            "volume": self.volume[mask],
+            "trader_id": self.trader_id[mask],
+        }
+
+    def clear(self, is_bid=None):
+        """
+        Release every slot, or every slot on one side, keeping the capacity.
+
+        Parameters
+        ----------
+        is_bid : bool, optional
+            If given, only release orders on that side (default is None,
+            release everything).
+        """
+        if is_bid is None:
+            self.live[:] = False
+            self._free = list(range(self.capacity - 1, -1, -1))
+            return
+        mask = self.live & (self.is_bid == is_bid)
+        self.live[mask] = False
+        self._free.extend(np.flatnonzero(mask)[::-1].tolist())
+
+
+class SlotLevel:
+    """
+    Price level whose FIFO queue is a linked list of OrderStore slots.
+
+    Mirrors the PriceLevel interface, but queue links live in the store's
+    ``prev`` / ``next`` columns and the level holds only the head and tail
+    slots.
+
+    Attributes
+    ----------
+    price : int
+        The tick of this level.
+    store : OrderStore
+        Store holding the queued orders.
+    head : int or None
+        Slot of the oldest order, or None if the level is empty.
+    tail : int or None
+        Slot of the newest order, or None if the level is empty.
+    num_orders : int
+        Number of orders queued at this level.
+    volume : int
+        Total remaining volume queued at this level.
+    """
+
+    def __init__(self, price, store):
+        """
+        Initialize an empty slot level.
+
+        Parameters
+        ----------
+        price : int
+            The tick of this level.
+        store : OrderStore
+            Store holding the queued orders.
+        """
+        self.price = price
+        self.store = store
+        self.head = None
+        self.tail = None
+        self.num_orders = 0
+        self.volume = 0
+
+    def add(self, slot):
+        """
+        Append a slot to the back of the queue.
+
+        Parameters
+        ----------
+        slot : int
+            Slot of an order already written to the store.
+        """
+        store = self.store
+        tail = self.tail
+        if tail is None:
+            self.head = slot
+            store.prev[slot] = NO_SLOT
+        else:
+            store.next[tail] = slot
+            store.prev[slot] = tail
+        store.next[slot] = NO_SLOT
+        self.tail = slot
+        self.num_orders += 1
+        self.volume += int(store.volume[slot])
+
+    def unlink(self, slot):
+        """
+        Remove a slot from the queue in O(1) without touching the volume.
+
+        Parameters
+        ----------
+        slot : int
+            Slot currently queued at this level.
+        """
+        store = self.store
+        prev = int(store.prev[slot])
+        next_ = int(store.next[slot])
+        if prev == NO_SLOT:
+            self.head = None if next_ == NO_SLOT else next_
+        else:
+            store.next[prev] = next_
+        if next_ == NO_SLOT:
+            self.tail = None if prev == NO_SLOT else prev
+        else:
+            store.prev[next_] = prev
+        self.num_orders -= 1
+
+    def is_empty(self):
+        return self.head is None
+
+    def __iter__(self):
+        slot = self.head
+        next_ = self.store.next
+        while slot is not None:
+            yield slot
+            slot = int(next_[slot])
+            if slot == NO_SLOT:
+                slot = None
+
+    def __len__(self):
+        return self.num_orders
+
+    def __repr__(self):
+        return f"SlotLevel(price={self.price}, slots={list(self)})"
+
+    def __str__(self):
+        return (f"PriceLevel: Price={self.price}, Volume={self.volume}, "
+                f"Orders={self.num_orders}")
@@ -6,8 +6,16 @@ one side of the order book (bid or ask) using a heap for efficient
 best price retrieval.
 """
 
+import gc
 import heapq as hq
+import math
+from decimal import Decimal
 
+import numpy as np
+
+from ..core import Order
+from .delta_feed import DeltaFeed
+from .order_store import NO_VALUE
 from .price_level import PriceLevel
 
 
@@ -17,13 +25,38 @@ class PriceBook:
 
     Uses a heap to efficiently track the best price and a dictionary
     to store price levels. Bid side uses max-heap via negative prices.
+    The best price and its level are cached; only adds, cancels and fills
+    that change the top of the book invalidate the cache.
+
+    When a tick size is given, order prices are integer tick counts and all
+    internal structures are keyed by int; ``to_tick`` and ``to_price``
+    convert at the API boundary.
 
     Attributes
     ----------
     order_map : dict
         Maps order IDs to order objects for fast lookup.
+    trader_orders : dict
+        Maps trader IDs to a dict of their live order IDs to order objects,
+        in arrival order.
     is_bid_side : bool
         True if this is the bid (buy) side, False for ask (sell) side.
+    tick_size : float or None
+        Price increment of one tick, or None if prices are raw floats.
+    compact_threshold : int
+        Minimum number of empty (dead) levels before the heap and level
+        dictionary are compacted.
+    feed : DeltaFeed or None
+        Feed that order and level changes are published to, if any.
+    expiration_wheel : ExpirationWheel or None
+        Wheel whose expiry entries are detached as orders leave this side,
+        if the book schedules expiries.
+    id_allocator : IdAllocator or None
+        Allocator that the IDs of orders leaving this side are released to,
+        if the book issues its own IDs.
+    depth_index : DepthIndex or None
+        Fenwick tree of volume by tick kept in step with every level, if
+        cumulative depth queries are enabled.
 
     Methods
     -------
@@ -31,19 +64,53 @@ class PriceBook:
         Add an order to the appropriate price level.
     cancel(order)
         Cancel and remove an order from the book.
+    cancel_id(order_id)
+        Cancel an order by ID if it rests on this side.
+    get_order(order_id)
+        Get the order object resting under an ID.
+    reduce_volume(order_id, volume)
+        Shrink a resting order in place, keeping its queue position.
+    cancel_trader(trader_id)
+        Cancel every live order belonging to a trader.
+    trader_order_list(trader_id)
+        Get the live orders belonging to a trader.
+    unfilled_orders(trader_id)
+        Get (order_id, price, volume) for a trader's live orders.
     get_best_price()
         Get the best available price on this side.
+    get_best_level()
+        Get the price level at the best price.
+    front_order_id()
+        Get the ID of the order first in line at the best price.
+    volume_through(tick)
+        Get the volume at ticks as good as or better than a tick.
+    sweep_price(volume)
+        Get the last tick a sweep of a given volume reaches.
+    sweep_vwap(volume)
+        Get the average tick paid by a sweep of a given volume.
+    top_levels(n)
+        Get the best n non-empty price levels.
+    to_tick(price)
+        Quantize a price to an integer tick on this side.
+    to_price(tick)
+        Convert an integer tick back to a price.
     fill(order)
         Fill an incoming order against this side of the book.
     volume()
         Get total volume across all price levels.
+    level_counts()
+        Get the number of live and dead price levels.
+    export_orders()
+        Get every resting order as columns in priority order.
+    load_orders(columns)
+        Replace the book's contents with exported columns.
     Clear()
         Clears the pricebook.
     display()
         Print a readable view of all price levels.
     """
 
-    def __init__(self, is_bid_side):
+    def __init__(self, is_bid_side, tick_size=None, compact_threshold=256):
         """
         Initialize a price book for one side of the market.
 
@@ -51,13 +118,90 @@ class PriceBook:
         ----------
         is_bid_side : bool
             True if this is the bid (buy) side, False for ask (sell) side.
+        tick_size : float, optional
+            Price increment of one tick. If given, orders must carry integer
+            tick prices (see ``to_tick``). Default is None (raw float prices).
+        compact_threshold : int, optional
+            Minimum number of dead levels before compaction is considered.
+            Compaction runs once dead levels also outnumber live ones, so its
+            O(levels) cost is amortised over the cancellations that caused it
+            (default is 256).
         """
         self.order_map = {}
+        self.trader_orders = {}
         self._price_levels = {}
         self._heap = []
+        # Number of empty levels still held in _price_levels and _heap.
+        self._num_dead = 0
+        # Cached top of book, valid while _top_valid is True.
+        self._best_price = None
+        self._best_level = None
+        self._top_valid = True
+        self.compact_threshold = compact_threshold
+        # Market-data feed; every publish is guarded by a None check.
+        self.feed = None
+        # Expiry schedule; orders leaving the book are detached from it.
+        self.expiration_wheel = None
+        # Per-book ID allocator; IDs of orders leaving the book are released.
+        self.id_allocator = None
+        # Cumulative depth by tick; updated wherever a level's volume changes.
+        self.depth_index = None
         self.is_bid_side = is_bid_side
+        self.tick_size = tick_size
+        # Decimal places of the tick size, used to strip float noise from
+        # converted prices.
+        self._price_decimals = (
+            max(0, -Decimal(str(tick_size)).normalize().as_tuple().exponent)
+            if tick_size is not None
+            else None
+        )
+
+    def to_tick(self, price):
+        """
+        Quantize a price to an integer number of ticks.
+
+        Prices that fall between ticks are rounded away from the touch (bids
+        down, asks up), so quantization never makes a limit more aggressive.
+
+        Parameters
+        ----------
+        price : float
+            Price to quantize.
+
+        Returns
+        -------
+        int or float
+            Tick count, or ``price`` unchanged if it is infinite or the book
+            has no tick size.
+        """
+        if self.tick_size is None or math.isinf(price):
+            return price
+        ticks = price / self.tick_size
+        # Tolerate float noise, e.g. 100.1 / 0.01 = 10009.999999999998
+        if self.is_bid_side:
+            return math.floor(ticks + 1e-9)
+        return math.ceil(ticks - 1e-9)
+
+    def to_price(self, tick):
+        """
+        Convert an integer tick count back to a price.
+
+        Parameters
+        ----------
+        tick : int or None
+            Tick count.
+
+        Returns
+        -------
+        float or None
+            The price, or ``tick`` unchanged if it is None or the book has
+            no tick size.
+        """
+        if self.tick_size is None or tick is None:
+            return tick
+        return round(tick * self.tick_size, self._price_decimals)
 
-    def add(self, order):
+    def add(self, order, retain=True):
         """
         Add an order to the appropriate price level.
 
@@ -65,20 +209,44 @@ class PriceBook:
         ----------
         order : Order
             The order to add to the book.
+        retain : bool, optional
+            Whether the book should keep referring to this order object.
+            Always the case for this backend; see StorePriceBook.
         """
         price = order.price
 
-        if price not in self._price_levels:
-            # Add price level to heap
-            self._price_levels[price] = PriceLevel(price)
-            # Use negative price for max-heap behavior on bid side.
-            heap_price = -price if self.is_bid_side else price
-            hq.heappush(self._heap, heap_price)
+        level = self._get_level(price)
+        if level is None:
+            level = self._new_level(price)
+            added = True
+        elif level.head is None:
+            self._level_revived(price, level)
+            added = True
+        else:
+            added = False
 
         # Add order to price level
-        self._price_levels[price].add(order)
-        # Add order to the order map
+        level.add(order)
+        if self.feed is not None:
+            self._publish_add(order.id, price, order.volume, level, added)
+        if self.depth_index is not None:
+            self.depth_index.set(level.price, level.volume)
+        # A new best price moves the cached top of book
+        if self._top_valid and level is not self._best_level:
+            best_price = self._best_price
+            if (
+                best_price is None
+                or (price > best_price if self.is_bid_side else price < best_price)
+            ):
+                self._best_price = price
+                self._best_level = level
+        # Add order to the order map and the trader index
         self.order_map[order.id] = order
+        trader_orders = self.trader_orders.get(order.trader_id)
+        if trader_orders is None:
+            self.trader_orders[order.trader_id] = {order.id: order}
+        else:
+            trader_orders[order.id] = order
 
     def cancel(self, order):
         """
@@ -95,45 +263,402 @@ class PriceBook:
             If the price or order is not found in the book.
         """
         price = order.price
-        if price not in self._price_levels:
+        level = self._get_level(price)
+        if level is None:
             raise ValueError(f"Price {price} not found in PriceBook.")
 
         try:
-            self._price_levels[price].cancel(order)
-            # Trying to remove the price level from the heap here would be
-            # O(N) so we delay clean up
+            level.cancel(order)
         except ValueError as e:
             # Propagate the original error
             raise ValueError(f"Failed to cancel order {order.id}: {e}") from e
+        if self.feed is not None:
+            self._publish_cancel(order.id, order.volume, level)
+        if self.depth_index is not None:
+            self.depth_index.set(level.price, level.volume)
+        if level.head is None:
+            if level is self._best_level:
+                self._top_valid = False
+            self._level_emptied(price, level)
 
-        # Remove from order map
+        # Remove from order map, trader index and expiry schedule
         del self.order_map[order.id]
+        self._unindex_trader(order)
+        if self.expiration_wheel is not None:
+            self.expiration_wheel.detach(order.id)
+        if self.id_allocator is not None:
+            self.id_allocator.release(order.id)
+
+    def cancel_id(self, order_id):
+        """
+        Cancel an order by ID if it rests on this side of the book.
+
+        Parameters
+        ----------
+        order_id : int
+            ID of the order to cancel.
+
+        Returns
+        -------
+        bool
+            True if the order was found and cancelled, False otherwise.
+        """
+        order = self.order_map.get(order_id)
+        if order is None:
+            return False
+        self.cancel(order)
+        return True
+
+    def get_order(self, order_id):
+        """
+        Get the order resting on this side under an ID.
+
+        Parameters
+        ----------
+        order_id : int
+            ID of the order.
+
+        Returns
+        -------
+        Order or None
+            The resting order, or None if it is not on this side.
+        """
+        return self.order_map.get(order_id)
+
+    def reduce_volume(self, order_id, volume):
+        """
+        Shrink a resting order in place in O(1), keeping its queue position.
+
+        Parameters
+        ----------
+        order_id : int
+            ID of an order resting on this side.
+        volume : int
+            New volume, positive and no larger than the current volume.
+
+        Raises
+        ------
+        ValueError
+            If the order is not on this side or the volume is out of range.
+        """
+        order = self.order_map.get(order_id)
+        if order is None:
+            raise ValueError(f"Order {order_id} not found in PriceBook.")
+        if not 0 < volume <= order.volume:
+            raise ValueError(
+                f"Reduced volume must be in (0, {order.volume}], got {volume}"
+            )
+        level = self._get_level(order.price)
+        level.volume -= order.volume - volume
+        if self.feed is not None:
+            self._publish_cancel(order_id, order.volume - volume, level)
+        if self.depth_index is not None:
+            self.depth_index.set(level.price, level.volume)
+        order.volume = volume
+
+    def _unindex_trader(self, order):
+        """
+        Remove an order from the trader index.
+
+        Parameters
+        ----------
+        order : Order
+            An order that has just left the book.
+        """
+        trader_orders = self.trader_orders[order.trader_id]
+        del trader_orders[order.id]
+        if not trader_orders:
+            del self.trader_orders[order.trader_id]
+
+    def trader_order_list(self, trader_id):
+        """
+        Get the live orders belonging to a trader in O(k).
+
+        Parameters
+        ----------
+        trader_id : int or None
+            Identifier of the trader.
+
+        Returns
+        -------
+        list of Order
+            The trader's resting orders on this side, in arrival order.
+        """
+        trader_orders = self.trader_orders.get(trader_id)
+        return list(trader_orders.values()) if trader_orders else []
+
+    def unfilled_orders(self, trader_id):
+        """
+        Get the live orders belonging to a trader as tuples.
+
+        Parameters
+        ----------
+        trader_id : int or None
+            Identifier of the trader.
+
+        Returns
+        -------
+        list of tuple
+            ``(order_id, price, volume)`` per order in arrival order, with
+            prices in this book's internal units (ticks in tick mode).
+        """
+        trader_orders = self.trader_orders.get(trader_id)
+        if not trader_orders:
+            return []
+        return [(order.id, order.price, order.volume) for order in trader_orders.values()]
+
+    def cancel_trader(self, trader_id):
+        """
+        Cancel every live order belonging to a trader in O(k).
+
+        Parameters
+        ----------
+        trader_id : int or None
+            Identifier of the trader.
+
+        Returns
+        -------
+        list of int
+            IDs of the cancelled orders.
+        """
+        orders = self.trader_order_list(trader_id)
+        for order in orders:
+            self.cancel(order)
+        return [order.id for order in orders]
+
+    def _get_level(self, price):
+        """
+        Look up the stored price level at a price.
+
+        Parameters
+        ----------
+        price : float or int
+            Price (or tick) of the level.
+
+        Returns
+        -------
+        PriceLevel or None
+            The stored level, which may be empty, or None if there is none.
+        """
+        return self._price_levels.get(price)
+
+    def _make_level(self, price):
+        """
+        Construct an empty level object for this book's queue representation.
+        """
+        return PriceLevel(price)
+
+    def _new_level(self, price):
+        """
+        Create and store a price level, making it visible to best-price search.
+
+        Parameters
+        ----------
+        price : float or int
+            Price (or tick) of the new level.
+
+        Returns
+        -------
+        PriceLevel
+            The new, empty level.
+        """
+        level = self._price_levels[price] = self._make_level(price)
+        # Use negative price for max-heap behavior on bid side.
+        heap_price = -price if self.is_bid_side else price
+        hq.heappush(self._heap, heap_price)
+        return level
+
+    def _level_emptied(self, price, level):
+        """
+        Hook called when the last order leaves a stored price level.
+
+        Removing a single price level from the heap would be O(N), so the
+        level is only counted as dead here. Dead levels at the top of the
+        heap are dropped by ``_find_best_price``; the rest are reclaimed in
+        bulk by ``_compact`` once they pass the threshold.
+        """
+        self._num_dead += 1
+        if (
+            self._num_dead > self.compact_threshold
+            and 2 * self._num_dead > len(self._price_levels)
+        ):
+            self._compact()
+
+    def _drop_level(self, price, level):
+        """
+        Hook called when a market order sweep has emptied the best level.
+
+        The best level sits at the top of the heap, so it is popped straight
+        away instead of being counted dead and found again by
+        ``_find_best_price``.
+        """
+        heap_price = -price if self.is_bid_side else price
+        if self._heap and self._heap[0] == heap_price:
+            hq.heappop(self._heap)
+            del self._price_levels[price]
+        else:
+            self._level_emptied(price, level)
+
+    def _level_revived(self, price, level):
+        """
+        Hook called when an order is added to a stored but empty price level.
+        """
+        self._num_dead -= 1
+
+    def _compact(self):
+        """
+        Drop every empty price level and rebuild the heap from the live ones.
+        """
+        self._price_levels = {
+            price: level
+            for price, level in self._price_levels.items()
+            if level.head is not None
+        }
+        if self.is_bid_side:
+            self._heap = [-price for price in self._price_levels]
+        else:
+            self._heap = list(self._price_levels)
+        hq.heapify(self._heap)
+        self._num_dead = 0
+
+    def level_counts(self):
+        """
+        Get the number of live and dead price levels.
+
+        Returns
+        -------
+        tuple of int
+            ``(live, dead)``: levels holding orders and empty levels not yet
+            reclaimed.
+        """
+        return len(self._price_levels) - self._num_dead, self._num_dead
+
+    def _prices_descending(self):
+        """
+        Get the prices of all stored levels, highest first.
+
+        Returns
+        -------
+        list
+            Prices (or ticks) of stored levels, including empty ones not yet
+            cleaned up.
+        """
+        if self.is_bid_side:
+            return [-heap_price for heap_price in sorted(self._heap)]
+        return sorted(self._heap, reverse=True)
 
     def get_best_price(self):
         """
         Get the best available price on this side of the book.
 
+        Served from the cached top of book; the backend search only runs
+        after the best level has been emptied.
+
+        Returns
+        -------
+        float or None
+            The best price, or None if the book is empty.
+        """
+        if not self._top_valid:
+            best_price = self._find_best_price()
+            self._best_price = best_price
+            self._best_level = (
+                self._get_level(best_price) if best_price is not None else None
+            )
+            self._top_valid = True
+        return self._best_price
+
+    def get_best_level(self):
+        """
+        Get the price level at the best price on this side of the book.
+
+        Returns
+        -------
+        PriceLevel or None
+            The best level, or None if the book is empty.
+        """
+        if not self._top_valid:
+            self.get_best_price()
+        return self._best_level
+
+    def front_order_id(self):
+        """
+        Get the ID of the order first in line at the best price.
+
+        Returns
+        -------
+        int or None
+            ID of the order the next incoming order would trade against
+            first, or None if this side is empty.
+        """
+        level = self.get_best_level()
+        return None if level is None else level.head.id
+
+    def top_levels(self, n):
+        """
+        Get the best ``n`` non-empty price levels, best first.
+
+        Walks the heap array as a tree, expanding a small frontier heap from
+        the root, so the cost is O(k log k) in the number of entries visited
+        rather than a sort of every level. Empty levels still held in the
+        heap are skipped.
+
+        Parameters
+        ----------
+        n : int
+            Maximum number of levels to return.
+
+        Returns
+        -------
+        list of PriceLevel
+            Up to ``n`` levels in price priority order.
+        """
+        levels = []
+        heap = self._heap
+        if n <= 0 or not heap:
+            return levels
+        price_levels = self._price_levels
+        is_bid_side = self.is_bid_side
+        size = len(heap)
+        frontier = [(heap[0], 0)]
+        while frontier and len(levels) < n:
+            heap_price, i = hq.heappop(frontier)
+            level = price_levels[-heap_price if is_bid_side else heap_price]
+            if level.head is not None:
+                levels.append(level)
+            child = 2 * i + 1
+            if child < size:
+                hq.heappush(frontier, (heap[child], child))
+                if child + 1 < size:
+                    hq.heappush(frontier, (heap[child + 1], child + 1))
+        return levels
+
+    def _find_best_price(self):
+        """
+        Search the heap for the best non-empty price level.
+
         Returns
         -------
         float or None
             The best price, or None if the book is empty.
-        
+
         Notes
         -----
         This method also performs internal cleanup by removing empty price levels
-        from the bid heap. As a result, it may modify internal state.
+        from the heap. As a result, it may modify internal state.
         """
         if not self._price_levels:
             return None
         else:
-            # Since I didn't remove empty price levels upon order cancellation
-            # I have to handle it here
+            # Empty levels are only reclaimed in bulk by _compact, so drop
+            # any that have surfaced at the top of the heap
             while self._heap:
                 best_price = -self._heap[0] if self.is_bid_side else self._heap[0]
                 # Remove empty price levels
                 if self._price_levels[best_price].is_empty():
                     hq.heappop(self._heap)
                     del self._price_levels[best_price]
+                    self._num_dead -= 1
                 else:
                     break
 
@@ -142,7 +667,7 @@ class PriceBook:
             else:
                 return None
 
-    def fill(self, order):
+    def fill(self, order, trade_buffer=None, notifier=None):
         """
         Fill an incoming order against this side of the book.
 
@@ -150,11 +675,19 @@ class PriceBook:
         ----------
         order : Order
             The incoming order to fill.
+        trade_buffer : TradeBuffer, optional
+            If given, fills are appended to this buffer instead of being
+            returned as Trade objects (default is None).
+        notifier : object, optional
+            If given (and no trade_buffer is), each fill is passed to
+            ``notifier.add(bid_order, ask_order, price, volume)`` instead of
+            being returned as a Trade object (default is None).
 
         Returns
         -------
         list of Trade
-            List of executed trades resulting from the fill.
+            List of executed trades resulting from the fill (empty when
+            writing to a trade_buffer or notifier).
 
         Raises
         ------
@@ -168,29 +701,34 @@ class PriceBook:
                 "Cannot fill an order on the same side of the PriceBook."
             )
 
+        if order.is_market:
+            return self._sweep(order, trade_buffer, notifier)
+
         price = order.price
         trades = []
         best_price = self.get_best_price()
 
-        while best_price and order.volume > 0:
+        while best_price is not None and order.volume > 0:
             # Check whether prices are compatible
             can_fill = (best_price >= price) if self.is_bid_side else (
                 best_price <= price
             )
 
             if can_fill:
-                trades_at_price, orders_filled = self._price_levels[
-                    best_price
-                ].fill(order)
+                level = self._best_level
+                if self.feed is not None:
+                    self._publish_executions(level, order.volume)
+                trades_at_price, orders_filled = level.fill(order, trade_buffer, notifier)
                 trades.extend(trades_at_price)
-                for o in orders_filled:
-                    try:
-                        del self.order_map[o.id]
-                    except KeyError as e:
-                        raise KeyError(
-                            f"Tried to delete order {e} from the order_map. "
-                            f"It is probably a duplicate order."
-                        )
+                self._remove_filled(orders_filled)
+                if self.feed is not None:
+                    self._publish_level(level)
+                if self.depth_index is not None:
+                    self.depth_index.set(level.price, level.volume)
+                if level.head is None:
+                    if level is self._best_level:
+                        self._top_valid = False
+                    self._level_emptied(best_price, level)
 
             else:
                 break
@@ -202,16 +740,437 @@ class PriceBook:
         # Return list of trades
         return trades
 
+    def _sweep(self, order, trade_buffer=None, notifier=None):
+        """
+        Fill a market order against this side, best level first.
+
+        A market order crosses every price, so no price check is made. Each
+        level the order can consume entirely is drained in one pass and
+        dropped at once; only the last, partially filled level goes through
+        ``PriceLevel.fill``.
+
+        Parameters
+        ----------
+        order : MarketOrder
+            The incoming market order.
+        trade_buffer : TradeBuffer, optional
+            See ``fill`` (default is None).
+        notifier : object, optional
+            See ``fill`` (default is None).
+
+        Returns
+        -------
+        list of Trade
+            List of executed trades (empty when writing to a trade_buffer or
+            notifier).
+        """
+        trades = []
+        best_price = self.get_best_price()
+
+        while best_price is not None and order.volume > 0:
+            level = self._best_level
+            if self.feed is not None:
+                self._publish_executions(level, order.volume)
+            if order.volume < level.volume:
+                trades_at_price, orders_filled = level.fill(
+                    order, trade_buffer, notifier
+                )
+                trades.extend(trades_at_price)
+                self._remove_filled(orders_filled)
+                if self.feed is not None:
+                    self._publish_level(level)
+                if self.depth_index is not None:
+                    self.depth_index.set(level.price, level.volume)
+                break
+
+            trades_at_price, orders_filled = level.drain(
+                order, trade_buffer, notifier
+            )
+            trades.extend(trades_at_price)
+            self._remove_filled(orders_filled)
+            if self.feed is not None:
+                self._publish_level(level)
+            if self.depth_index is not None:
+                self.depth_index.set(level.price, level.volume)
+            self._top_valid = False
+            self._drop_level(best_price, level)
+            best_price = self.get_best_price()
+
+        return trades
+
+    def _remove_filled(self, orders):
+        """
+        Drop filled orders from the order map, trader index and expiry schedule.
+
+        Parameters
+        ----------
+        orders : list of Order
+            Orders that have left the book.
+
+        Raises
+        ------
+        KeyError
+            If an order ID is not found in the order map.
+        """
+        order_map = self.order_map
+        wheel = self.expiration_wheel
+        allocator = self.id_allocator
+        for o in orders:
+            try:
+                del order_map[o.id]
+            except KeyError as e:
+                raise KeyError(
+                    f"Tried to delete order {e} from the order_map. "
+                    f"It is probably a duplicate order."
+                )
+            self._unindex_trader(o)
+            if wheel is not None:
+                wheel.detach(o.id)
+            if allocator is not None:
+                allocator.release(o.id)
+
+    # --- market-data feed ---
+
+    def _publish_add(self, order_id, price, volume, level, added):
+        """
+        Publish an order arriving at a level.
+        """
+        feed = self.feed
+        feed.publish(DeltaFeed.ORDER_ADDED, self.is_bid_side, order_id, price, volume)
+        feed.publish(
+            DeltaFeed.LEVEL_ADDED if added else DeltaFeed.LEVEL_CHANGED,
+            self.is_bid_side,
+            -1,
+            price,
+            level.volume,
+        )
+
+    def _publish_cancel(self, order_id, volume, level):
+        """
+        Publish ``volume`` of an order being cancelled from a level.
+        """
+        self.feed.publish(
+            DeltaFeed.ORDER_CANCELLED, self.is_bid_side, order_id, level.price, volume
+        )
+        self._publish_level(level)
+
+    def _publish_level(self, level):
+        """
+        Publish a level's new volume, or its removal if it is empty.
+        """
+        if level.head is None:
+            kind = DeltaFeed.LEVEL_REMOVED
+        else:
+            kind = DeltaFeed.LEVEL_CHANGED
+        self.feed.publish(kind, self.is_bid_side, -1, level.price, level.volume)
+
+    def _publish_loaded(self, columns):
+        """
+        Publish the orders and levels written by ``load_orders``.
+
+        Parameters
+        ----------
+        columns : mapping of numpy.ndarray
+            Columns as returned by ``export_orders``, levels best first and
+            each level in queue order.
+        """
+        feed = self.feed
+        is_bid_side = self.is_bid_side
+        level_price = None
+        level_volume = 0
+        for order_id, price, volume in zip(
+            columns["order_id"].tolist(), columns["price"].tolist(), columns["volume"].tolist()
+        ):
+            if price != level_price:
+                if level_price is not None:
+                    feed.publish(DeltaFeed.LEVEL_ADDED, is_bid_side, -1, level_price, level_volume)
+                level_price = price
+                level_volume = 0
+            feed.publish(DeltaFeed.ORDER_ADDED, is_bid_side, order_id, price, volume)
+            level_volume += volume
+        if level_price is not None:
+            feed.publish(DeltaFeed.LEVEL_ADDED, is_bid_side, -1, level_price, level_volume)
+
+    def _publish_executions(self, level, volume):
+        """
+        Publish the executions an incoming volume is about to take from a level.
+
+        Matching is FIFO, so the fills are known before they happen: walk
+        the queue from the front until ``volume`` is used up.
+
+        Parameters
+        ----------
+        level : PriceLevel
+            The level about to be matched.
+        volume : int
+            Remaining volume of the incoming order.
+        """
+        feed = self.feed
+        is_bid_side = self.is_bid_side
+        price = level.price
+        for resting in level:
+            if volume <= 0:
+                break
+            executed = min(resting.volume, volume)
+            feed.publish(DeltaFeed.ORDER_EXECUTED, is_bid_side, resting.id, price, executed)
+            volume -= executed
+
+    # --- snapshot and restore ---
+
+    def export_orders(self):
+        """
+        Get every resting order as columns, in price-time priority order.
+
+        Returns
+        -------
+        dict of numpy.ndarray
+            ``order_id``, ``price`` (internal units), ``volume``,
+            ``trader_id`` and ``lifetime`` (None stored as ``NO_VALUE``),
+            one entry per order, levels best first and each level in queue
+            order. ``trader_order`` holds the order IDs in trader index
+            order, grouped by trader; ``trader_keys`` and ``trader_sizes``
+            give each group's trader ID and length.
+        """
+        order_ids, prices, volumes, trader_ids, lifetimes = [], [], [], [], []
+        for level in self.top_levels(len(self.order_map)):
+            for order in level:
+                order_ids.append(order.id)
+                prices.append(order.price)
+                volumes.append(order.volume)
+                trader_ids.append(NO_VALUE if order.trader_id is None else order.trader_id)
+                lifetimes.append(NO_VALUE if order.lifetime is None else order.lifetime)
+        return {
+            "order_id": np.array(order_ids, dtype=np.int64),
+            "price": np.array(prices, dtype=np.int64 if self.tick_size is not None else float),
+            "volume": np.array(volumes, dtype=np.int64),
+            "trader_id": np.array(trader_ids, dtype=np.int64),
+            "lifetime": np.array(lifetimes, dtype=np.int64),
+            **self._export_traders(),
+        }
+
+    def load_orders(self, columns):
+        """
+        Replace the book's contents with orders exported by ``export_orders``.
+
+        Levels and queues are rebuilt directly in their exported order; no
+        matching takes place. A subscribed feed receives the clear followed
+        by every loaded order and level.
+
+        Parameters
+        ----------
+        columns : mapping of numpy.ndarray
+            Columns as returned by ``export_orders``.
+        """
+        self.clear()
+        is_bid_side = self.is_bid_side
+        order_map = self.order_map
+        order_ids = columns["order_id"].tolist()
+        prices = columns["price"]
+        volumes = columns["volume"]
+        trader_ids = [
+            None if trader_id == NO_VALUE else trader_id
+            for trader_id in columns["trader_id"].tolist()
+        ]
+        lifetimes = [
+            None if lifetime == NO_VALUE else lifetime
+            for lifetime in columns["lifetime"].tolist()
+        ]
+        # Consecutive orders at one price form a level's queue.
+        starts = np.flatnonzero(np.r_[True, prices[1:] != prices[:-1]])[: len(prices)]
+        stops = np.r_[starts[1:], len(prices)].astype(np.int64)
+        level_volumes = np.add.reduceat(volumes, starts) if len(starts) else starts
+        volumes = volumes.tolist()
+
+        # Orders are allocated without __init__ (which would also advance the
+        # ID counter) and every slot is filled here, linking each queue as it
+        # goes. Collection is paused since every new object stays live.
+        new_order = Order.__new__
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            for start, stop, volume in zip(
+                starts.tolist(), stops.tolist(), level_volumes.tolist()
+            ):
+                price = prices[start].item()
+                prev = None
+                for order_id, order_volume, trader_id, lifetime in zip(
+                    order_ids[start:stop],
+                    volumes[start:stop],
+                    trader_ids[start:stop],
+                    lifetimes[start:stop],
+                ):
+                    order = new_order(Order)
+                    order.price = price
+                    order.volume = order_volume
+                    order.is_bid = is_bid_side
+                    order.id = order_id
+                    order.is_market = False
+                    order.trader_id = trader_id
+                    order.lifetime = lifetime
+                    order._prev = prev
+                    order._next = None
+                    if prev is not None:
+                        prev._next = order
+                    prev = order
+                    order_map[order_id] = order
+                level = self._new_level(price)
+                level.head = order_map[order_ids[start]]
+                level.tail = prev
+                level.num_orders = stop - start
+                level.volume = volume
+
+            self._index_traders(columns)
+        finally:
+            if gc_enabled:
+                gc.enable()
+        self._top_valid = False
+        if self.depth_index is not None:
+            self._load_depth_index()
+        if self.feed is not None:
+            self._publish_loaded(columns)
+
+    def _export_traders(self):
+        """
+        Get the trader index as columns for ``export_orders``.
+        """
+        trader_orders = self.trader_orders
+        return {
+            "trader_order": np.array(
+                [order_id for orders in trader_orders.values() for order_id in orders],
+                dtype=np.int64,
+            ),
+            "trader_keys": np.array(
+                [NO_VALUE if trader_id is None else trader_id for trader_id in trader_orders],
+                dtype=np.int64,
+            ),
+            "trader_sizes": np.array(
+                [len(orders) for orders in trader_orders.values()], dtype=np.int64
+            ),
+        }
+
+    def _index_traders(self, columns):
+        """
+        Rebuild the trader index from exported columns and ``order_map``.
+        """
+        order_map = self.order_map
+        order_ids = columns["trader_order"].tolist()
+        trader_orders = self.trader_orders
+        start = 0
+        for trader_id, size in zip(
+            columns["trader_keys"].tolist(), columns["trader_sizes"].tolist()
+        ):
+            group = order_ids[start:start + size]
+            trader_orders[None if trader_id == NO_VALUE else trader_id] = dict(
+                zip(group, map(order_map.__getitem__, group))
+            )
+            start += size
+
     def get_depth(self):
         """
         Get depth, the total volume across all price levels.
 
+        O(1) with a depth index, otherwise a sum over every level.
+
         Returns
         -------
         int
             Sum of volumes at all price levels.
         """
+        if self.depth_index is not None:
+            return self.depth_index.total
         return sum(level.volume for level in self._price_levels.values())
+
+    # --- cumulative depth ---
+
+    def _load_depth_index(self):
+        """
+        Rebuild the depth index from the current levels.
+        """
+        ticks = []
+        volumes = []
+        for price in self._prices_descending():
+            level = self._get_level(price)
+            if level.volume:
+                ticks.append(price)
+                volumes.append(level.volume)
+        self.depth_index.load(ticks, volumes)
+
+    def _require_depth_index(self):
+        if self.depth_index is None:
+            raise ValueError("Depth queries require a depth index.")
+        return self.depth_index
+
+    def volume_through(self, tick):
+        """
+        Get the volume resting at ticks as good as or better than ``tick``.
+
+        This is the volume an opposite-side limit order at ``tick`` could
+        fill immediately. O(log W) for a window of W ticks.
+
+        Parameters
+        ----------
+        tick : int
+            Limit tick.
+
+        Returns
+        -------
+        int
+            Volume at ``tick`` or inside it.
+
+        Raises
+        ------
+        ValueError
+            If the side has no depth index.
+        """
+        return self._require_depth_index().volume_through(tick)
+
+    def sweep_price(self, volume):
+        """
+        Get the last tick reached by taking ``volume`` from the touch.
+
+        Parameters
+        ----------
+        volume : int
+            Positive volume to take.
+
+        Returns
+        -------
+        int or None
+            The worst tick touched, or None if the side holds less volume.
+
+        Raises
+        ------
+        ValueError
+            If the side has no depth index or volume is not positive.
+        """
+        if volume <= 0:
+            raise ValueError(f"Sweep volume must be positive, got {volume}")
+        swept = self._require_depth_index().sweep(volume)
+        return None if swept is None else swept[0]
+
+    def sweep_vwap(self, volume):
+        """
+        Get the volume-weighted average tick paid taking ``volume`` from the touch.
+
+        Parameters
+        ----------
+        volume : int
+            Positive volume to take.
+
+        Returns
+        -------
+        float or None
+            Average tick of the fills, or None if the side holds less volume.
+
+        Raises
+        ------
+        ValueError
+            If the side has no depth index or volume is not positive.
+        """
+        if volume <= 0:
+            raise ValueError(f"Sweep volume must be positive, got {volume}")
+        swept = self._require_depth_index().sweep(volume)
+        return None if swept is None else swept[1] / volume
     
     def clear(self):
         """
@@ -219,19 +1178,32 @@ class PriceBook:
         """
         self._heap.clear()
         self._price_levels.clear()
+        self._num_dead = 0
+        self._best_price = None
+        self._best_level = None
+        self._top_valid = True
         self.order_map.clear()
-
+        self.trader_orders.clear()
+        if self.depth_index is not None:
+            self.depth_index.clear()
+        if self.feed is not None:
+            self.feed.publish(DeltaFeed.BOOK_CLEARED, self.is_bid_side, -1, 0, 0)
 
     def __repr__(self):
-        return (f"PriceBook(is_bid_side={self.is_bid_side}, "
-                f"price_levels={sorted(list(self._price_levels.keys()))})")
+        return (f"{type(self).__name__}(is_bid_side={self.is_bid_side}, "
+                f"price_levels={self._prices_descending()[::-1]})")
 
     def display(self):
         """
         Print a readable view of all price levels in the book.
         """
         print(f"{'BID' if self.is_bid_side else 'ASK'} PriceBook:")
-        for heap_price in sorted(self._heap, reverse=not self.is_bid_side):
-            price = -heap_price if self.is_bid_side else heap_price
-            price_level = self._price_levels[price]
-            print(price_level)
\ No newline at end of file
+        for price in self._prices_descending():
+            price_level = self._get_level(price)
+            if self.tick_size is None:
+                print(price_level)
+            else:
+                print(
+                    f"PriceLevel: Price={self.to_price(price)}, "
+                    f"Volume={price_level.volume}, Orders={price_level.num_orders}"
+                )
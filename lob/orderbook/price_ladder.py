@@ -0,0 +1,322 @@
+"""
+Dense array-backed price ladder for integer-tick order books.
+
+This module defines the PriceLadder class, a PriceBook backend that stores
+price levels in a contiguous list indexed by tick offset and finds the best
+price through a two-level occupancy bitmap instead of a heap.
+"""
+
+import heapq as hq
+
+from .price_book import PriceBook
+
+# Bits per bitmap word.
+_WORD_BITS = 64
+
+
+class PriceLadder(PriceBook):
+    """
+    Manages one side of an integer-tick order book as a dense price ladder.
+
+    Level ``i`` of the ladder holds tick ``base + i``. Occupied levels are
+    flagged in a bitmap of 64-bit words, and a summary word flags the
+    non-zero words, so the best price is found with two bit scans instead of
+    O(log N) heap operations. Level objects stay in their slot when emptied
+    and are reused when orders return to that tick.
+
+    The window has a fixed width. Levels worse than the window fall back to
+    the inherited PriceBook heap, which only matching past the window
+    touches. A tick better than the window, or a window left empty while the
+    heap holds levels, re-anchors the window a quarter of its width behind
+    the best tick in O(W + levels), so memory never depends on how far apart
+    resting orders are.
+
+    Attributes
+    ----------
+    width : int
+        Number of ticks covered by the ladder window.
+    base : int or None
+        Tick held by slot 0, or None before the first order arrives.
+
+    Methods
+    -------
+    Inherits the PriceBook interface.
+    """
+
+    def __init__(self, is_bid_side, tick_size, width=4096):
+        """
+        Initialize an empty price ladder.
+
+        Parameters
+        ----------
+        is_bid_side : bool
+            True if this is the bid (buy) side, False for ask (sell) side.
+        tick_size : float
+            Price increment of one tick. Required, since the ladder is
+            indexed by integer tick.
+        width : int, optional
+            Number of ticks covered by the window, rounded up to a multiple
+            of 64 (default is 4096).
+
+        Raises
+        ------
+        ValueError
+            If tick_size is None or width is not positive.
+        """
+        if tick_size is None:
+            raise ValueError("PriceLadder requires a tick_size.")
+        if width <= 0:
+            raise ValueError(f"width must be positive, got {width}")
+        super().__init__(is_bid_side, tick_size=tick_size)
+        self.width = -(-width // _WORD_BITS) * _WORD_BITS
+        self.base = None
+        self._ladder = [None] * self.width
+        self._words = [0] * (self.width // _WORD_BITS)
+        self._summary = 0
+
+    # --- occupancy bitmap ---
+
+    def _set_bit(self, index):
+        word = index >> 6
+        self._words[word] |= 1 << (index & 63)
+        self._summary |= 1 << word
+
+    def _clear_bit(self, index):
+        word = index >> 6
+        bits = self._words[word] & ~(1 << (index & 63))
+        self._words[word] = bits
+        if not bits:
+            self._summary &= ~(1 << word)
+
+    def _lowest_index(self):
+        summary = self._summary
+        if not summary:
+            return None
+        word = (summary & -summary).bit_length() - 1
+        bits = self._words[word]
+        return (word << 6) + (bits & -bits).bit_length() - 1
+
+    def _highest_index(self):
+        summary = self._summary
+        if not summary:
+            return None
+        word = summary.bit_length() - 1
+        return (word << 6) + self._words[word].bit_length() - 1
+
+    def _occupied_indices(self):
+        """
+        Get the indices of all occupied slots in ascending order.
+        """
+        indices = []
+        for word, bits in enumerate(self._words):
+            while bits:
+                low = bits & -bits
+                indices.append((word << 6) + low.bit_length() - 1)
+                bits ^= low
+        return indices
+
+    # --- window management ---
+
+    def _anchor(self, tick):
+        """
+        Get the base that puts ``tick`` a quarter of the window from its
+        better end.
+        """
+        if self.is_bid_side:
+            return tick - self.width + 1 + self.width // 4
+        return tick - self.width // 4
+
+    def _rebase(self, base):
+        """
+        Move the window to start at tick ``base``, spilling live levels that
+        fall outside it into the overflow heap, then rebuild the bitmap and
+        the heap. Empty levels are dropped.
+
+        Parameters
+        ----------
+        base : int
+            Tick held by slot 0 of the new window.
+        """
+        live = [
+            (tick, level)
+            for tick, level in self._price_levels.items()
+            if level.head is not None
+        ]
+        if self.base is not None:
+            ladder = self._ladder
+            live += [(self.base + index, ladder[index]) for index in self._occupied_indices()]
+        width = self.width
+        self.base = base
+        self._ladder = ladder = [None] * width
+        self._words = [0] * (width // _WORD_BITS)
+        self._summary = 0
+        self._price_levels = outside = {}
+        for tick, level in live:
+            index = tick - base
+            if 0 <= index < width:
+                ladder[index] = level
+                self._set_bit(index)
+            else:
+                outside[tick] = level
+        if self.is_bid_side:
+            self._heap = [-tick for tick in outside]
+        else:
+            self._heap = list(outside)
+        hq.heapify(self._heap)
+        self._num_dead = 0
+
+    # --- PriceBook storage hooks ---
+
+    def _get_level(self, price):
+        if self.base is None:
+            return None
+        index = price - self.base
+        if 0 <= index < self.width:
+            return self._ladder[index]
+        return self._price_levels.get(price)
+
+    def _new_level(self, price):
+        if self.base is None:
+            self.base = self._anchor(price)
+        index = price - self.base
+        if not 0 <= index < self.width:
+            if (index >= self.width) != self.is_bid_side:
+                # Worse than the window: keep it in the overflow heap.
+                return super()._new_level(price)
+            self._rebase(self._anchor(price))
+            index = price - self.base
+        level = self._ladder[index] = self._make_level(price)
+        self._set_bit(index)
+        return level
+
+    def _level_emptied(self, price, level):
+        index = price - self.base
+        if 0 <= index < self.width:
+            self._clear_bit(index)
+        else:
+            super()._level_emptied(price, level)
+
+    def _level_revived(self, price, level):
+        index = price - self.base
+        if 0 <= index < self.width:
+            self._set_bit(index)
+        else:
+            super()._level_revived(price, level)
+
+    def _drop_level(self, price, level):
+        index = price - self.base
+        if 0 <= index < self.width:
+            # Swept levels stay in their slot for reuse, as on any other emptying.
+            self._clear_bit(index)
+        else:
+            super()._drop_level(price, level)
+
+    def _prices_descending(self):
+        if self.base is None:
+            return []
+        window = [self.base + index for index in reversed(self._occupied_indices())]
+        outside = super()._prices_descending()
+        return window + outside if self.is_bid_side else outside + window
+
+    # --- queries ---
+
+    def _find_best_price(self):
+        """
+        Scan the occupancy bitmap for the best occupied tick.
+
+        If the window is empty, it is first re-anchored on the overflow
+        heap's best level.
+
+        Returns
+        -------
+        int or None
+            The best tick, or None if the ladder is empty.
+        """
+        if not self._summary:
+            tick = super()._find_best_price()
+            if tick is None:
+                return None
+            self._rebase(self._anchor(tick))
+        index = self._highest_index() if self.is_bid_side else self._lowest_index()
+        if index is None:
+            return None
+        return self.base + index
+
+    def top_levels(self, n):
+        """
+        Get the best ``n`` occupied levels, best first.
+
+        Scans the occupancy bitmap from the best end, skipping empty words
+        through the summary word, so the cost depends on ``n`` rather than on
+        the number of levels. Levels past the window are taken from the
+        overflow heap.
+
+        Parameters
+        ----------
+        n : int
+            Maximum number of levels to return.
+
+        Returns
+        -------
+        list of PriceLevel
+            Up to ``n`` levels in price priority order.
+        """
+        levels = []
+        words = self._words
+        ladder = self._ladder
+        summary = self._summary
+        while summary and len(levels) < n:
+            if self.is_bid_side:
+                word = summary.bit_length() - 1
+            else:
+                word = (summary & -summary).bit_length() - 1
+            summary ^= 1 << word
+            bits = words[word]
+            while bits and len(levels) < n:
+                if self.is_bid_side:
+                    bit = bits.bit_length() - 1
+                else:
+                    bit = (bits & -bits).bit_length() - 1
+                bits ^= 1 << bit
+                levels.append(ladder[(word << 6) + bit])
+        if len(levels) < n and self._price_levels:
+            levels += super().top_levels(n - len(levels))
+        return levels
+
+    def level_counts(self):
+        """
+        Get the number of live and dead price levels.
+
+        Returns
+        -------
+        tuple of int
+            ``(live, dead)``: emptied ladder slots are reused in place, so
+            only the overflow heap holds dead levels.
+        """
+        live, dead = super().level_counts()
+        return live + sum(bin(bits).count("1") for bits in self._words), dead
+
+    def get_depth(self):
+        """
+        Get depth, the total volume across all occupied levels.
+
+        Returns
+        -------
+        int
+            Sum of volumes at all occupied levels.
+        """
+        if self.depth_index is not None:
+            return self.depth_index.total
+        ladder = self._ladder
+        window = sum(ladder[index].volume for index in self._occupied_indices())
+        return window + super().get_depth()
+
+    def clear(self):
+        """
+        Clears the ladder of orders and price levels, keeping its width.
+        """
+        super().clear()
+        self.base = None
+        self._ladder = [None] * self.width
+        self._words = [0] * (self.width // _WORD_BITS)
+        self._summary = 0
@@ -2,11 +2,9 @@
 Price level management for limit order book.
 
 This module defines the PriceLevel class that maintains orders at a single
-price point using a FIFO queue for order matching.
+price point using an intrusive doubly-linked FIFO queue for order matching.
 """
 
-from collections import deque
-
 from ..core import Trade
 
 
@@ -14,12 +12,20 @@ class PriceLevel:
     """
     Maintains all orders at a specific price level with FIFO matching.
 
+    Orders are kept in a doubly-linked queue threaded through the orders
+    themselves (``order._prev`` / ``order._next``), so appending, popping the
+    front and cancelling an arbitrary order are all O(1).
+
     Attributes
     ----------
     price : float
         The price level for this queue of orders.
-    orders : deque
-        FIFO queue of orders at this price level.
+    head : Order or None
+        Oldest order at this level (first to be filled).
+    tail : Order or None
+        Newest order at this level.
+    num_orders : int
+        Number of orders resting at this price level.
     volume : int
         Total volume of all orders at this price level.
 
@@ -27,8 +33,10 @@ class PriceLevel:
     -------
     add(order)
         Add an order to this price level.
-    fill(order)
+    fill(order, trade_buffer=None, notifier=None)
         Match incoming order against orders at this level.
+    drain(order, trade_buffer=None, notifier=None)
+        Fill every order at this level against a larger incoming order.
     cancel(order)
         Remove a specific order from this price level.
     is_empty()
@@ -45,7 +53,9 @@ class PriceLevel:
             The price level for this queue of orders.
         """
         self.price = price
-        self.orders = deque()
+        self.head = None
+        self.tail = None
+        self.num_orders = 0
         self.volume = 0
 
     def add(self, order):
@@ -57,7 +67,15 @@ class PriceLevel:
         order : Order
             The order to add to this price level.
         """
-        self.orders.append(order)
+        tail = self.tail
+        order._prev = tail
+        order._next = None
+        if tail is None:
+            self.head = order
+        else:
+            tail._next = order
+        self.tail = order
+        self.num_orders += 1
         self.volume += order.volume
 
     def _top(self):
@@ -69,9 +87,28 @@ class PriceLevel:
         Order or None
             The first order in the queue, or None if empty.
         """
-        if not self.orders:
-            return None
-        return self.orders[0]  # O(1)
+        return self.head  # O(1)
+
+    def _unlink(self, order):
+        """
+        Unlink an order from the queue without touching the level volume.
+
+        Parameters
+        ----------
+        order : Order
+            An order currently linked into this price level.
+        """
+        prev, next_ = order._prev, order._next
+        if prev is None:
+            self.head = next_
+        else:
+            prev._next = next_
+        if next_ is None:
+            self.tail = prev
+        else:
+            next_._prev = prev
+        order._prev = order._next = None
+        self.num_orders -= 1
 
     def _pop(self):
         """
@@ -87,13 +124,13 @@ class PriceLevel:
         IndexError
             If the price level is empty.
         """
-        if not self.orders:
+        order = self.head
+        if order is None:
             raise IndexError("Price level is empty.")
-        order = self.orders.popleft()  # O(1)
-        self.volume -= order.volume
+        self._unlink(order)  # O(1)
         return order
 
-    def fill(self, order):
+    def fill(self, order, trade_buffer=None, notifier=None):
         """
         Match incoming order against orders at this price level.
 
@@ -101,11 +138,19 @@ class PriceLevel:
         ----------
         order : Order
             The incoming order to fill against this price level.
+        trade_buffer : TradeBuffer, optional
+            If given, fills are appended to this buffer instead of being
+            returned as Trade objects (default is None).
+        notifier : object, optional
+            If given (and no trade_buffer is), each fill is passed to
+            ``notifier.add(bid_order, ask_order, price, volume)`` instead of
+            being returned as a Trade object (default is None).
 
         Returns
         -------
         trades : list of Trade
-            List of executed trades.
+            List of executed trades (empty when writing to a trade_buffer or
+            notifier).
         level_orders_filled : list of Order
             List of orders completely filled and removed from this level.
         """
@@ -113,16 +158,11 @@ class PriceLevel:
         level_orders_filled = []
         is_bid = order.is_bid
 
-        while not self.is_empty() and order.volume > 0:
-            top_order = self._top()
+        while self.head is not None and order.volume > 0:
+            top_order = self.head
 
             if top_order.volume > order.volume:
                 trade_volume = order.volume
-
-            elif top_order.volume == order.volume:
-                trade_volume = order.volume
-                level_orders_filled.append(self._pop())
-
             else:
                 trade_volume = top_order.volume
                 level_orders_filled.append(self._pop())
@@ -135,14 +175,73 @@ class PriceLevel:
             # Log trade
             bid = order if is_bid else top_order
             ask = top_order if is_bid else order
-            trade = Trade(bid, ask, self.price, trade_volume)
-            trades.append(trade)
+            if trade_buffer is not None:
+                trade_buffer.append(bid.id, ask.id, self.price, trade_volume, is_bid)
+            elif notifier is not None:
+                notifier.add(bid, ask, self.price, trade_volume)
+            else:
+                trades.append(Trade(bid, ask, self.price, trade_volume))
 
         return trades, level_orders_filled
 
+    def drain(self, order, trade_buffer=None, notifier=None):
+        """
+        Fill every order at this level against an incoming order.
+
+        The incoming order must have at least the level's volume remaining,
+        so each resting order is filled in full and the queue is emptied in
+        one pass without per-order unlinking.
+
+        Parameters
+        ----------
+        order : Order
+            The incoming order, with ``order.volume >= self.volume``.
+        trade_buffer : TradeBuffer, optional
+            See ``fill`` (default is None).
+        notifier : object, optional
+            See ``fill`` (default is None).
+
+        Returns
+        -------
+        trades : list of Trade
+            List of executed trades (empty when writing to a trade_buffer or
+            notifier).
+        level_orders_filled : list of Order
+            Every order that was queued at this level, in queue order.
+        """
+        trades = []
+        level_orders_filled = []
+        is_bid = order.is_bid
+        price = self.price
+
+        resting = self.head
+        while resting is not None:
+            trade_volume = resting.volume
+            resting.volume = 0
+            order.volume -= trade_volume
+            level_orders_filled.append(resting)
+
+            bid = order if is_bid else resting
+            ask = resting if is_bid else order
+            if trade_buffer is not None:
+                trade_buffer.append(bid.id, ask.id, price, trade_volume, is_bid)
+            elif notifier is not None:
+                notifier.add(bid, ask, price, trade_volume)
+            else:
+                trades.append(Trade(bid, ask, price, trade_volume))
+
+            next_ = resting._next
+            resting._prev = resting._next = None
+            resting = next_
+
+        self.head = self.tail = None
+        self.num_orders = 0
+        self.volume = 0
+        return trades, level_orders_filled
+
     def cancel(self, order):
         """
-        Remove a specific order from this price level.
+        Remove a specific order from this price level in O(1).
 
         Parameters
         ----------
@@ -152,12 +251,13 @@ class PriceLevel:
         Raises
         ------
         ValueError
-            If the order is not found at this price level.
+            If the order is not queued at this price level.
         """
-        try:
-            self.orders.remove(order)  # O(n)
-        except ValueError:
+        # An order queued at another level has a different price; a detached
+        # one (or another level's head) has no predecessor here.
+        if order.price != self.price or (order._prev is None and self.head is not order):
             raise ValueError("Order not found at this price level.")
+        self._unlink(order)
         self.volume -= order.volume
 
     def is_empty(self):
@@ -169,12 +269,20 @@ class PriceLevel:
         bool
             True if no orders remain, False otherwise.
         """
-        return True if len(self.orders) == 0 else False
+        return self.head is None
+
+    def __iter__(self):
+        order = self.head
+        while order is not None:
+            yield order
+            order = order._next
+
+    def __len__(self):
+        return self.num_orders
 
     def __repr__(self):
-        return f"PriceLevel(price={self.price}, orders={list(self.orders)})"
+        return f"PriceLevel(price={self.price}, orders={list(self)})"
 
     def __str__(self):
-        volume = sum(order.volume for order in self.orders)
-        return (f"PriceLevel: Price={self.price}, Volume={volume}, "
-                f"Orders={len(self.orders)}")
+        return (f"PriceLevel: Price={self.price}, Volume={self.volume}, "
+                f"Orders={self.num_orders}")
@@ -0,0 +1,656 @@
+"""
+Price book backed by a struct-of-arrays order store.
+
+This module defines the StorePriceBook class, a PriceBook whose resting
+orders live in an OrderStore rather than as Order objects. The order map,
+trader index and level queues hold integer slots.
+"""
+
+import numpy as np
+
+from ..core import Order, Trade
+from .delta_feed import DeltaFeed
+from .order_store import NO_SLOT, NO_VALUE, SlotLevel
+from .price_book import PriceBook
+
+
+class StorePriceBook(PriceBook):
+    """
+    Manages one side of an integer-tick order book on top of an OrderStore.
+
+    Incoming orders are copied into store slots on ``add`` and the Order
+    object is not retained. ``order_map`` maps order IDs to slots and
+    ``trader_orders`` maps trader IDs to ``{order_id: slot}``. Level ordering
+    (heap, top-of-book cache, dead-level compaction) is inherited from
+    PriceBook.
+
+    Resting orders are only materialized as Order objects when they trade,
+    because trades and notifications refer to orders. The object is kept in
+    sync with the store until the order leaves the book. Fills written to a
+    TradeBuffer carry order IDs only, so they materialize nothing.
+
+    Attributes
+    ----------
+    store : OrderStore
+        Column store holding this side's resting orders (may be shared with
+        the other side).
+
+    Methods
+    -------
+    Inherits the PriceBook interface; ``trader_order_list`` returns slots.
+    """
+
+    def __init__(self, is_bid_side, tick_size, store, compact_threshold=256):
+        """
+        Initialize a store-backed price book.
+
+        Parameters
+        ----------
+        is_bid_side : bool
+            True if this is the bid (buy) side, False for ask (sell) side.
+        tick_size : float
+            Price increment of one tick. Required, since prices are stored
+            in an integer column.
+        store : OrderStore
+            Column store for resting orders.
+        compact_threshold : int, optional
+            See PriceBook (default is 256).
+
+        Raises
+        ------
+        ValueError
+            If tick_size is None.
+        """
+        if tick_size is None:
+            raise ValueError("StorePriceBook requires a tick_size.")
+        super().__init__(
+            is_bid_side, tick_size=tick_size, compact_threshold=compact_threshold
+        )
+        self.store = store
+        # Order objects materialized for resting orders that have traded.
+        self._views = {}
+
+    def _make_level(self, price):
+        return SlotLevel(price, self.store)
+
+    def _view(self, slot):
+        """
+        Get (or materialize) the Order object for a resting slot.
+
+        Parameters
+        ----------
+        slot : int
+            Slot of a live order.
+
+        Returns
+        -------
+        Order
+            Object carrying the order's current fields.
+        """
+        view = self._views.get(slot)
+        if view is None:
+            store = self.store
+            view = Order.__new__(Order)
+            view.price = int(store.price[slot])
+            view.volume = int(store.volume[slot])
+            view.is_bid = self.is_bid_side
+            view.id = int(store.order_id[slot])
+            view.is_market = False
+            view.trader_id = store.get_trader_id(slot)
+            view.lifetime = store.get_lifetime(slot)
+            view._prev = view._next = None
+            self._views[slot] = view
+        return view
+
+    def add(self, order, retain=False):
+        """
+        Copy an order into the store and queue its slot at its price level.
+
+        Parameters
+        ----------
+        order : Order
+            The order to add, with an integer tick price.
+        retain : bool, optional
+            Keep ``order`` as the slot's materialized view. Used for orders
+            that traded before resting, so that the object already held by
+            those trades keeps tracking the order (default is False).
+        """
+        price = order.price
+        slot = self.store.alloc(order)
+        if retain:
+            self._views[slot] = order
+
+        level = self._get_level(price)
+        if level is None:
+            level = self._new_level(price)
+            added = True
+        elif level.head is None:
+            self._level_revived(price, level)
+            added = True
+        else:
+            added = False
+
+        level.add(slot)
+        if self.feed is not None:
+            self._publish_add(order.id, price, order.volume, level, added)
+        if self.depth_index is not None:
+            self.depth_index.set(level.price, level.volume)
+        if self._top_valid and level is not self._best_level:
+            best_price = self._best_price
+            if (
+                best_price is None
+                or (price > best_price if self.is_bid_side else price < best_price)
+            ):
+                self._best_price = price
+                self._best_level = level
+
+        self.order_map[order.id] = slot
+        trader_orders = self.trader_orders.get(order.trader_id)
+        if trader_orders is None:
+            self.trader_orders[order.trader_id] = {order.id: slot}
+        else:
+            trader_orders[order.id] = slot
+
+    def _release(self, slot, order_id):
+        """
+        Drop a slot that has left the book from the indexes and the store.
+        """
+        store = self.store
+        del self.order_map[order_id]
+        trader_id = store.get_trader_id(slot)
+        trader_orders = self.trader_orders[trader_id]
+        del trader_orders[order_id]
+        if not trader_orders:
+            del self.trader_orders[trader_id]
+        self._views.pop(slot, None)
+        store.free(slot)
+        if self.expiration_wheel is not None:
+            self.expiration_wheel.detach(order_id)
+        if self.id_allocator is not None:
+            self.id_allocator.release(order_id)
+
+    def cancel_id(self, order_id):
+        """
+        Cancel an order by ID if it rests on this side of the book.
+
+        Parameters
+        ----------
+        order_id : int
+            ID of the order to cancel.
+
+        Returns
+        -------
+        bool
+            True if the order was found and cancelled, False otherwise.
+        """
+        slot = self.order_map.get(order_id)
+        if slot is None:
+            return False
+        price = int(self.store.price[slot])
+        level = self._get_level(price)
+        level.unlink(slot)
+        volume = int(self.store.volume[slot])
+        level.volume -= volume
+        if self.feed is not None:
+            self._publish_cancel(order_id, volume, level)
+        if self.depth_index is not None:
+            self.depth_index.set(level.price, level.volume)
+        if level.head is None:
+            if level is self._best_level:
+                self._top_valid = False
+            self._level_emptied(price, level)
+        self._release(slot, order_id)
+        return True
+
+    def cancel(self, order):
+        """
+        Cancel and remove an order from the book.
+
+        Parameters
+        ----------
+        order : Order
+            The order to cancel (matched by ID).
+
+        Raises
+        ------
+        ValueError
+            If the order is not resting on this side.
+        """
+        if not self.cancel_id(order.id):
+            raise ValueError(f"Failed to cancel order {order.id}: not in PriceBook.")
+
+    def get_order(self, order_id):
+        """
+        Get the order resting on this side under an ID.
+
+        Parameters
+        ----------
+        order_id : int
+            ID of the order.
+
+        Returns
+        -------
+        Order or None
+            The order's materialized view, kept in sync with the store while
+            it rests, or None if it is not on this side.
+        """
+        slot = self.order_map.get(order_id)
+        return None if slot is None else self._view(slot)
+
+    def front_order_id(self):
+        """
+        Get the ID of the order first in line at the best price.
+
+        Returns
+        -------
+        int or None
+            ID of the order the next incoming order would trade against
+            first, or None if this side is empty.
+        """
+        level = self.get_best_level()
+        return None if level is None else int(self.store.order_id[level.head])
+
+    def reduce_volume(self, order_id, volume):
+        """
+        Shrink a resting order in place in O(1), keeping its queue position.
+
+        Parameters
+        ----------
+        order_id : int
+            ID of an order resting on this side.
+        volume : int
+            New volume, positive and no larger than the current volume.
+
+        Raises
+        ------
+        ValueError
+            If the order is not on this side or the volume is out of range.
+        """
+        slot = self.order_map.get(order_id)
+        if slot is None:
+            raise ValueError(f"Order {order_id} not found in PriceBook.")
+        store = self.store
+        current = int(store.volume[slot])
+        if not 0 < volume <= current:
+            raise ValueError(f"Reduced volume must be in (0, {current}], got {volume}")
+        level = self._get_level(int(store.price[slot]))
+        level.volume -= current - volume
+        if self.feed is not None:
+            self._publish_cancel(order_id, current - volume, level)
+        if self.depth_index is not None:
+            self.depth_index.set(level.price, level.volume)
+        store.volume[slot] = volume
+        view = self._views.get(slot)
+        if view is not None:
+            view.volume = volume
+
+    def trader_order_list(self, trader_id):
+        """
+        Get the slots of the live orders belonging to a trader.
+
+        Parameters
+        ----------
+        trader_id : int or None
+            Identifier of the trader.
+
+        Returns
+        -------
+        list of int
+            The trader's slots on this side, in arrival order.
+        """
+        trader_orders = self.trader_orders.get(trader_id)
+        return list(trader_orders.values()) if trader_orders else []
+
+    def unfilled_orders(self, trader_id):
+        trader_orders = self.trader_orders.get(trader_id)
+        if not trader_orders:
+            return []
+        store = self.store
+        return [
+            (order_id, int(store.price[slot]), int(store.volume[slot]))
+            for order_id, slot in trader_orders.items()
+        ]
+
+    def cancel_trader(self, trader_id):
+        trader_orders = self.trader_orders.get(trader_id)
+        if not trader_orders:
+            return []
+        order_ids = list(trader_orders)
+        for order_id in order_ids:
+            self.cancel_id(order_id)
+        return order_ids
+
+    def fill(self, order, trade_buffer=None, notifier=None):
+        """
+        Fill an incoming order against this side of the book.
+
+        Parameters
+        ----------
+        order : Order
+            The incoming order to fill.
+        trade_buffer : TradeBuffer, optional
+            If given, fills are appended to this buffer instead of being
+            returned as Trade objects, and resting orders are matched
+            directly in the store without being materialized (default is
+            None).
+        notifier : object, optional
+            If given (and no trade_buffer is), each fill is passed to
+            ``notifier.add(bid_order, ask_order, price, volume)`` instead of
+            being returned as a Trade object (default is None).
+
+        Returns
+        -------
+        list of Trade
+            List of executed trades resulting from the fill (empty when
+            writing to a trade_buffer or notifier).
+
+        Raises
+        ------
+        ValueError
+            If the order is on the same side as this book.
+        """
+        if order.is_bid == self.is_bid_side:
+            raise ValueError(
+                "Cannot fill an order on the same side of the PriceBook."
+            )
+
+        if order.is_market:
+            return self._sweep(order, trade_buffer, notifier)
+
+        price = order.price
+        trades = []
+        best_price = self.get_best_price()
+
+        while best_price is not None and order.volume > 0:
+            can_fill = (best_price >= price) if self.is_bid_side else (
+                best_price <= price
+            )
+            if not can_fill:
+                break
+
+            level = self._best_level
+            if self.feed is not None:
+                self._publish_executions(level, order.volume)
+            self._fill_level(order, level, trades, trade_buffer, notifier)
+            if self.feed is not None:
+                self._publish_level(level)
+            if self.depth_index is not None:
+                self.depth_index.set(level.price, level.volume)
+
+            if level.head is None:
+                if level is self._best_level:
+                    self._top_valid = False
+                self._level_emptied(best_price, level)
+
+            best_price = self.get_best_price()
+
+        return trades
+
+    def _fill_level(self, order, level, trades, trade_buffer, notifier):
+        """
+        Match an incoming order against the queue of one level.
+
+        Parameters
+        ----------
+        order : Order
+            The incoming order.
+        level : SlotLevel
+            The level to match against.
+        trades : list of Trade
+            List that executed trades are appended to, when neither a
+            trade_buffer nor a notifier is given.
+        trade_buffer : TradeBuffer or None
+            See ``fill``.
+        notifier : object or None
+            See ``fill``.
+        """
+        store = self.store
+        volumes = store.volume
+        order_ids = store.order_id
+        views = self._views
+        is_bid = order.is_bid
+
+        while level.head is not None and order.volume > 0:
+            slot = level.head
+            # Buffered fills only update views that already exist.
+            if trade_buffer is None:
+                resting = self._view(slot)
+            else:
+                resting = views.get(slot)
+            resting_volume = int(volumes[slot])
+            trade_volume = min(resting_volume, order.volume)
+
+            volumes[slot] = resting_volume - trade_volume
+            order.volume -= trade_volume
+            level.volume -= trade_volume
+            if resting is not None:
+                resting.volume -= trade_volume
+
+            if trade_buffer is not None:
+                resting_id = int(order_ids[slot])
+                trade_buffer.append(
+                    order.id if is_bid else resting_id,
+                    resting_id if is_bid else order.id,
+                    level.price,
+                    trade_volume,
+                    is_bid,
+                )
+            else:
+                bid = order if is_bid else resting
+                ask = resting if is_bid else order
+                if notifier is not None:
+                    notifier.add(bid, ask, level.price, trade_volume)
+                else:
+                    trades.append(Trade(bid, ask, level.price, trade_volume))
+
+            if resting_volume == trade_volume:
+                level.unlink(slot)
+                self._release(slot, int(order_ids[slot]))
+
+    def _sweep(self, order, trade_buffer=None, notifier=None):
+        """
+        Fill a market order against this side, best level first.
+
+        Levels the order consumes entirely are drained slot by slot without
+        unlinking, then dropped at once; the last, partially filled level
+        goes through the regular per-slot match.
+
+        Parameters
+        ----------
+        order : MarketOrder
+            The incoming market order.
+        trade_buffer : TradeBuffer, optional
+            See ``fill`` (default is None).
+        notifier : object, optional
+            See ``fill`` (default is None).
+
+        Returns
+        -------
+        list of Trade
+            List of executed trades (empty when writing to a trade_buffer or
+            notifier).
+        """
+        store = self.store
+        volumes = store.volume
+        order_ids = store.order_id
+        next_slots = store.next
+        views = self._views
+        is_bid = order.is_bid
+        trades = []
+        best_price = self.get_best_price()
+
+        while best_price is not None and order.volume > 0:
+            level = self._best_level
+            if self.feed is not None:
+                self._publish_executions(level, order.volume)
+            if order.volume < level.volume:
+                self._fill_level(order, level, trades, trade_buffer, notifier)
+                if self.feed is not None:
+                    self._publish_level(level)
+                if self.depth_index is not None:
+                    self.depth_index.set(level.price, level.volume)
+                break
+
+            price = level.price
+            slot = level.head
+            while slot is not None:
+                trade_volume = int(volumes[slot])
+                volumes[slot] = 0
+                order.volume -= trade_volume
+                resting_id = int(order_ids[slot])
+
+                if trade_buffer is not None:
+                    resting = views.get(slot)
+                    if resting is not None:
+                        resting.volume = 0
+                    trade_buffer.append(
+                        order.id if is_bid else resting_id,
+                        resting_id if is_bid else order.id,
+                        price,
+                        trade_volume,
+                        is_bid,
+                    )
+                else:
+                    resting = self._view(slot)
+                    resting.volume = 0
+                    bid = order if is_bid else resting
+                    ask = resting if is_bid else order
+                    if notifier is not None:
+                        notifier.add(bid, ask, price, trade_volume)
+                    else:
+                        trades.append(Trade(bid, ask, price, trade_volume))
+
+                next_slot = int(next_slots[slot])
+                self._release(slot, resting_id)
+                slot = None if next_slot == NO_SLOT else next_slot
+
+            level.head = level.tail = None
+            level.num_orders = 0
+            level.volume = 0
+            if self.feed is not None:
+                self._publish_level(level)
+            if self.depth_index is not None:
+                self.depth_index.set(level.price, level.volume)
+            self._top_valid = False
+            self._drop_level(best_price, level)
+            best_price = self.get_best_price()
+
+        return trades
+
+    def _publish_executions(self, level, volume):
+        feed = self.feed
+        store = self.store
+        is_bid_side = self.is_bid_side
+        price = level.price
+        for slot in level:
+            if volume <= 0:
+                break
+            executed = min(int(store.volume[slot]), volume)
+            feed.publish(
+                DeltaFeed.ORDER_EXECUTED,
+                is_bid_side,
+                int(store.order_id[slot]),
+                price,
+                executed,
+            )
+            volume -= executed
+
+    def export_orders(self):
+        """
+        Get every resting order as columns gathered from the store, in
+        price-time priority order (see ``PriceBook.export_orders``).
+        """
+        store = self.store
+        slots = np.array(
+            [slot for level in self.top_levels(len(self.order_map)) for slot in level],
+            dtype=np.int64,
+        )
+        return {
+            "order_id": store.order_id[slots],
+            "price": store.price[slots],
+            "volume": store.volume[slots],
+            "trader_id": store.trader_id[slots],
+            "lifetime": store.lifetime[slots],
+            **self._export_traders(),
+        }
+
+    def load_orders(self, columns):
+        """
+        Replace the book's contents with orders exported by ``export_orders``.
+
+        The columns are written into freshly allocated store slots and the
+        queue links set with array operations; only level objects and the
+        order and trader indexes are built per element. A subscribed feed
+        receives the clear followed by every loaded order and level.
+
+        Parameters
+        ----------
+        columns : mapping of numpy.ndarray
+            Columns as returned by ``export_orders``.
+        """
+        self.clear()
+        store = self.store
+        order_ids = np.asarray(columns["order_id"], dtype=np.int64)
+        n = len(order_ids)
+        if n:
+            prices = np.asarray(columns["price"], dtype=np.int64)
+            volumes = np.asarray(columns["volume"], dtype=np.int64)
+            slots = store.alloc_many(n)
+            store.order_id[slots] = order_ids
+            store.price[slots] = prices
+            store.volume[slots] = volumes
+            store.trader_id[slots] = columns["trader_id"]
+            store.lifetime[slots] = columns["lifetime"]
+            store.is_bid[slots] = self.is_bid_side
+            store.live[slots] = True
+
+            # Consecutive orders at one price form a level's queue.
+            starts = np.flatnonzero(np.r_[True, prices[1:] != prices[:-1]])
+            ends = np.r_[starts[1:], n] - 1
+            prev = np.r_[NO_SLOT, slots[:-1]]
+            prev[starts] = NO_SLOT
+            next_ = np.r_[slots[1:], NO_SLOT]
+            next_[ends] = NO_SLOT
+            store.prev[slots] = prev
+            store.next[slots] = next_
+
+            for start, end, volume in zip(
+                starts.tolist(), ends.tolist(), np.add.reduceat(volumes, starts).tolist()
+            ):
+                level = self._new_level(int(prices[start]))
+                level.head = int(slots[start])
+                level.tail = int(slots[end])
+                level.num_orders = end - start + 1
+                level.volume = volume
+            self.order_map.update(zip(order_ids.tolist(), slots.tolist()))
+
+        self._index_traders(columns)
+        self._top_valid = False
+        if self.depth_index is not None:
+            self._load_depth_index()
+        if self.feed is not None:
+            self._publish_loaded(columns)
+
+    def get_depth(self):
+        """
+        Get depth, the total volume across all price levels.
+
+        O(1) with a depth index, otherwise a single reduction over the
+        store's volume column.
+
+        Returns
+        -------
+        int
+            Sum of remaining volume on this side.
+        """
+        if self.depth_index is not None:
+            return self.depth_index.total
+        return self.store.depth(self.is_bid_side)
+
+    def clear(self):
+        """
+        Clears the PriceBook and releases this side's store slots.
+        """
+        super().clear()
+        self._views.clear()
+        self.store.clear(is_bid=self.is_bid_side)
@@ -12,7 +12,12 @@ import matplotlib.pyplot as plt
 
 
 def simulate_path_with_tracking(
-    price_volatility, informed_frac, skew_coefficient, timesteps=1000, rng=None
+    price_volatility,
+    informed_frac,
+    skew_coefficient,
+    timesteps=1000,
+    rng=None,
+    tick_size=None,
 ):
 
     if rng == None:
@@ -20,7 +25,10 @@ def simulate_path_with_tracking(
 
     # Initialise agents and asset
     a = Asset(sigma=price_volatility)
-    ob = OrderBook()
+    ob = OrderBook(tick_size=tick_size)
+    # Only the market maker's (trader 1) notifications are read.
+    ob.unsubscribe_all()
+    ob.subscribe(1)
     strat = SkewMarketMakingStrategy(0.1, 1000, skew_coefficient)
     mm = MarketMaker(strat, initial_capital=1_000_000)
     it = InformedTraders(informed_frac, 25, 10)
@@ -80,11 +88,19 @@ def simulate_path_with_tracking(
 
 
 def simulate_path(
-    price_volatility, informed_frac, skew_coefficient, timesteps=1000, rng=None
+    price_volatility,
+    informed_frac,
+    skew_coefficient,
+    timesteps=1000,
+    rng=None,
+    tick_size=None,
 ):
     """
     Simluate a trajectory and return its summary statistics.
 
+    If ``tick_size`` is given the order book runs in integer-tick mode and
+    market maker quotes are quantized to that grid.
+
     Returns
     -------
     summary_stats: dict
@@ -101,7 +117,10 @@ def simulate_path(
 
     # Initialise agents and asset
     a = Asset(sigma=price_volatility)
-    ob = OrderBook()
+    ob = OrderBook(tick_size=tick_size)
+    # Only the market maker's (trader 1) notifications are read.
+    ob.unsubscribe_all()
+    ob.subscribe(1)
     strat = SkewMarketMakingStrategy(0.1, 1000, skew_coefficient)
     mm = MarketMaker(strat, initial_capital=1_000_000)
     it = InformedTraders(informed_frac, 25, 10)
@@ -0,0 +1,25 @@
+import pytest
+
+# OrderBook keyword arguments for each price level backend.
+BOOK_BACKENDS = {
+    "heap": {},
+    "tick": {"tick_size": 0.01},
+    "ladder": {"tick_size": 0.01, "ladder_width": 64},
+    "store": {"tick_size": 0.01, "order_store": True},
+}
+
+
+@pytest.fixture(params=list(BOOK_BACKENDS))
+def book_kwargs(request):
+    """
+    OrderBook keyword arguments, once per price level backend.
+    """
+    return dict(BOOK_BACKENDS[request.param])
+
+
+@pytest.fixture(params=[False, True], ids=["sparse_ids", "dense_ids"])
+def dense_ids(request):
+    """
+    Whether the book assigns dense order IDs.
+    """
+    return request.param
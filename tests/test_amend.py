@@ -0,0 +1,63 @@
+import pytest
+
+from lob.core import MarketOrder, Order, TradeBuffer
+from lob.orderbook import OrderBook
+
+
+def queue_ids(book, volume):
+    buffer = TradeBuffer()
+    book.process_orders_buffered([MarketOrder(volume, False)], buffer)
+    return buffer.bid_order_id.tolist()
+
+
+def test_size_reduction_keeps_priority(book_kwargs, dense_ids):
+    book = OrderBook(dense_ids=dense_ids, **book_kwargs)
+    orders = [Order(100.0, 5, True), Order(100.0, 5, True)]
+    book.process_orders(orders)
+    assert book.amend(orders[0].id, new_volume=2) == {}
+    assert book.get_bid_depth() == 7
+    assert queue_ids(book, 3) == [orders[0].id, orders[1].id]
+
+
+def test_size_increase_and_price_change_lose_priority(book_kwargs, dense_ids):
+    book = OrderBook(dense_ids=dense_ids, **book_kwargs)
+    orders = [Order(100.0, 5, True), Order(100.0, 5, True), Order(100.0, 5, True)]
+    book.process_orders(orders)
+    book.amend(orders[0].id, new_volume=6)
+    book.amend(orders[1].id, new_price=99.0)
+    book.amend(orders[1].id, new_price=100.0)
+    assert queue_ids(book, 16) == [orders[2].id, orders[0].id, orders[1].id]
+
+
+def test_crossing_amend_trades_and_keeps_id(book_kwargs, dense_ids):
+    book = OrderBook(dense_ids=dense_ids, **book_kwargs)
+    ask, bid = Order(101.0, 3, False, trader_id=1), Order(100.0, 5, True, trader_id=2)
+    book.process_orders([ask, bid])
+    notifications = book.amend(bid.id, new_price=101.0)
+    [notif] = notifications[2]
+    assert (notif.order_id, notif.total_filled_volume, notif.remaining_volume) == (bid.id, 3, 2)
+    assert book.unfilled_orders(2) == [(bid.id, 101.0, 2)]
+    assert book.trade_history[-1] == [3, 303.0]
+
+
+def test_amend_keeps_expiry():
+    book = OrderBook(use_scheduler=True, tick_size=0.01)
+    order = Order(100.0, 5, True, lifetime=3)
+    book.process_orders([order])
+    book.advance()
+    book.amend(order.id, new_price=99.0)
+    book.advance()
+    assert book.get_best_bid() == 99.0
+    book.advance()
+    assert book.get_best_bid() is None
+
+
+def test_invalid_amends_raise(book_kwargs, dense_ids):
+    book = OrderBook(dense_ids=dense_ids, **book_kwargs)
+    order = Order(100.0, 5, True)
+    book.process_orders([order])
+    with pytest.raises(ValueError):
+        book.amend(order.id + 1000, new_volume=1)
+    with pytest.raises(ValueError):
+        book.amend(order.id, new_volume=0)
+    assert book.get_bid_depth() == 5
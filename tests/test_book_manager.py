@@ -0,0 +1,77 @@
+import numpy as np
+import pytest
+
+from lob.core import MarketOrder, Order
+from lob.orderbook import BookManager
+
+SYMBOLS = ["A", "B", "C"]
+
+
+def make_flow(seed):
+    rng = np.random.default_rng(seed)
+    flow = []
+    resting = []
+    for _ in range(300):
+        symbol = SYMBOLS[rng.integers(len(SYMBOLS))]
+        bid = bool(rng.random() < 0.5)
+        if resting and rng.random() < 0.2:
+            flow.append(("cancel", resting.pop(rng.integers(len(resting)))))
+        elif rng.random() < 0.05:
+            flow.append(("order", (symbol, MarketOrder(int(rng.integers(1, 9)), bid))))
+        else:
+            price = round(100 + rng.normal(0, 0.05) + (-0.02 if bid else 0.02), 2)
+            order = Order(price, int(rng.integers(1, 9)), bid, False, 1)
+            flow.append(("order", (symbol, order)))
+            resting.append((symbol, order.id))
+    return flow
+
+
+def flush_all(manager, flows):
+    results = []
+    for flow in flows:
+        for kind, args in flow:
+            (manager.submit if kind == "order" else manager.submit_cancel)(*args)
+        results.append(manager.flush())
+    for symbol in SYMBOLS:
+        depth = manager.l2_snapshot(symbol, 10)
+        results.append({symbol: {
+            f"{side}_{key}": column
+            for side in ("bids", "asks")
+            for key, column in depth[side].items()
+        }})
+    return results
+
+
+def same_results(left, right):
+    assert len(left) == len(right)
+    for a, b in zip(left, right):
+        assert a.keys() == b.keys()
+        for symbol in a:
+            for key in a[symbol]:
+                np.testing.assert_array_equal(a[symbol][key], b[symbol][key])
+
+
+def test_workers_match_in_process_books():
+    flows = [make_flow(seed) for seed in range(3)]
+    expected = flush_all(BookManager(SYMBOLS, tick_size=0.01), flows)
+    with BookManager(SYMBOLS, workers=2, batch_capacity=64, tick_size=0.01) as manager:
+        actual = flush_all(manager, flows)
+    same_results(expected, actual)
+
+
+def test_worker_error_leaves_other_workers_in_sync():
+    with BookManager(["A", "B"], workers=2, tick_size=0.01) as manager:
+        manager.submit("A", Order(float("nan"), 1, True))
+        manager.submit("B", Order(100.0, 5, True))
+        with pytest.raises(ValueError):
+            manager.flush()
+
+        manager.submit("B", Order(100.0, 2, False))
+        result = manager.flush()
+        assert result["B"]["trade_volume"].tolist() == [2]
+        assert manager.l2_snapshot("B", 1)["bids"]["volume"].tolist() == [3]
+
+
+def test_dense_ids_are_rejected():
+    with pytest.raises(ValueError):
+        BookManager(SYMBOLS, tick_size=0.01, dense_ids=True)
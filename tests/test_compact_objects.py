@@ -0,0 +1,41 @@
+import pytest
+
+from lob.core import MarketOrder, Order, Trade, TradesNotification
+
+
+@pytest.mark.parametrize(
+    "make",
+    [
+        lambda: Order(100.0, 5, True),
+        lambda: MarketOrder(5, False),
+        lambda: Trade(Order(100.0, 5, True), Order(100.0, 5, False), 100.0, 5),
+        lambda: TradesNotification(Order(100.0, 5, True)),
+    ],
+)
+def test_objects_have_no_instance_dict(make):
+    obj = make()
+    assert not hasattr(obj, "__dict__")
+    with pytest.raises(AttributeError):
+        obj.unexpected = 1
+
+
+def test_order_ids_count_up_and_market_prices_are_infinite():
+    first, second = Order(100.0, 1, True), MarketOrder(1, True)
+    assert second.id == first.id + 1
+    assert second.price == float("inf") and second.is_market
+    assert MarketOrder(1, False).price == -float("inf")
+    assert first._prev is None and first._next is None
+
+
+def test_notification_aggregates_fills():
+    order = Order(100.0, 10, True, trader_id=3)
+    notification = TradesNotification(order)
+    assert notification.average_price == 0
+    notification.add_fill(100.0, 2).add_fill(101.0, 2)
+    notification.add_trade(Trade(order, Order(100.0, 1, False), 100.0, 1))
+    assert notification.num_trades == 3
+    assert notification.total_filled_volume == 5
+    assert notification.price_volume == {100.0: 3, 101.0: 2}
+    assert notification.average_price == pytest.approx(100.4)
+    assert (notification.trader_id, notification.order_id) == (3, order.id)
+    assert "PARTIAL" in repr(notification)
@@ -0,0 +1,138 @@
+import numpy as np
+import pytest
+
+from lob.core import MarketOrder, Order
+from lob.orderbook import DeltaFeed, OrderBook
+
+
+class Mirror:
+    """Rebuild a book at level 2 and level 3 from feed events."""
+
+    def __init__(self):
+        self.orders = {}
+        self.levels = {}
+
+    def apply(self, events):
+        for kind, is_bid, order_id, price, volume in zip(
+            events["kind"], events["is_bid"], events["order_id"],
+            events["price"], events["volume"],
+        ):
+            key = (bool(is_bid), float(price))
+            if kind == DeltaFeed.ORDER_ADDED:
+                self.orders[order_id] = [key, volume]
+            elif kind in (DeltaFeed.ORDER_CANCELLED, DeltaFeed.ORDER_EXECUTED):
+                self.orders[order_id][1] -= volume
+                if not self.orders[order_id][1]:
+                    del self.orders[order_id]
+            elif kind in (DeltaFeed.LEVEL_ADDED, DeltaFeed.LEVEL_CHANGED):
+                self.levels[key] = volume
+            elif kind == DeltaFeed.LEVEL_REMOVED:
+                del self.levels[key]
+            elif kind == DeltaFeed.BOOK_CLEARED:
+                self.orders = {k: v for k, v in self.orders.items() if v[0][0] != is_bid}
+                self.levels = {k: v for k, v in self.levels.items() if k[0] != is_bid}
+
+
+def book_state(book):
+    orders, levels = {}, {}
+    for is_bid, side in ((True, book.bids), (False, book.asks)):
+        for order_id in side.order_map:
+            order = side.get_order(order_id)
+            key = (is_bid, float(order.price))
+            orders[order_id] = [key, order.volume]
+            levels[key] = levels.get(key, 0) + order.volume
+    return orders, levels
+
+
+def random_flow(book, rng, steps):
+    resting = []
+    for _ in range(steps):
+        action = rng.random()
+        if action < 0.6:
+            order = Order(
+                round(100 + rng.integers(-10, 11) * 0.01, 2),
+                int(rng.integers(1, 20)),
+                bool(rng.random() < 0.5),
+                trader_id=int(rng.integers(0, 5)),
+                lifetime=int(rng.integers(1, 6)) if book.use_scheduler else None,
+            )
+            book.process_orders([order])
+            resting.append(order.id)
+        elif action < 0.7:
+            book.process_orders([MarketOrder(int(rng.integers(1, 30)), bool(rng.random() < 0.5))])
+        elif action < 0.85 and resting:
+            book.process_cancellations([resting[int(rng.integers(len(resting)))]])
+        elif action < 0.95 and resting:
+            order_id = resting[int(rng.integers(len(resting)))]
+            try:
+                if rng.random() < 0.5:
+                    book.amend(order_id, new_volume=int(rng.integers(1, 20)))
+                else:
+                    book.amend(order_id, new_price=round(100 + rng.integers(-10, 11) * 0.01, 2))
+            except ValueError:
+                pass
+        elif book.use_scheduler:
+            book.advance()
+
+
+@pytest.mark.parametrize("use_scheduler", [False, True])
+def test_mirror_matches_book(book_kwargs, use_scheduler):
+    book = OrderBook(use_scheduler=use_scheduler, **book_kwargs)
+    feed = book.subscribe_feed()
+    mirror = Mirror()
+    rng = np.random.default_rng(7)
+    for _ in range(20):
+        random_flow(book, rng, 50)
+        mirror.apply(feed.drain())
+        assert (mirror.orders, mirror.levels) == book_state(book)
+    assert mirror.orders and feed.dropped == 0
+
+
+def test_restore_is_published(book_kwargs):
+    source = OrderBook(**book_kwargs)
+    random_flow(source, np.random.default_rng(3), 200)
+    book = OrderBook(**book_kwargs)
+    feed = book.subscribe_feed()
+    random_flow(book, np.random.default_rng(4), 200)
+    mirror = Mirror()
+    mirror.apply(feed.drain())
+
+    book.restore(source.snapshot())
+    mirror.apply(feed.drain())
+    assert mirror.orders and (mirror.orders, mirror.levels) == book_state(book)
+
+
+def test_clear_is_published():
+    book = OrderBook(tick_size=0.01)
+    feed = book.subscribe_feed()
+    book.process_orders([Order(100.0, 5, True), Order(101.0, 5, False)])
+    book.clear()
+    mirror = Mirror()
+    mirror.apply(feed.drain())
+    assert mirror.orders == {} and mirror.levels == {}
+
+
+def test_drain_limit_and_overflow():
+    feed = DeltaFeed(capacity=3)
+    assert feed.capacity == 4
+    for i in range(6):
+        feed.publish(DeltaFeed.ORDER_ADDED, True, i, 100, 1)
+    assert (len(feed), feed.dropped) == (4, 2)
+    first = feed.drain(max_events=3)
+    assert first["seq"].tolist() == [2, 3, 4]
+    assert first["order_id"].tolist() == [2, 3, 4]
+    assert feed.drain()["seq"].tolist() == [5]
+    assert len(feed.drain()["seq"]) == 0
+
+
+def test_unsubscribe_stops_publishing():
+    book = OrderBook()
+    feed = book.subscribe_feed()
+    book.unsubscribe_feed()
+    book.process_orders([Order(100.0, 5, True)])
+    assert len(feed) == 0
+
+
+def test_capacity_must_be_positive():
+    with pytest.raises(ValueError):
+        DeltaFeed(0)
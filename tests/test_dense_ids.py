@@ -0,0 +1,69 @@
+import pytest
+
+from lob.core import Order
+from lob.orderbook import IdAllocator, JournalReader, MessageReader, OrderBook
+from lob.orderbook import generate_messages
+
+
+def test_released_ids_are_reused_from_the_next_batch():
+    allocator = IdAllocator()
+    assert [allocator.allocate() for _ in range(3)] == [0, 1, 2]
+    allocator.release(1)
+    assert allocator.allocate() == 3
+    assert len(allocator) == 3
+    allocator.recycle()
+    assert allocator.allocate() == 1
+    assert allocator.next_id == 4
+
+
+def test_claim_only_takes_ids_awaiting_reuse():
+    allocator = IdAllocator()
+    order_id = allocator.allocate()
+    allocator.release(order_id)
+    allocator.claim(order_id)
+    assert len(allocator) == 1
+    with pytest.raises(ValueError):
+        allocator.claim(order_id)
+
+
+def test_rebuild_and_state_round_trip():
+    allocator = IdAllocator()
+    allocator.rebuild([0, 3, 5])
+    assert allocator.next_id == 6
+    assert len(allocator) == 3
+    restored = IdAllocator()
+    restored.load_state(allocator.state())
+    assert sorted(restored.allocate() for _ in range(3)) == [1, 2, 4]
+    assert restored.allocate() == 6
+
+
+def test_book_recycles_ids_at_batch_start():
+    book = OrderBook(tick_size=0.01, dense_ids=True)
+    resting = [Order(99.0, 5, True), Order(98.0, 5, True)]
+    book.process_orders(resting)
+    assert [order.id for order in resting] == [0, 1]
+
+    # The taker fills order 0; neither ID is reissued within this batch.
+    taker, late = Order(99.0, 5, False), Order(97.0, 1, True)
+    book.process_orders([taker, late])
+    assert (taker.id, late.id) == (2, 3)
+
+    reused = [Order(96.0, 1, True), Order(95.0, 1, True), Order(94.0, 1, True)]
+    book.process_orders(reused)
+    assert sorted(order.id for order in reused) == [0, 2, 4]
+    assert book.bids.get_order(1).volume == 5
+
+
+def test_replays_reject_dense_ids(tmp_path):
+    messages = tmp_path / "messages.bin"
+    generate_messages(messages, 100)
+    with pytest.raises(ValueError):
+        MessageReader(messages).replay(OrderBook(tick_size=0.01, dense_ids=True))
+
+    journal = tmp_path / "journal.bin"
+    book = OrderBook(tick_size=0.01)
+    book.open_journal(journal)
+    book.process_orders([Order(99.0, 5, True)])
+    book.close_journal()
+    with pytest.raises(ValueError):
+        JournalReader(journal).replay(OrderBook(tick_size=0.01, dense_ids=True))
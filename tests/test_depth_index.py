@@ -0,0 +1,98 @@
+import random
+
+import pytest
+
+from lob.core import Order
+from lob.orderbook import DepthIndex, OrderBook
+
+
+def brute_through(levels, is_bid, tick):
+    return sum(
+        volume
+        for other, volume in levels.items()
+        if (other >= tick if is_bid else other <= tick)
+    )
+
+
+def brute_sweep(levels, is_bid, volume):
+    if volume > sum(levels.values()):
+        return None
+    notional = 0
+    for tick in sorted(levels, reverse=is_bid):
+        take = min(volume, levels[tick])
+        notional += take * tick
+        volume -= take
+        if not volume:
+            return tick, notional
+
+
+@pytest.mark.parametrize("is_bid", [True, False])
+def test_matches_brute_force_across_rebases(is_bid):
+    rng = random.Random(7)
+    index = DepthIndex(is_bid, width=8)
+    levels = {}
+    for _ in range(2000):
+        tick = rng.choice([rng.randint(90, 110), rng.randint(-500, 500)])
+        volume = rng.choice([0, 0, rng.randint(1, 9)])
+        index.set(tick, volume)
+        if volume:
+            levels[tick] = volume
+        else:
+            levels.pop(tick, None)
+
+        assert index.total == sum(levels.values())
+        probe = rng.randint(-600, 600)
+        assert index.volume_through(probe) == brute_through(levels, is_bid, probe)
+        wanted = rng.randint(1, index.total + 5)
+        assert index.sweep(wanted) == brute_sweep(levels, is_bid, wanted)
+        assert len(index._volume) == index.width == 8
+        assert index._outside_keys == sorted(index._outside)
+
+
+def test_far_order_keeps_window_width():
+    book = OrderBook(tick_size=0.01, depth_index=True)
+    book.process_orders([Order(100.0, 5, True), Order(100000.0, 7, True)])
+    index = book.bids.depth_index
+    assert index.width == 4096
+    assert len(index._volume) == 4096
+    assert book.fillable_volume(False, 100.0) == 12
+    assert book.fillable_volume(False, 50000.0) == 7
+    assert book.sweep_price(False, 8) == 100.0
+    assert book.sweep_vwap(False, 12) == pytest.approx((7 * 100000 + 5 * 100) / 12)
+
+
+def test_window_follows_touch_when_it_empties():
+    index = DepthIndex(False, width=8)
+    index.set(10, 3)
+    index.set(1000, 4)
+    index.set(10, 0)
+    assert index.base <= 1000 < index.base + index.width
+    assert index.sweep(4) == (1000, 4000)
+
+
+def test_sweep_with_insufficient_volume():
+    index = DepthIndex(True, width=8)
+    assert index.sweep(1) is None
+    index.set(100, 5)
+    index.set(-100, 5)
+    assert index.sweep(10) == (-100, 0)
+    assert index.sweep(11) is None
+
+
+def test_load_and_clear():
+    index = DepthIndex(True, width=8)
+    index.load([105, 104, 50, 104], [1, 2, 3, 4])
+    levels = {105: 1, 104: 6, 50: 3}
+    assert index.total == 10
+    for tick in (110, 105, 104, 60, 50, 0):
+        assert index.volume_through(tick) == brute_through(levels, True, tick)
+    assert index.sweep(10) == brute_sweep(levels, True, 10)
+    index.clear()
+    assert index.total == 0
+    assert index.volume_through(0) == 0
+    assert index.sweep(1) is None
+
+
+def test_width_must_be_positive():
+    with pytest.raises(ValueError):
+        DepthIndex(True, width=0)
@@ -0,0 +1,133 @@
+import numpy as np
+import pytest
+
+from lob.core import MarketOrder, Order
+from lob.orderbook import ExpirationWheel, OrderBook
+
+
+def run_until_empty(wheel, steps):
+    expired = {}
+    for _ in range(steps):
+        for order_id in wheel.advance():
+            expired[order_id] = wheel.now
+    return expired
+
+
+@pytest.mark.parametrize("lifetime", [1, 3, 7, 8, 9, 63, 64, 65, 511, 513, 5000])
+def test_orders_expire_exactly_after_their_lifetime(lifetime):
+    wheel = ExpirationWheel(3, wheel_size=8)
+    for _ in range(5):
+        wheel.advance()
+    order = Order(100.0, 1, True, lifetime=lifetime)
+    wheel.schedule(order)
+    assert run_until_empty(wheel, lifetime + 10) == {order.id: 5 + lifetime}
+
+
+def test_default_and_non_positive_lifetimes():
+    wheel = ExpirationWheel(4, wheel_size=8)
+    default, immediate = Order(100.0, 1, True), Order(100.0, 1, True, lifetime=0)
+    wheel.schedule(default)
+    wheel.schedule(immediate)
+    assert run_until_empty(wheel, 10) == {immediate.id: 1, default.id: 4}
+
+
+def test_detach_and_attach():
+    wheel = ExpirationWheel(3, wheel_size=8)
+    orders = [Order(100.0, 1, True, lifetime=20 + i) for i in range(3)]
+    for order in orders:
+        wheel.schedule(order)
+    assert wheel.detach(orders[1].id) == 21
+    assert wheel.detach(orders[1].id) is None
+    wheel.attach(orders[1].id, 30)
+    wheel.attach(orders[2].id, wheel.detach(orders[2].id) - 100)
+    expired = run_until_empty(wheel, 40)
+    assert expired == {orders[2].id: 1, orders[0].id: 20, orders[1].id: 30}
+
+
+def test_state_round_trip():
+    wheel = ExpirationWheel(3, max_lifetime=100, wheel_size=8)
+    for _ in range(13):
+        wheel.advance()
+    orders = [Order(100.0, 1, True, lifetime=lifetime) for lifetime in (2, 9, 70, 600)]
+    for order in orders:
+        wheel.schedule(order)
+    wheel.detach(orders[1].id)
+
+    restored = ExpirationWheel(1, wheel_size=8)
+    restored.load_state(wheel.state())
+    assert (restored.min_lifetime, restored.max_lifetime, restored.now) == (3, 100, 13)
+    assert run_until_empty(restored, 700) == run_until_empty(wheel, 700)
+
+
+def test_reset_and_wheel_size_validation():
+    wheel = ExpirationWheel(3, wheel_size=8)
+    wheel.schedule(Order(100.0, 1, True, lifetime=500))
+    wheel.reset()
+    assert wheel.now == 0
+    assert run_until_empty(wheel, 600) == {}
+    with pytest.raises(ValueError):
+        ExpirationWheel(3, wheel_size=6)
+
+
+def resting_ids(book):
+    return set(book.bids.export_orders()["order_id"].tolist()) | set(
+        book.asks.export_orders()["order_id"].tolist()
+    )
+
+
+def test_book_detaches_entries_of_filled_and_cancelled_orders(book_kwargs, dense_ids):
+    book = OrderBook(use_scheduler=True, dense_ids=dense_ids, **book_kwargs)
+    wheel = book.expiration_wheel
+    expired = []
+    advance = wheel.advance
+
+    def recording_advance():
+        ids = advance()
+        expired.append((ids, resting_ids(book)))
+        return ids
+
+    wheel.advance = recording_advance
+    rng = np.random.default_rng(11)
+    for _ in range(400):
+        action = rng.random()
+        if action < 0.6:
+            book.process_orders(
+                [
+                    Order(
+                        round(100 + rng.integers(-5, 6) * 0.01, 2),
+                        int(rng.integers(1, 10)),
+                        bool(rng.random() < 0.5),
+                        trader_id=int(rng.integers(0, 3)),
+                        lifetime=int(rng.integers(1, 40)),
+                    )
+                ]
+            )
+        elif action < 0.7:
+            book.process_orders([MarketOrder(int(rng.integers(1, 20)), bool(rng.random() < 0.5))])
+        elif action < 0.8 and resting_ids(book):
+            book.process_cancellations([min(resting_ids(book))])
+        elif action < 0.85:
+            book.cancel_trader_orders(int(rng.integers(0, 3)))
+        else:
+            book.advance()
+        assert set(wheel._buckets) == resting_ids(book)
+    for ids, live in expired:
+        assert set(ids) <= live
+
+
+def test_filled_order_costs_nothing_at_expiry():
+    book = OrderBook(use_scheduler=True, tick_size=0.01)
+    bid = Order(100.0, 5, True, lifetime=2)
+    book.process_orders([bid])
+    book.process_orders([MarketOrder(5, False)])
+    assert book.expiration_wheel._buckets == {}
+    assert all(not bucket for level in book.expiration_wheel.levels for bucket in level)
+    book.advance()
+    assert book.expiration_wheel.advance() == []
+
+
+def test_clear_drops_every_entry():
+    book = OrderBook(use_scheduler=True, tick_size=0.01)
+    book.process_orders([Order(100.0, 5, True, lifetime=3), Order(101.0, 5, False, lifetime=300)])
+    book.clear()
+    assert book.expiration_wheel._buckets == {}
@@ -0,0 +1,74 @@
+import random
+
+import pytest
+
+from lob.core import MarketOrder, Order, TradesNotification
+from lob.orderbook import OrderBook
+
+
+def fold(trades, to_price):
+    """
+    Build notifications from a list of trades, the pre-fusion way.
+    """
+    notifs = {}
+    for trade in trades:
+        for order in (trade.bid_order, trade.ask_order):
+            if order.trader_id is None:
+                continue
+            notif = notifs.get(order.id)
+            if notif is None:
+                notif = notifs[order.id] = TradesNotification(order)
+            notif.add_fill(to_price(trade.price), trade.volume)
+    result = {}
+    for order_id, notif in notifs.items():
+        result.setdefault(notif.trader_id, []).append(
+            (order_id, notif.num_trades, notif.total_filled_volume, round(notif.average_price, 6))
+        )
+    return {trader_id: sorted(rows) for trader_id, rows in result.items()}
+
+
+def test_fused_notifications_match_folded_trades(book_kwargs):
+    rng = random.Random(12)
+    fused, listed = OrderBook(**book_kwargs), OrderBook(**book_kwargs)
+    for _ in range(300):
+        specs = [
+            (round(100 + rng.randint(-8, 8) * 0.01, 2), rng.randint(1, 9), rng.random() < 0.5, rng.choice([1, 2, None]))
+            for _ in range(3)
+        ]
+        market = (rng.randint(1, 15), rng.random() < 0.5, rng.choice([1, 2]))
+        start = Order._id_counter
+        notifications = fused.process_orders(
+            [Order(p, v, b, trader_id=t) for p, v, b, t in specs] + [MarketOrder(*market)]
+        )
+        Order._id_counter = start
+        orders = [Order(p, v, b, trader_id=t) for p, v, b, t in specs] + [MarketOrder(*market)]
+        trades = listed._match_orders(orders)
+
+        expected = fold(trades, listed.bids.to_price)
+        actual = {
+            trader_id: sorted(
+                (n.order_id, n.num_trades, n.total_filled_volume, round(n.average_price, 6))
+                for n in notifs
+            )
+            for trader_id, notifs in notifications.items()
+        }
+        assert actual == expected
+        if trades:
+            prices = [listed.bids.to_price(trade.price) for trade in trades]
+            assert fused.trade_history[-1][0] == sum(trade.volume for trade in trades)
+            assert fused.trade_history[-1][1] == pytest.approx(
+                sum(price * trade.volume for price, trade in zip(prices, trades))
+            )
+
+
+def test_remaining_volume_is_end_of_batch_volume():
+    book = OrderBook()
+    maker = Order(100.0, 10, False, trader_id=1)
+    book.process_orders([maker])
+    notifications = book.process_orders(
+        [Order(100.0, 3, True, trader_id=2), Order(100.0, 4, True, trader_id=3)]
+    )
+    [maker_notif] = notifications[1]
+    assert (maker_notif.num_trades, maker_notif.remaining_volume) == (2, 3)
+    assert not maker_notif.is_filled
+    assert notifications[2][0].is_filled and notifications[3][0].remaining_volume == 0
@@ -0,0 +1,116 @@
+import asyncio
+import logging
+
+from lob.orderbook import GatewayClient, OrderBook, OrderGateway, run_load
+from lob.orderbook.gateway import ACCEPTED, ACK, FILL, REJECTED
+
+
+def serve(test, **book_kwargs):
+    async def main():
+        book = OrderBook(**book_kwargs)
+        gateway = OrderGateway(book)
+        host, port = await gateway.start_tcp()
+        try:
+            await test(book, gateway, lambda: GatewayClient.connect_tcp(host, port))
+        finally:
+            await gateway.close()
+
+    asyncio.run(main())
+
+
+def test_orders_cancels_and_fills_round_trip():
+    async def test(book, gateway, connect):
+        maker, taker = await connect(), await connect()
+        maker.send_order(100.0, 10, True)
+        [(kind, status, seq, order_id)] = await maker.receive()
+        assert (kind, status, seq) == (ACK, ACCEPTED, 0)
+
+        # Another session cannot cancel the maker's order.
+        taker.send_cancel(order_id)
+        assert [reply[1] for reply in await taker.receive()] == [REJECTED]
+
+        taker.send_order(99.0, 4, False)
+        replies = await taker.receive()
+        assert [reply[0] for reply in replies] == [ACK, FILL]
+        fill = (await maker.receive())[0]
+        assert fill[0] == FILL and fill[2] == order_id
+        assert (fill[3], fill[5]) == (4, 6)
+
+        await taker.close()
+        await maker.close()
+        await asyncio.sleep(0.01)
+        # Sessions' resting orders are cancelled when they disconnect.
+        assert book.get_best_bid() is None
+
+    serve(test)
+
+
+def test_failed_batch_is_logged_and_rejects_unacknowledged_messages(caplog):
+    async def test(book, gateway, connect):
+        process_orders = book.process_orders
+        failing = []
+
+        def flaky(orders):
+            if failing:
+                failing.pop()
+                raise RuntimeError("boom")
+            return process_orders(orders)
+
+        book.process_orders = flaky
+        client = await connect()
+        client.send_order(100.0, 1, True)
+        [(_, _, _, order_id)] = await client.receive()
+
+        # The cancel is applied; matching the order then fails, so the order
+        # and the message queued behind it are rejected.
+        failing.append(True)
+        cancel = client.send_cancel(order_id)
+        order = client.send_order(101.0, 1, True)
+        amend = client.send_amend(order_id, volume=1)
+        replies = []
+        while len(replies) < 3:
+            replies += await asyncio.wait_for(client.receive(), 5)
+        assert replies == [
+            (ACK, ACCEPTED, cancel, order_id),
+            (ACK, REJECTED, order, -1),
+            (ACK, REJECTED, amend, order_id),
+        ]
+        assert gateway.failed_batches == 1
+        assert book.get_best_bid() is None
+
+        # Later batches still run.
+        client.send_order(101.0, 1, True)
+        [(kind, status, _, _)] = await client.receive()
+        assert (kind, status) == (ACK, ACCEPTED)
+        assert book.get_best_bid() == 101.0
+        await client.close()
+
+    with caplog.at_level(logging.ERROR, logger="lob.orderbook.gateway"):
+        serve(test)
+    assert "Failed to apply" in caplog.text
+
+
+def test_disconnected_sessions_are_closed():
+    async def test(book, gateway, connect):
+        client = await connect()
+        client.send_order(100.0, 1, True)
+        await client.receive()
+        [writer] = gateway._sessions.values()
+        await client.close()
+
+        async def closed():
+            while not writer.is_closing() or gateway._sessions:
+                await asyncio.sleep(0.001)
+
+        await asyncio.wait_for(closed(), 5)
+
+    serve(test)
+
+
+def test_run_load_reports_throughput():
+    async def test(book, gateway, connect):
+        stats = await run_load(connect, n_clients=2, messages_per_client=200)
+        assert stats["messages"] == 400
+        assert gateway.messages >= 400
+
+    serve(test, tick_size=0.01)
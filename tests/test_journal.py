@@ -0,0 +1,113 @@
+import random
+
+import numpy as np
+import pytest
+
+from lob.core import MarketOrder, Order
+from lob.orderbook import Journal, JournalReader, OrderBook
+from lob.orderbook.journal import ADD, CANCEL, EMPTY
+
+
+def drive(book, steps=600, seed=7):
+    rng = random.Random(seed)
+    ids = []
+    for step in range(steps):
+        orders = [
+            Order(
+                round(100 + rng.randint(-30, 30) * 0.05 + (-0.3 if bid else 0.3), 2),
+                rng.randint(1, 9),
+                bid,
+                trader_id=rng.choice([1, 2, None]),
+                lifetime=rng.choice([None, 3, 8]),
+            )
+            for bid in [rng.random() < 0.5 for _ in range(3)]
+        ]
+        ids += [order.id for order in orders]
+        if rng.random() < 0.2:
+            book.process_order_batch(
+                [order.price for order in orders],
+                [order.volume for order in orders],
+                [order.is_bid for order in orders],
+            )
+        else:
+            book.process_orders(orders)
+        if rng.random() < 0.3:
+            book.process_orders([MarketOrder(rng.randint(1, 80), rng.random() < 0.5, 2)])
+        if rng.random() < 0.1:
+            book.process_orders([])
+        book.process_cancellations(rng.sample(ids, min(len(ids), 2)))
+        unfilled = book.unfilled_orders(1)
+        if unfilled and rng.random() < 0.3:
+            order_id, price, volume = rng.choice(unfilled)
+            if rng.random() < 0.5:
+                book.amend(order_id, new_volume=max(1, volume - 2))
+            else:
+                book.amend(order_id, new_price=round(price + rng.choice([-0.1, 0.1]), 2))
+        if rng.random() < 0.2:
+            book.requote(2, [Order(99.0, 5, True), Order(101.0, rng.randint(1, 9), False)])
+        if step % 7 == 0:
+            book.advance()
+        if step == steps // 2:
+            book.clear()
+
+
+def test_replay_rebuilds_book_and_trade_history(tmp_path, book_kwargs):
+    path = tmp_path / "journal.bin"
+    book = OrderBook(use_scheduler=True, **book_kwargs)
+    book.open_journal(path)
+    drive(book)
+    book.close_journal()
+
+    replayed = OrderBook(**book_kwargs)
+    stats = JournalReader(path).replay(replayed)
+    assert stats["events"] == len(JournalReader(path))
+    for trader_id in (1, 2, None):
+        assert sorted(replayed.unfilled_orders(trader_id)) == sorted(
+            book.unfilled_orders(trader_id)
+        )
+    for side in ("bids", "asks"):
+        assert (
+            replayed.l2_snapshot(1000)[side]["volume"].tolist()
+            == book.l2_snapshot(1000)[side]["volume"].tolist()
+        )
+    assert len(replayed.trade_history) == len(book.trade_history)
+    np.testing.assert_allclose(replayed.trade_history, book.trade_history)
+
+
+def test_empty_batches_are_journaled(tmp_path):
+    path = tmp_path / "journal.bin"
+    book = OrderBook()
+    book.open_journal(path)
+    book.process_orders([])
+    order = Order(100.0, 1, True)
+    book.process_orders_buffered([order], book._batch_buffer)
+    book.process_order_batch([], [], [])
+    book.process_cancellations([order.id])
+    book.close_journal()
+
+    records = JournalReader(path).records
+    assert records["kind"].tolist() == [EMPTY, ADD, EMPTY, CANCEL]
+    assert records["batch"].tolist() == [0, 1, 2, 3]
+    replayed = OrderBook()
+    JournalReader(path).replay(replayed)
+    assert replayed.trade_history == book.trade_history == [[0, 0]] * 3
+
+
+def test_reopened_journal_continues_batch_numbers(tmp_path):
+    path = tmp_path / "journal.bin"
+    with Journal(path) as journal:
+        journal.next_batch()
+        journal.record(ADD, 1)
+    with Journal(path) as journal:
+        journal.next_batch()
+        journal.record(CANCEL, 1)
+    assert JournalReader(path).records["batch"].tolist() == [0, 1]
+
+
+def test_rejects_other_files(tmp_path):
+    path = tmp_path / "other.bin"
+    path.write_bytes(np.zeros(4, dtype=np.int64).tobytes())
+    with pytest.raises(ValueError):
+        JournalReader(path)
+    with pytest.raises(ValueError):
+        Journal(path)
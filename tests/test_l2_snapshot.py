@@ -0,0 +1,51 @@
+import numpy as np
+
+from lob.core import MarketOrder, Order
+from lob.orderbook import OrderBook
+
+
+def populated(book_kwargs):
+    book = OrderBook(**book_kwargs)
+    book.process_orders(
+        [
+            Order(99.0, 1, True),
+            Order(100.0, 2, True),
+            Order(100.0, 3, True),
+            Order(98.5, 4, True),
+            Order(101.0, 5, False),
+            Order(102.0, 6, False),
+            Order(101.0, 7, False),
+        ]
+    )
+    return book
+
+
+def test_levels_are_aggregated_best_first(book_kwargs):
+    snapshot = populated(book_kwargs).l2_snapshot()
+    np.testing.assert_allclose(snapshot["bids"]["price"], [100.0, 99.0, 98.5])
+    assert snapshot["bids"]["volume"].tolist() == [5, 1, 4]
+    assert snapshot["bids"]["order_count"].tolist() == [2, 1, 1]
+    np.testing.assert_allclose(snapshot["asks"]["price"], [101.0, 102.0])
+    assert snapshot["asks"]["volume"].tolist() == [12, 6]
+    assert snapshot["asks"]["order_count"].tolist() == [2, 1]
+
+
+def test_snapshot_is_limited_to_n_levels(book_kwargs):
+    snapshot = populated(book_kwargs).l2_snapshot(n_levels=2)
+    np.testing.assert_allclose(snapshot["bids"]["price"], [100.0, 99.0])
+    np.testing.assert_allclose(snapshot["asks"]["price"], [101.0, 102.0])
+    assert snapshot["bids"]["volume"].dtype == np.int64
+
+
+def test_emptied_levels_are_skipped(book_kwargs):
+    book = populated(book_kwargs)
+    book.process_orders([MarketOrder(5, False)])
+    snapshot = book.l2_snapshot()
+    np.testing.assert_allclose(snapshot["bids"]["price"], [99.0, 98.5])
+    assert book.level_counts()["bids"][0] == 2
+
+
+def test_empty_book(book_kwargs):
+    snapshot = OrderBook(**book_kwargs).l2_snapshot()
+    for name in ("bids", "asks"):
+        assert all(len(column) == 0 for column in snapshot[name].values())
@@ -0,0 +1,56 @@
+import random
+
+from lob.core import MarketOrder, Order
+from lob.orderbook import OrderBook, PriceBook
+
+
+def test_emptied_levels_are_counted_dead_then_revived():
+    side = PriceBook(True, compact_threshold=4)
+    orders = [Order(100 + i, 1, True) for i in range(3)]
+    for order in orders:
+        side.add(order)
+    side.cancel(orders[0])
+    assert side.level_counts() == (2, 1)
+    side.add(Order(100, 2, True))
+    assert side.level_counts() == (3, 0)
+
+
+def test_compaction_reclaims_dead_levels():
+    side = PriceBook(False, compact_threshold=4)
+    orders = [Order(100 + i, 1, False) for i in range(10)]
+    for order in orders:
+        side.add(order)
+    # Cancel the worst levels so none of them reach the top of the heap.
+    for order in orders[:0:-1]:
+        side.cancel(order)
+    live, dead = side.level_counts()
+    assert live == 1
+    assert dead <= 4
+    assert len(side._heap) == live + dead
+    assert side.get_best_price() == 100
+
+
+def test_sweep_pops_emptied_best_levels():
+    book = OrderBook()
+    book.process_orders([Order(100 + i, 1, False) for i in range(5)])
+    book.process_orders([MarketOrder(3, True)])
+    assert book.asks.level_counts() == (2, 0)
+    assert book.get_best_ask() == 103
+
+
+def test_heap_stays_bounded_under_churn():
+    rng = random.Random(2)
+    book = OrderBook()
+    resting = []
+    for _ in range(3000):
+        order = Order(100 + rng.randint(-500, 500), 1, True)
+        book.process_orders([order])
+        resting.append(order.id)
+        if len(resting) > 20:
+            book.process_cancellations([resting.pop(rng.randrange(len(resting)))])
+    live, dead = book.bids.level_counts()
+    assert live <= 21
+    assert len(book.bids._heap) == live + dead
+    assert dead <= max(book.bids.compact_threshold, live) + 1
+    best = max(price for _, price, _ in book.unfilled_orders(None))
+    assert book.get_best_bid() == best
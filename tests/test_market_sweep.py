@@ -0,0 +1,60 @@
+import random
+
+import pytest
+
+from lob.core import MarketOrder, Order, TradeBuffer
+from lob.orderbook import OrderBook
+
+
+def seed_book(book, rng, n=60):
+    orders = [
+        Order(round(100 + rng.randint(1, 20) * 0.01, 2), rng.randint(1, 9), False)
+        for _ in range(n)
+    ] + [
+        Order(round(100 - rng.randint(1, 20) * 0.01, 2), rng.randint(1, 9), True)
+        for _ in range(n)
+    ]
+    book.process_orders(orders)
+
+
+@pytest.mark.parametrize("is_bid", [True, False])
+def test_sweep_matches_an_aggressive_limit_order(book_kwargs, is_bid):
+    swept, limited = OrderBook(**book_kwargs), OrderBook(**book_kwargs)
+    start = Order._id_counter
+    seed_book(swept, random.Random(1))
+    Order._id_counter = start
+    seed_book(limited, random.Random(1))
+    depth = swept.get_ask_depth() if is_bid else swept.get_bid_depth()
+
+    for volume in (1, 7, depth // 3, depth // 2):
+        market_buffer, limit_buffer = TradeBuffer(), TradeBuffer()
+        swept.process_orders_buffered([MarketOrder(volume, is_bid)], market_buffer)
+        limit = Order(200.0 if is_bid else 1.0, volume, is_bid)
+        limited.process_orders_buffered([limit], limit_buffer)
+        for column in ("ask_order_id" if is_bid else "bid_order_id", "price", "volume"):
+            assert getattr(market_buffer, column).tolist() == getattr(limit_buffer, column).tolist()
+        assert swept.get_best_ask() == limited.get_best_ask()
+        assert swept.get_best_bid() == limited.get_best_bid()
+
+
+def test_sweep_past_the_book_does_not_rest(book_kwargs):
+    book = OrderBook(**book_kwargs)
+    book.process_orders([Order(100.0, 2, False), Order(100.01, 3, False)])
+    taker = MarketOrder(10, True, trader_id=1)
+    notifications = book.process_orders([taker])
+    [notif] = notifications[1]
+    assert (notif.total_filled_volume, notif.remaining_volume) == (5, 5)
+    assert book.get_best_ask() is None and book.get_best_bid() is None
+    assert book.asks.level_counts()[0] == 0
+    assert book.unfilled_orders(1) == []
+
+
+def test_sweep_fills_each_level_in_time_priority():
+    book = OrderBook()
+    first, second = Order(100.0, 2, False), Order(100.0, 2, False)
+    book.process_orders([first, second, Order(101.0, 2, False)])
+    buffer = TradeBuffer()
+    book.process_orders_buffered([MarketOrder(3, True)], buffer)
+    assert buffer.ask_order_id.tolist() == [first.id, second.id]
+    assert buffer.volume.tolist() == [2, 1]
+    assert book.asks.order_map[second.id].volume == 1
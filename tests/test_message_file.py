@@ -0,0 +1,128 @@
+import pytest
+
+from lob.orderbook import MessageReader, MessageWriter, OrderBook, generate_messages
+from lob.orderbook.message_file import ADD, CANCEL, DELETE, EXECUTE, REPLACE
+
+
+def expected_book(reader):
+    """Apply the messages to a plain dict of resting orders."""
+    orders = {}
+    for kind, is_bid, order_ref, new_ref, price, shares, _ in reader:
+        if kind == ADD:
+            orders[order_ref] = (is_bid, round(price, 2), shares)
+        elif kind in (CANCEL, EXECUTE):
+            side, tick, volume = orders[order_ref]
+            if shares < volume:
+                orders[order_ref] = (side, tick, volume - shares)
+            else:
+                del orders[order_ref]
+        elif kind == DELETE:
+            del orders[order_ref]
+        elif kind == REPLACE:
+            del orders[order_ref]
+            orders[new_ref] = (is_bid, round(price, 2), shares)
+    return orders
+
+
+def book_orders(book):
+    orders = {}
+    for is_bid, side in ((True, book.bids), (False, book.asks)):
+        columns = side.export_orders()
+        for order_id, price, volume in zip(
+            columns["order_id"].tolist(), columns["price"].tolist(), columns["volume"].tolist()
+        ):
+            orders[order_id] = (is_bid, round(side.to_price(price), 2), volume)
+    return orders
+
+
+def test_generated_file_replays_without_misses(tmp_path, book_kwargs):
+    path = str(tmp_path / "messages.bin")
+    assert generate_messages(path, 20_000, seed=5, target_orders=500) == 20_000
+    reader = MessageReader(path, chunk_size=4096)
+    assert len(reader) == 20_000
+    assert {message[0] for message in reader} == {ADD, CANCEL, DELETE, EXECUTE, REPLACE}
+
+    book = OrderBook(**book_kwargs)
+    stats = reader.replay(book)
+    assert stats["messages"] == 20_000
+    assert stats["missed"] == 0
+    assert stats["messages_per_second"] > 0
+    assert set(stats["latency_ns"]) == {"p50", "p90", "p99", "p99.9", "max"}
+    assert stats["latency_ns"]["p50"] <= stats["latency_ns"]["max"]
+    assert book_orders(book) == expected_book(reader)
+
+
+def test_generation_is_deterministic(tmp_path):
+    first, second = str(tmp_path / "a.bin"), str(tmp_path / "b.bin")
+    generate_messages(first, 1000, seed=9)
+    generate_messages(second, 1000, seed=9)
+    assert list(MessageReader(first)) == list(MessageReader(second))
+
+
+def test_writer_reader_round_trip(tmp_path):
+    path = str(tmp_path / "messages.bin")
+    with MessageWriter(path, block_size=2) as writer:
+        writer.write(ADD, 1, True, 100.0, 5, timestamp=10)
+        writer.write(ADD, 2, False, 101.0, 3, timestamp=20)
+        writer.write(REPLACE, 1, True, 100.5, 4, timestamp=30, new_ref=3)
+        assert len(writer) == 3
+    reader = MessageReader(path, chunk_size=2)
+    assert [len(chunk) for chunk in reader.chunks()] == [2, 1]
+    assert list(reader) == [
+        (ADD, True, 1, -1, 100.0, 5, 10),
+        (ADD, False, 2, -1, 101.0, 3, 20),
+        (REPLACE, True, 1, 3, 100.5, 4, 30),
+    ]
+
+
+def test_messages_for_missing_orders_are_counted(tmp_path):
+    path = str(tmp_path / "messages.bin")
+    with MessageWriter(path) as writer:
+        writer.write(ADD, 1, True, 100.0, 5)
+        writer.write(CANCEL, 7, True, 100.0, 1)
+        writer.write(REPLACE, 8, False, 101.0, 2, new_ref=9)
+        writer.write(CANCEL, 1, True, 100.0, 2)
+        writer.write(EXECUTE, 6, False, 101.0, 4)
+        writer.write(DELETE, 5, True, 100.0, 5)
+    book = OrderBook(tick_size=0.01)
+    stats = MessageReader(path).replay(book, record_latency=False)
+    assert stats["missed"] == 4
+    assert "latency_ns" not in stats
+    assert book_orders(book) == {1: (True, 100.0, 3), 9: (False, 101.0, 2)}
+    # Only the two adds reached the matching path.
+    assert book.trade_history == [[0, 0]] * 2
+
+
+def test_executions_only_trade_against_their_order(tmp_path, book_kwargs):
+    path = str(tmp_path / "messages.bin")
+    with MessageWriter(path) as writer:
+        writer.write(ADD, 1, True, 100.0, 5)
+        writer.write(ADD, 2, True, 100.0, 5)
+        writer.write(ADD, 3, True, 99.0, 5)
+        # Not first in line: reduced in place, nothing trades.
+        writer.write(EXECUTE, 2, True, 100.0, 2)
+        writer.write(EXECUTE, 3, True, 99.0, 5)
+        # First in line: matched, and never past its own volume.
+        writer.write(EXECUTE, 1, True, 100.0, 5)
+    book = OrderBook(**book_kwargs)
+    stats = MessageReader(path).replay(book, record_latency=False)
+    assert stats["missed"] == 0
+    assert book_orders(book) == {2: (True, 100.0, 3)}
+    assert book.trade_history[-1] == [5, pytest.approx(500.0)]
+    assert sum(volume for volume, _ in book.trade_history) == 5
+    assert book.bids.front_order_id() == 2
+    assert book.asks.front_order_id() is None
+
+
+def test_empty_file_and_bad_header(tmp_path):
+    path = str(tmp_path / "empty.bin")
+    MessageWriter(path).close()
+    reader = MessageReader(path)
+    assert len(reader) == 0
+    stats = reader.replay(OrderBook(tick_size=0.01))
+    assert stats["messages"] == 0 and "latency_ns" not in stats
+
+    other = tmp_path / "other.bin"
+    other.write_bytes(b"not a message file")
+    with pytest.raises(ValueError):
+        MessageReader(str(other))
@@ -0,0 +1,63 @@
+import random
+
+import pytest
+
+from lob.core import MarketOrder, Order
+from lob.orderbook import OrderBook
+
+
+def summary(notifications):
+    return {
+        trader_id: sorted(
+            (n.order_id, n.num_trades, n.total_filled_volume, round(n.average_price, 6),
+             n.remaining_volume, n.is_filled)
+            for n in notifs
+        )
+        for trader_id, notifs in notifications.items()
+    }
+
+
+def test_fills_notify_both_sides(book_kwargs):
+    book = OrderBook(**book_kwargs)
+    makers = [Order(100.0, 3, False, trader_id=1), Order(100.01, 3, False, trader_id=2)]
+    book.process_orders(makers)
+    taker = Order(100.01, 5, True, trader_id=3)
+    notifications = book.process_orders([taker])
+
+    assert summary(notifications) == {
+        1: [(makers[0].id, 1, 3, 100.0, 0, True)],
+        2: [(makers[1].id, 1, 2, 100.01, 1, False)],
+        3: [(taker.id, 2, 5, round((300 + 200.02) / 5, 6), 0, True)],
+    }
+    assert book.trade_history[-1] == [5, pytest.approx(500.02)]
+
+
+def test_subscriptions_filter_notifications_not_history(book_kwargs):
+    rng = random.Random(9)
+    everyone, some = OrderBook(**book_kwargs), OrderBook(**book_kwargs)
+    some.unsubscribe_all()
+    some.subscribe(2)
+    some.subscribe(3)
+    some.unsubscribe(3)
+    for _ in range(200):
+        specs = [
+            (round(100 + rng.randint(-5, 5) * 0.01, 2), rng.randint(1, 9), rng.random() < 0.5, rng.choice([1, 2, 3, None]))
+            for _ in range(3)
+        ]
+        market = (rng.randint(1, 10), rng.random() < 0.5, rng.choice([1, 2]))
+        start = Order._id_counter
+        full = everyone.process_orders([Order(p, v, b, trader_id=t) for p, v, b, t in specs] + [MarketOrder(*market)])
+        Order._id_counter = start
+        filtered = some.process_orders([Order(p, v, b, trader_id=t) for p, v, b, t in specs] + [MarketOrder(*market)])
+
+        assert None not in full
+        assert summary(filtered) == {k: v for k, v in summary(full).items() if k == 2}
+        assert some.trade_history[-1] == pytest.approx(everyone.trade_history[-1])
+
+
+def test_no_subscribers_builds_no_notifications():
+    book = OrderBook()
+    book.unsubscribe_all()
+    book.process_orders([Order(100.0, 1, False, trader_id=1)])
+    assert book.process_orders([Order(100.0, 1, True, trader_id=2)]) == {}
+    assert book.trade_history[-1] == [1, 100.0]
@@ -0,0 +1,93 @@
+import numpy as np
+import pytest
+
+from lob.core import MarketOrder, Order, TradeBuffer
+from lob.orderbook import OrderBook
+
+def random_columns(seed, n=400):
+    rng = np.random.default_rng(seed)
+    return {
+        "prices": np.round(100 + rng.normal(0, 0.05, n), 2),
+        "volumes": rng.integers(1, 20, n),
+        "is_bid": rng.random(n) < 0.5,
+        "is_market": rng.random(n) < 0.1,
+        "trader_ids": rng.integers(-1, 5, n),
+        "lifetimes": rng.integers(-1, 6, n),
+    }
+
+
+def as_orders(columns):
+    orders = []
+    for price, volume, bid, market, trader_id, lifetime in zip(
+        *(column.tolist() for column in columns.values())
+    ):
+        trader_id = trader_id if trader_id >= 0 else None
+        if market:
+            orders.append(MarketOrder(volume, bid, trader_id))
+        else:
+            lifetime = lifetime if lifetime >= 0 else None
+            orders.append(Order(price, volume, bid, False, trader_id, lifetime))
+    return orders
+
+
+def book_state(book):
+    state = {
+        f"{name}_{key}": column.tolist()
+        for name, side in (("bids", book.bids), ("asks", book.asks))
+        for key, column in side.export_orders().items()
+    }
+    state["history"] = book.trade_history
+    state["wheel"] = {
+        key: column.tolist() for key, column in book.expiration_wheel.state().items()
+    }
+    return state
+
+
+def test_batch_matches_process_orders(book_kwargs, dense_ids):
+    book_kwargs.update(use_scheduler=True, dense_ids=dense_ids)
+    expected = OrderBook(**book_kwargs)
+    actual = OrderBook(**book_kwargs)
+    for seed in range(3):
+        columns = random_columns(seed)
+        Order._id_counter = 1000 * seed
+        orders = as_orders(columns)
+        trades = TradeBuffer()
+        expected.process_orders_buffered(orders, trades)
+        Order._id_counter = 1000 * seed
+        result = actual.process_order_batch(**columns)
+
+        for key in ("bid_order_id", "ask_order_id", "volume"):
+            assert result[key].tolist() == getattr(trades, key).tolist()
+        assert result["order_id"].tolist() == [order.id for order in orders]
+        assert book_state(actual) == book_state(expected)
+        expected.advance()
+        actual.advance()
+
+
+def test_remaining_volume_is_end_of_batch_volume(book_kwargs):
+    book = OrderBook(**book_kwargs)
+    result = book.process_order_batch(
+        [100.0, 101.0, 100.0, 0.0],
+        [10, 4, 3, 5],
+        [False, True, True, True],
+        is_market=[False, False, False, True],
+    )
+    # The resting ask is hit after entry; the bid and market order empty it.
+    assert result["remaining_volume"].tolist() == [0, 0, 0, 2]
+    assert result["volume"].tolist() == [4, 3, 3]
+    assert book.get_best_ask() is None
+
+
+def test_resting_rows_are_distinct_orders():
+    book = OrderBook()
+    result = book.process_order_batch([99.0, 98.0, 97.0], [1, 2, 3], [True] * 3)
+    resting = [book.bids.order_map[i] for i in result["order_id"].tolist()]
+    assert [order.volume for order in resting] == [1, 2, 3]
+    assert [order.price for order in resting] == [99.0, 98.0, 97.0]
+    assert len({id(order) for order in resting}) == 3
+
+
+def test_mismatched_lengths_raise():
+    book = OrderBook()
+    with pytest.raises(ValueError):
+        book.process_order_batch([100.0, 101.0], [1], [True, False])
@@ -0,0 +1,96 @@
+import random
+
+import pytest
+
+from lob.core import MarketOrder, Order
+from lob.orderbook import OrderBook, OrderStore, SlotLevel
+from lob.orderbook.order_store import NO_VALUE
+
+
+def test_slots_are_recycled_before_growing():
+    store = OrderStore(capacity=2)
+    first = store.alloc(Order(100, 1, True))
+    second = store.alloc(Order(101, 2, False, trader_id=4, lifetime=3))
+    assert (first, second) == (0, 1)
+    store.free(first)
+    assert store.alloc(Order(102, 3, True)) == first
+    assert store.capacity == 2
+    assert store.alloc(Order(103, 4, True)) == 2
+    assert store.capacity == 4
+    assert len(store) == 3
+    assert store.get_trader_id(second) == 4 and store.get_lifetime(second) == 3
+    assert store.trader_id[first] == NO_VALUE and store.get_trader_id(first) is None
+
+
+def test_depth_snapshot_and_clear_by_side():
+    store = OrderStore(capacity=4)
+    for price, volume, bid in ((100, 1, True), (99, 2, True), (101, 5, False)):
+        store.alloc(Order(price, volume, bid))
+    assert (store.depth(True), store.depth(False)) == (3, 5)
+    assert store.snapshot(True)["price"].tolist() == [100, 99]
+    store.clear(True)
+    assert (store.depth(True), store.depth(False)) == (0, 5)
+    assert len(store) == 1
+    store.clear()
+    assert len(store) == 0
+
+
+def test_alloc_many_hands_out_free_slots():
+    store = OrderStore(capacity=2)
+    store.alloc(Order(100, 1, True))
+    slots = store.alloc_many(3)
+    assert sorted(slots.tolist()) == [1, 2, 3]
+    assert store.capacity == 4
+
+
+def test_slot_level_queue():
+    store = OrderStore()
+    level = SlotLevel(100, store)
+    slots = [store.alloc(Order(100, volume, True)) for volume in (1, 2, 3)]
+    for slot in slots:
+        level.add(slot)
+    assert list(level) == slots and level.volume == 6
+    level.unlink(slots[1])
+    assert list(level) == [slots[0], slots[2]]
+    level.unlink(slots[0])
+    level.unlink(slots[2])
+    assert level.is_empty() and level.tail is None and len(level) == 0
+
+
+def test_store_book_matches_object_book():
+    rng = random.Random(4)
+    plain = OrderBook(tick_size=0.01)
+    stored = OrderBook(tick_size=0.01, order_store=True)
+    ids = []
+    for _ in range(400):
+        specs = [
+            (round(100 + rng.randint(-15, 15) * 0.01, 2), rng.randint(1, 9), rng.random() < 0.5, rng.choice([1, 2]))
+            for _ in range(3)
+        ]
+        market = (rng.randint(1, 20), rng.random() < 0.5, 3)
+        cancels = rng.sample(ids, min(2, len(ids)))
+        results = []
+        for book in (plain, stored):
+            Order._id_counter = len(ids)
+            orders = [Order(price, volume, bid, trader_id=t) for price, volume, bid, t in specs]
+            notifications = book.process_orders(orders + [MarketOrder(*market)])
+            book.process_cancellations(cancels)
+            results.append(
+                {
+                    trader_id: [(n.order_id, n.total_filled_volume, n.remaining_volume) for n in notifs]
+                    for trader_id, notifs in notifications.items()
+                }
+            )
+        ids += range(len(ids), len(ids) + 4)
+        assert results[0] == results[1]
+        for trader_id in (1, 2):
+            assert stored.unfilled_orders(trader_id) == plain.unfilled_orders(trader_id)
+    assert len(stored.order_store) == len(stored.bids.order_map) + len(stored.asks.order_map)
+    assert stored.get_bid_depth() == plain.get_bid_depth()
+
+
+def test_store_requires_tick_size_and_no_ladder():
+    with pytest.raises(ValueError):
+        OrderBook(order_store=True)
+    with pytest.raises(ValueError):
+        OrderBook(tick_size=0.01, ladder_width=64, order_store=True)
@@ -0,0 +1,123 @@
+import random
+
+import pytest
+
+from lob.core import MarketOrder, Order
+from lob.orderbook import OrderBook, PriceLadder
+
+
+def levels(book):
+    depth = {}
+    for name, side in (("bids", book.bids), ("asks", book.asks)):
+        for order in side.order_map.values():
+            volume, count = depth.setdefault(name, {}).get(order.price, (0, 0))
+            depth[name][order.price] = (volume + order.volume, count + 1)
+    return depth
+
+
+def test_ladder_matches_heap_book():
+    rng = random.Random(11)
+    heap = OrderBook(tick_size=0.01)
+    ladder = OrderBook(tick_size=0.01, ladder_width=64)
+    ids = []
+    for _ in range(500):
+        # Wide price moves force the ladder to re-anchor and overflow.
+        centre = 100 + rng.randint(-3, 3)
+        specs = [
+            (round(centre + rng.randint(-40, 40) * 0.01, 2), rng.randint(1, 9), rng.random() < 0.5)
+            for _ in range(4)
+        ]
+        market = (rng.randint(1, 30), rng.random() < 0.5)
+        cancels = rng.sample(ids, min(len(ids), 2))
+        for book in (heap, ladder):
+            Order._id_counter = len(ids)
+            book.process_orders([Order(*spec) for spec in specs] + [MarketOrder(*market)])
+            book.process_cancellations(cancels)
+        ids += range(len(ids), len(ids) + 5)
+        assert ladder.get_best_bid() == heap.get_best_bid()
+        assert ladder.get_best_ask() == heap.get_best_ask()
+        assert ladder.get_bid_depth() == heap.get_bid_depth()
+        assert ladder.get_ask_depth() == heap.get_ask_depth()
+    assert levels(ladder) == levels(heap)
+
+
+@pytest.mark.parametrize("is_bid", [True, False])
+def test_far_levels_overflow_without_widening(is_bid):
+    side = PriceLadder(is_bid, 0.01, width=64)
+    sign = 1 if is_bid else -1
+    near = [Order(100, 1, is_bid), Order(100, 2, is_bid), Order(100 - sign, 3, is_bid)]
+    for order in near:
+        side.add(order)
+    # Far behind the touch: kept in the overflow heap.
+    behind = Order(100 - sign * 100000, 4, is_bid)
+    side.add(behind)
+    assert side.width == 64
+    assert len(side._occupied_indices()) == 2
+    assert side.level_counts() == (3, 0)
+    assert side.get_best_price() == 100
+    assert side.get_depth() == 10
+
+    # Far ahead of the touch: the window re-anchors and the old levels spill.
+    ahead = Order(100 + sign * 100000, 5, is_bid)
+    side.add(ahead)
+    assert side.width == 64 and len(side._ladder) == 64
+    assert side.get_best_price() == 100 + sign * 100000
+    assert list(side._get_level(100)) == near[:2]
+    assert [level.price for level in side.top_levels(5)] == [
+        100 + sign * 100000, 100, 100 - sign, 100 - sign * 100000
+    ]
+    expected = sorted((order.price for order in near[1:] + [behind, ahead]), reverse=True)
+    assert side._prices_descending() == expected
+
+    # Emptying the window re-anchors it on the best overflow level.
+    side.cancel(ahead)
+    assert side.get_best_price() == 100
+    assert side._get_level(100) is side._ladder[100 - side.base]
+    for order in near:
+        side.cancel(order)
+    assert side.get_best_price() == 100 - sign * 100000
+    assert side.level_counts() == (1, 0)
+    side.cancel(behind)
+    assert side.get_best_price() is None
+    assert side.get_depth() == 0
+
+
+def test_overflow_levels_match_through_the_book():
+    book = OrderBook(tick_size=0.01, ladder_width=64)
+    book.process_orders([Order(100.0, 1, False), Order(1000.0, 2, False), Order(100000.0, 3, False)])
+    assert book.asks.width == 64
+    book.process_orders([MarketOrder(4, True)])
+    assert book.get_best_ask() == 100000.0
+    assert book.get_ask_depth() == 2
+    assert book.trade_history[-1] == [4, pytest.approx(100.0 + 2000.0 + 100000.0)]
+
+
+def test_emptied_slots_are_reused():
+    side = PriceLadder(True, 0.01, width=64)
+    first = Order(100, 1, True)
+    side.add(first)
+    level = side._get_level(100)
+    side.cancel(first)
+    assert side.get_best_price() is None
+    assert side._occupied_indices() == []
+    side.add(Order(100, 2, True))
+    assert side._get_level(100) is level
+    assert side.get_best_price() == 100
+
+
+def test_best_price_crosses_bitmap_words():
+    side = PriceLadder(False, 0.01, width=256)
+    orders = [Order(tick, 1, False) for tick in (10, 75, 140, 141, 200)]
+    for order in orders:
+        side.add(order)
+    assert side._prices_descending() == [200, 141, 140, 75, 10]
+    for order, best in zip(orders, (75, 140, 141, 200, None)):
+        side.cancel(order)
+        assert side.get_best_price() == best
+
+
+def test_ladder_requires_tick_size():
+    with pytest.raises(ValueError):
+        PriceLadder(True, None)
+    with pytest.raises(ValueError):
+        PriceLadder(True, 0.01, width=0)
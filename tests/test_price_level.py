@@ -0,0 +1,46 @@
+import pytest
+
+from lob.core import Order
+from lob.orderbook import PriceLevel
+
+
+def make_level(price, volumes):
+    level = PriceLevel(price)
+    orders = [Order(price, volume, True) for volume in volumes]
+    for order in orders:
+        level.add(order)
+    return level, orders
+
+
+@pytest.mark.parametrize("index", [0, 1, 2])
+def test_cancel_keeps_fifo_order_and_totals(index):
+    level, orders = make_level(100.0, [1, 2, 3])
+    level.cancel(orders[index])
+    remaining = [order for i, order in enumerate(orders) if i != index]
+    assert list(level) == remaining
+    assert level.volume == sum(order.volume for order in remaining)
+    assert level.num_orders == 2
+    assert level.head is remaining[0] and level.tail is remaining[-1]
+
+
+def test_cancel_last_order_empties_level():
+    level, orders = make_level(100.0, [5])
+    level.cancel(orders[0])
+    assert level.is_empty()
+    assert level.volume == 0 and level.num_orders == 0
+
+
+def test_cancel_detached_order_raises():
+    level, _ = make_level(100.0, [1, 2])
+    with pytest.raises(ValueError):
+        level.cancel(Order(100.0, 1, True))
+
+
+def test_cancel_order_queued_mid_queue_at_other_level_raises():
+    level, orders = make_level(100.0, [1, 2, 3])
+    other, other_orders = make_level(101.0, [4, 5, 6])
+    with pytest.raises(ValueError):
+        level.cancel(other_orders[1])
+    # Neither queue was touched.
+    assert list(level) == orders and level.volume == 6 and level.num_orders == 3
+    assert list(other) == other_orders and other.volume == 15 and other.num_orders == 3
@@ -0,0 +1,113 @@
+import numpy as np
+import pytest
+
+from lob.core import MarketOrder, Order
+from lob.orderbook import OrderBook
+
+
+def flow(book, seed, steps=300):
+    rng = np.random.default_rng(seed)
+    resting = []
+    for _ in range(steps):
+        action = rng.random()
+        if action < 0.7:
+            order = Order(
+                round(100 + rng.integers(-10, 11) * 0.01, 2),
+                int(rng.integers(1, 20)),
+                bool(rng.random() < 0.5),
+                trader_id=int(rng.integers(0, 5)),
+                lifetime=int(rng.integers(1, 6)) if book.use_scheduler else None,
+            )
+            book.process_orders([order])
+            resting.append(order.id)
+        elif action < 0.8:
+            book.process_orders([MarketOrder(int(rng.integers(1, 30)), bool(rng.random() < 0.5))])
+        elif action < 0.95 and resting:
+            book.process_cancellations([resting.pop(int(rng.integers(len(resting))))])
+        elif book.use_scheduler:
+            book.advance()
+
+
+def state(book):
+    return (
+        {key: column.tolist() for key, column in book.bids.export_orders().items()},
+        {key: column.tolist() for key, column in book.asks.export_orders().items()},
+        [list(entry) for entry in book.trade_history],
+        [book.unfilled_orders(trader) for trader in range(5)],
+    )
+
+
+@pytest.mark.parametrize("use_scheduler", [False, True])
+def test_round_trip_continues_identically(book_kwargs, dense_ids, use_scheduler):
+    book_kwargs.update(dense_ids=dense_ids, use_scheduler=use_scheduler)
+    book = OrderBook(**book_kwargs)
+    flow(book, seed=1)
+    data = book.snapshot()
+    before = state(book)
+    counter = Order._id_counter
+
+    flow(book, seed=2)
+    expected = state(book)
+
+    restored = OrderBook(**book_kwargs)
+    restored.process_orders([Order(50.0, 1, True)])
+    restored.restore(data)
+    assert state(restored) == before
+    # Continue under the IDs the original book saw.
+    Order._id_counter = counter
+    flow(restored, seed=2)
+    assert state(restored) == expected
+
+
+def test_restore_never_moves_the_id_counter_back():
+    old = OrderBook(tick_size=0.01)
+    old.process_orders([Order(100.0, 1, True)])
+    data = old.snapshot()
+    live = [Order(100.0, 1, True) for _ in range(5)]
+    OrderBook(tick_size=0.01).process_orders(live)
+
+    OrderBook(tick_size=0.01).restore(data)
+    assert Order(100.0, 1, True).id > live[-1].id
+
+
+def test_round_trip_through_file(tmp_path):
+    book = OrderBook(tick_size=0.01, use_scheduler=True)
+    flow(book, seed=3)
+    path = tmp_path / "book.npz"
+    assert book.snapshot(str(path)) is None
+    before = state(book)
+    restored = OrderBook(tick_size=0.01, use_scheduler=True)
+    restored.restore(str(path))
+    assert state(restored) == before
+
+
+def test_restore_into_dense_book_reserves_resting_ids():
+    book = OrderBook(tick_size=0.01)
+    flow(book, seed=4)
+    resting = set(book.bids.export_orders()["order_id"].tolist())
+    resting |= set(book.asks.export_orders()["order_id"].tolist())
+    restored = OrderBook(tick_size=0.01, dense_ids=True)
+    restored.restore(book.snapshot())
+    order = Order(90.0, 1, True)
+    restored.process_orders([order])
+    assert order.id not in resting
+
+
+def test_empty_book_round_trip():
+    book = OrderBook(tick_size=0.01)
+    restored = OrderBook(tick_size=0.01)
+    restored.process_orders([Order(100.0, 1, True)])
+    restored.restore(book.snapshot())
+    assert state(restored) == state(book)
+    assert restored.get_best_bid() is None
+
+
+def test_mismatched_configuration_raises():
+    data = OrderBook(tick_size=0.01).snapshot()
+    with pytest.raises(ValueError):
+        OrderBook().restore(data)
+    with pytest.raises(ValueError):
+        OrderBook(tick_size=0.05).restore(data)
+    data = OrderBook(tick_size=0.01, use_scheduler=True).snapshot()
+    with pytest.raises(ValueError):
+        OrderBook(tick_size=0.01).restore(data)
@@ -0,0 +1,57 @@
+import random
+
+import pytest
+
+from lob.core import MarketOrder, Order
+from lob.orderbook import OrderBook
+
+
+def test_prices_quantize_away_from_the_touch():
+    book = OrderBook(tick_size=0.05)
+    assert book.bids.to_tick(100.07) == 2001
+    assert book.asks.to_tick(100.07) == 2002
+    # Float noise on an exact tick does not move it.
+    assert book.bids.to_tick(100.1) == book.asks.to_tick(100.1) == 2002
+    assert book.bids.to_tick(float("inf")) == float("inf")
+    assert book.bids.to_price(2001) == 100.05
+    assert book.bids.to_price(None) is None
+
+
+def test_orders_carry_ticks_and_report_prices():
+    book = OrderBook(tick_size=0.05)
+    bid, ask = Order(100.07, 5, True), Order(100.12, 5, False)
+    book.process_orders([bid, ask])
+    assert (bid.price, ask.price) == (2001, 2003)
+    assert (book.get_best_bid(), book.get_best_ask()) == (100.05, 100.15)
+    assert book.spread == pytest.approx(0.10)
+    assert book.mid_price == pytest.approx(100.10)
+
+
+def test_tick_book_trades_like_a_raw_book_on_tick_prices():
+    rng = random.Random(5)
+    raw, ticked = OrderBook(), OrderBook(tick_size=0.01)
+    raw.subscribe_all()
+    ticked.subscribe_all()
+    for _ in range(300):
+        specs = [
+            (round(100 + rng.randint(-20, 20) * 0.01, 2), rng.randint(1, 9), rng.random() < 0.5)
+            for _ in range(4)
+        ]
+        market = (rng.randint(1, 20), rng.random() < 0.5, 7)
+        for book in (raw, ticked):
+            orders = [Order(price, volume, bid, trader_id=1) for price, volume, bid in specs]
+            orders.append(MarketOrder(*market))
+            book.process_orders(orders)
+        assert ticked.get_best_bid() == raw.get_best_bid()
+        assert ticked.get_best_ask() == raw.get_best_ask()
+        assert ticked.trade_history[-1][0] == raw.trade_history[-1][0]
+        assert ticked.trade_history[-1][1] == pytest.approx(raw.trade_history[-1][1])
+    assert [price for _, price, _ in ticked.unfilled_orders(1)] == [
+        price for _, price, _ in raw.unfilled_orders(1)
+    ]
+
+
+def test_tick_size_is_required_by_tick_backends():
+    for kwargs in ({"ladder_width": 64}, {"order_store": True}, {"depth_index": True}):
+        with pytest.raises(ValueError):
+            OrderBook(**kwargs)
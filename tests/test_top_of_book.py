@@ -0,0 +1,60 @@
+import random
+
+import pytest
+
+from lob.core import MarketOrder, Order
+from lob.orderbook import OrderBook
+
+
+def scanned_best(book, is_bid):
+    prices = [
+        price
+        for trader_id in (1, 2)
+        for _, price, _ in book.unfilled_orders(trader_id)
+        if (price < 100) == is_bid
+    ]
+    if not prices:
+        return None
+    return max(prices) if is_bid else min(prices)
+
+
+def test_cached_top_matches_a_scan(book_kwargs):
+    rng = random.Random(8)
+    book = OrderBook(**book_kwargs)
+    ids = []
+    for step in range(800):
+        action = rng.random()
+        if action < 0.5:
+            bid = rng.random() < 0.5
+            price = round(100 + (-1 if bid else 1) * rng.randint(1, 30) * 0.01, 2)
+            order = Order(price, rng.randint(1, 5), bid, trader_id=rng.choice([1, 2]))
+            book.process_orders([order])
+            ids.append(order.id)
+        elif action < 0.7 and ids:
+            book.process_cancellations([ids.pop(rng.randrange(len(ids)))])
+        elif action < 0.85:
+            book.process_orders([MarketOrder(rng.randint(1, 12), rng.random() < 0.5)])
+        else:
+            unfilled = book.unfilled_orders(rng.choice([1, 2]))
+            if unfilled:
+                order_id, price, volume = rng.choice(unfilled)
+                book.amend(order_id, new_volume=max(1, volume - 1))
+
+        best_bid, best_ask = scanned_best(book, True), scanned_best(book, False)
+        assert book.get_best_bid() == best_bid
+        assert book.get_best_ask() == best_ask
+        if best_bid is None or best_ask is None:
+            assert book.spread is None and book.mid_price is None
+        else:
+            assert book.spread == pytest.approx(best_ask - best_bid)
+            # Raw-price books round the mid to cents.
+            assert book.mid_price == pytest.approx((best_ask + best_bid) / 2, abs=0.0051)
+        level = book.bids.get_best_level()
+        assert (level is None) == (best_bid is None)
+
+
+def test_mid_price_on_half_tick():
+    book = OrderBook(tick_size=0.01)
+    book.process_orders([Order(99.99, 1, True), Order(100.02, 1, False)])
+    assert book.mid_price == 100.005
+    assert book.spread == 0.03
@@ -0,0 +1,67 @@
+import random
+
+import pytest
+
+from lob.core import MarketOrder, Order, TradeBuffer
+from lob.orderbook import OrderBook
+
+
+def test_buffer_grows_and_clears():
+    buffer = TradeBuffer(capacity=2)
+    for i in range(5):
+        buffer.append(i, 10 + i, 100.0 + i, i + 1, i % 2 == 0)
+    assert len(buffer) == 5
+    assert buffer.bid_order_id.tolist() == [0, 1, 2, 3, 4]
+    assert buffer.ask_order_id.tolist() == [10, 11, 12, 13, 14]
+    assert buffer.price.tolist() == [100.0, 101.0, 102.0, 103.0, 104.0]
+    assert buffer.volume.tolist() == [1, 2, 3, 4, 5]
+    assert buffer.aggressor_is_bid.tolist() == [True, False, True, False, True]
+    buffer.clear()
+    assert len(buffer) == 0 and buffer.volume.tolist() == []
+
+
+def test_buffered_fills_in_ticks_and_accumulate():
+    book = OrderBook(tick_size=0.01)
+    maker = Order(100.0, 5, False)
+    book.process_orders([maker])
+    buffer = TradeBuffer()
+    taker = MarketOrder(2, True)
+    assert book.process_orders_buffered([taker], buffer) == 1
+    assert book.process_orders_buffered([MarketOrder(1, True)], buffer) == 1
+    assert len(buffer) == 2
+    assert (buffer.bid_order_id[0], buffer.ask_order_id[0]) == (taker.id, maker.id)
+    assert buffer.price.tolist() == [10000.0, 10000.0]
+    assert buffer.aggressor_is_bid.tolist() == [True, True]
+    assert book.trade_history == [[0, 0], [2, 200.0], [1, 100.0]]
+
+
+@pytest.mark.parametrize("book_kwargs", [{}, {"tick_size": 0.01}, {"tick_size": 0.01, "order_store": True}])
+def test_buffered_path_matches_notifications(book_kwargs):
+    rng = random.Random(6)
+    notified, buffered = OrderBook(**book_kwargs), OrderBook(**book_kwargs)
+    buffer = TradeBuffer()
+    for _ in range(300):
+        specs = [
+            (round(100 + rng.randint(-10, 10) * 0.01, 2), rng.randint(1, 9), rng.random() < 0.5)
+            for _ in range(4)
+        ]
+        start = Order._id_counter
+        notifications = notified.process_orders([Order(*spec, trader_id=1) for spec in specs])
+        Order._id_counter = start
+        buffer.clear()
+        buffered.process_orders_buffered([Order(*spec, trader_id=1) for spec in specs], buffer)
+
+        filled = {}
+        for aggressor_is_bid, bid_id, ask_id, volume in zip(
+            buffer.aggressor_is_bid.tolist(),
+            buffer.bid_order_id.tolist(),
+            buffer.ask_order_id.tolist(),
+            buffer.volume.tolist(),
+        ):
+            for order_id in (bid_id, ask_id):
+                filled[order_id] = filled.get(order_id, 0) + volume
+        expected = {
+            n.order_id: n.total_filled_volume for n in notifications.get(1, []) if n.num_trades
+        }
+        assert filled == expected
+        assert buffered.trade_history[-1] == pytest.approx(notified.trade_history[-1])
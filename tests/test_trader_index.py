@@ -0,0 +1,67 @@
+import random
+
+from lob.core import MarketOrder, Order
+from lob.orderbook import OrderBook
+
+
+def resting_by_trader(book):
+    """
+    Scan both sides for each trader's resting orders, in arrival order.
+    """
+    found = {}
+    for side in (book.asks, book.bids):
+        columns = side.export_orders()
+        for order_id, price, volume, trader_id in sorted(
+            zip(
+                columns["order_id"].tolist(),
+                columns["price"].tolist(),
+                columns["volume"].tolist(),
+                columns["trader_id"].tolist(),
+            )
+        ):
+            found.setdefault(trader_id, []).append(
+                (order_id, side.to_price(price), volume)
+            )
+    return found
+
+
+def test_unfilled_orders_match_a_book_scan(book_kwargs):
+    rng = random.Random(3)
+    book = OrderBook(**book_kwargs)
+    ids = []
+    for step in range(400):
+        orders = [
+            Order(
+                round(100 + rng.randint(-10, 10) * 0.01, 2),
+                rng.randint(1, 9),
+                rng.random() < 0.5,
+                trader_id=rng.choice([1, 2, 3]),
+            )
+            for _ in range(3)
+        ]
+        ids += [order.id for order in orders]
+        book.process_orders(orders)
+        if rng.random() < 0.2:
+            book.process_orders([MarketOrder(rng.randint(1, 20), rng.random() < 0.5, 1)])
+        if rng.random() < 0.3:
+            book.process_cancellations(rng.sample(ids, 2))
+        if step % 50 == 49:
+            book.cancel_trader_orders(rng.choice([1, 2, 3]))
+
+        expected = resting_by_trader(book)
+        for trader_id in (1, 2, 3):
+            assert book.unfilled_orders(trader_id) == expected.get(trader_id, [])
+
+
+def test_partial_fill_and_cancel_trader_orders(book_kwargs):
+    book = OrderBook(**book_kwargs)
+    mine = [Order(100.0, 5, True, trader_id=1), Order(101.0, 4, False, trader_id=1)]
+    other = Order(99.0, 2, True, trader_id=2)
+    book.process_orders(mine + [other])
+    book.process_orders([Order(100.0, 3, False, trader_id=3)])
+
+    assert book.unfilled_orders(1) == [(mine[1].id, 101.0, 4), (mine[0].id, 100.0, 2)]
+    assert sorted(book.cancel_trader_orders(1)) == sorted(order.id for order in mine)
+    assert book.unfilled_orders(1) == []
+    assert book.unfilled_orders(2) == [(other.id, 99.0, 2)]
+    assert book.unfilled_orders(4) == []